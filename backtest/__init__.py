@@ -1,3 +1,4 @@
 from backtest.engine import BacktestEngine, BacktestResult
+from backtest.ledger import TradeLedger
 
-__all__ = ["BacktestEngine", "BacktestResult"]
+__all__ = ["BacktestEngine", "BacktestResult", "TradeLedger"]
@@ -1,29 +1,40 @@
 """
 回测引擎：加载数据、逐 bar 运行策略、模拟撮合、生成交割单并持久化。
 """
+import json
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from backtest import metrics
+from backtest.ledger import SIDE_BUY, SIDE_SELL, TradeLedger
+from backtest.profiling import RunProfile
 from core.config import (
     BACKTEST_COMMISSION_PER_SHARE,
     BACKTEST_INITIAL_CAPITAL,
     BACKTEST_RESULTS_DIR,
     BACKTEST_SLIPPAGE_PCT,
 )
-from core.types import SignalAction, TradeRecord
+from core.dates import to_days
+from core.types import SignalAction
 from data.loader import get_bars
+from strategies.base import BaseStrategy, SignalBatch
 from strategies.buy.base import BaseBuyStrategy
+from strategies.context import BarContext
+from strategies.indicators import IndicatorCache
 from strategies.sell.base import BaseSellStrategy
+from strategies.signal_store import cache_fingerprint, get_signal_store
 
 
 @dataclass
 class BacktestResult:
-    """回测结果：交割单、资金曲线、绩效摘要"""
-    trades: List[TradeRecord] = field(default_factory=list)
+    """回测结果：交割单（列式，可迭代为 TradeRecord）、资金曲线、绩效摘要"""
+    trades: TradeLedger = field(default_factory=TradeLedger)
     equity_curve: pd.DataFrame = field(default_factory=pd.DataFrame)  # date, equity, in_position
     total_return_pct: float = 0.0
     max_drawdown_pct: float = 0.0
@@ -32,6 +43,33 @@ class BacktestResult:
     final_capital: float = 0.0
     holding_days: int = 0  # 有持仓的交易日天数
     annualized_return_holding_pct: Optional[float] = None  # 按持仓时间年化收益率(%)
+    sortino_ratio: float = 0.0
+    calmar_ratio: float = 0.0  # 按持仓时间年化收益 / 最大回撤
+    exposure_pct: float = 0.0  # 持仓交易日占比(%)
+    profit_factor: float = 0.0  # 平仓盈利总额 / 亏损总额
+    profile: Optional[RunProfile] = None  # 仅 profile=True 时记录
+
+    def summary(self) -> dict:
+        """绩效摘要（扁平 dict，可跨进程传递、直接拼成表格）。"""
+        sells = self.trades.sell_mask()
+        win_sells = int((self.trades.column("pnl")[sells] > 0).sum())
+        total_sells = int(sells.sum())
+        return {
+            "trades": len(self.trades),
+            "win_sells": win_sells,
+            "total_sells": total_sells,
+            "win_rate_pct": (win_sells / total_sells * 100.0) if total_sells else 0.0,
+            "return_pct": self.total_return_pct,
+            "max_dd_pct": self.max_drawdown_pct,
+            "sharpe": self.sharpe_ratio,
+            "sortino": self.sortino_ratio,
+            "calmar": self.calmar_ratio,
+            "exposure_pct": self.exposure_pct,
+            "profit_factor": self.profit_factor,
+            "holding_days": self.holding_days,
+            "annualized_holding_pct": self.annualized_return_holding_pct,
+            "final_capital": self.final_capital,
+        }
 
 
 class BacktestEngine:
@@ -39,6 +77,8 @@ class BacktestEngine:
     回测引擎：支持多策略。
     买入：buy_strategies 全部命中才买入；卖出：sell_strategies 任一命中即卖出。
     可传入列表或单个策略（单个会自动包装为列表）。
+    slippage_pct 为滑点比例（0.001 即 0.1%）：买入按收盘价上浮、卖出按成交价下调该比例成交。
+    profile=True 时记录各阶段与各策略的耗时、调用次数与命中率（BacktestResult.profile）。
     """
 
     def __init__(
@@ -52,6 +92,7 @@ class BacktestEngine:
         slippage_pct: float = BACKTEST_SLIPPAGE_PCT,
         commission_per_share: float = BACKTEST_COMMISSION_PER_SHARE,
         strategy_name: Optional[str] = None,
+        profile: bool = False,
     ) -> None:
         self.buy_strategies = buy_strategies if buy_strategies is not None else ([buy_strategy] if buy_strategy is not None else [])
         self.sell_strategies = sell_strategies if sell_strategies is not None else ([sell_strategy] if sell_strategy is not None else [])
@@ -63,6 +104,7 @@ class BacktestEngine:
         self.commission_per_share = commission_per_share
         names = "_".join(s.name for s in self.buy_strategies) + "_" + "_".join(s.name for s in self.sell_strategies)
         self.strategy_name = strategy_name or names
+        self.profile = profile
 
     def run(
         self,
@@ -70,44 +112,92 @@ class BacktestEngine:
         end: Optional[str] = None,
     ) -> BacktestResult:
         """执行回测，返回 BacktestResult。"""
+        t0 = time.perf_counter()
         df = get_bars(self.symbol, start=start, end=end)
+        load_seconds = time.perf_counter() - t0
+        result = self.run_bars(df)
+        if result.profile is not None:
+            result.profile.phases["load"] += load_seconds
+        return result
+
+    def run_bars(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[IndicatorCache] = None,
+    ) -> BacktestResult:
+        """
+        在已加载的 K 线上执行回测。参数扫描等批量场景可传入同一份 df 与 IndicatorCache 复用指标；
+        批量信号经进程级 SignalStore 按 (标的, 数据指纹, 策略参数) 缓存，多次运行间复用。
+        """
+        prof = RunProfile() if self.profile else None
         if df.empty or len(df) < 30:
-            return BacktestResult(initial_capital=self.initial_capital, final_capital=self.initial_capital)
+            return BacktestResult(initial_capital=self.initial_capital, final_capital=self.initial_capital, profile=prof)
 
         cash = self.initial_capital
         position = 0
         position_avg_cost = 0.0
-        position_entry_reason = ""
+        position_entry_reason = 0  # 开仓原因在交割单原因表中的编码
         high_since_entry = 0.0  # 买入后到当日（含）经历过的最高价，供移动止盈等使用
         holding_days_since_entry = 0  # 买入当日为 0，下一交易日为 1
         entry_bar_index = -1
-        trades: List[TradeRecord] = []
-        equity_by_date: List[tuple] = []
+        # 整段预计算指标缓存：各策略按 (指标, 参数) 共享，每个指标只算一次，避免逐 bar 在 history 上重算
+        if indicators is None:
+            indicators = IndicatorCache(df)
+        # 买入信号与持仓无关，整段预计算（未实现 compute_signals 的策略由 precompute_signals 逐 bar 汇总）；
+        # 卖出侧策略全部实现 compute_signals 时整段批量出信号，循环中只做数组查表，否则逐 bar 调 next()
+        t_phase = time.perf_counter() if prof is not None else 0.0
+        buy_batches = self._signal_batches(self.buy_strategies, df, indicators, prof)
+        sell_batches = self._signal_batches(self.sell_strategies, df, indicators, prof)
+        buy_fire = np.logical_and.reduce([b.action for b in buy_batches]) if buy_batches else np.ones(len(df), dtype=bool)
+        if prof is not None:
+            for s, b in zip(self.buy_strategies, buy_batches):
+                sp = prof.strategy(s.name, "buy")
+                sp.evaluated += len(df)
+                sp.hits += int(np.count_nonzero(b.action))
+            t_loop = time.perf_counter()
+            prof.phases["signals"] += t_loop - t_phase
+        # 逐 bar 路径用的只读上下文：每根 bar 只移动游标，不再构造 df.iloc 行与历史切片
+        ctx = BarContext.from_frame(df, indicators)
+        dates = to_days(df["date"])
+        trades = TradeLedger(dates, strategy_name=self.strategy_name, symbols=[self.symbol])
+        closes = df["close"].astype(float).tolist()
+        highs = df["high"].astype(float).tolist() if "high" in df.columns else closes
+        lows = df["low"].astype(float).tolist() if "low" in df.columns else closes
+        n = len(df)
+        # 资金曲线：当日收盘后权益，以及当日是否持仓（用于仅按持仓期算绩效）
+        equity_curve = np.empty(n)
+        in_position = np.zeros(n, dtype=bool)
+        # 事件跳转：空仓时卖出不求值、买入只在候选 bar 触发，中间各 bar 无任何状态变化（权益即现金），
+        # 故直接跳到下一个买入候选 bar；持仓期间逐 bar 推进，路径相关的卖出逻辑需要每根 bar 的状态
+        entry_bars = np.flatnonzero(buy_fire)
 
-        for i in range(len(df)):
-            row = df.iloc[i]
-            date_str = str(row["date"])
-            close = float(row["close"])
-            history = df.iloc[: i + 1]
+        i = 0
+        while i < n:
+            if position == 0:
+                k = int(np.searchsorted(entry_bars, i))
+                next_entry = int(entry_bars[k]) if k < len(entry_bars) else n
+                equity_curve[i:next_entry] = cash
+                i = next_entry
+                if i >= n:
+                    break
+            close = closes[i]
+            ctx.seek(i)
             # 移动止盈用「买入日至昨日」最高价给今日设止盈价，故先保留昨日最高再更新
             high_since_entry_prev = high_since_entry
             if position > 0:
-                high_since_entry = max(high_since_entry, float(row["high"]))
+                high_since_entry = max(high_since_entry, highs[i])
                 holding_days_since_entry += 1
 
             # 买入：全部策略都出 BUY 才触发
-            buy_signals = [
-                s.next(current_bar=row, history_df=history, current_position=position)
-                for s in self.buy_strategies
-            ]
-            buy_triggered = all(s.action == SignalAction.BUY for s in buy_signals)
-            buy_reason = " | ".join(s.reason for s in buy_signals) if buy_signals else ""
+            buy_triggered = bool(buy_fire[i])
 
-            # 卖出：任一策略出 SELL 即触发（传入成本、现价、买入后最高价等；high_since_entry_prev 供移动止盈「给第二天设止盈」用）
-            sell_signals = [
-                s.next(
-                    current_bar=row,
-                    history_df=history,
+            # 卖出：任一策略出 SELL 即触发；买入优先，空仓时卖出不生效，无需求值
+            sell_triggered = False
+            sell_reason = "信号"
+            sell_price: Optional[float] = None
+            if not buy_triggered and position > 0:
+                # 传入成本、现价、买入后最高价等；high_since_entry_prev 供移动止盈「给第二天设止盈」用
+                position_state = dict(
                     current_position=position,
                     position_avg_cost=position_avg_cost,
                     current_price=close,
@@ -116,25 +206,17 @@ class BacktestEngine:
                     holding_days_since_entry=holding_days_since_entry,
                     entry_bar_index=entry_bar_index,
                 )
-                for s in self.sell_strategies
-            ]
-            sell_triggered = any(s.action == SignalAction.SELL for s in sell_signals)
-            # 多策略同时触发时，取报价最高的信号（优先止盈、避免误用止损价）
-            sell_candidates = [s for s in sell_signals if s.action == SignalAction.SELL]
-            best_sell_price: Optional[float] = None
-            if sell_candidates:
-                def _sell_price(sig):
-                    p = getattr(sig, "price", None)
-                    return float(p) if p is not None and p > 0 else 0.0
-                best_sell = max(sell_candidates, key=_sell_price)
-                sell_reason = best_sell.reason
-                best_sell_price = getattr(best_sell, "price", None)
-            else:
-                sell_reason = "信号"
+                if sell_batches is not None:
+                    sell_triggered, sell_reason, sell_price = self._batch_sell_signal(sell_batches, i, position_state, prof)
+                else:
+                    sell_triggered, sell_reason, sell_price = self._next_sell_signal(ctx, position_state, prof)
 
+            timing_fill = prof is not None and (buy_triggered or sell_triggered)
+            if timing_fill:
+                t_fill = time.perf_counter()
             if buy_triggered and position >= 0:
-                # 买入：统一按收盘价
-                fill_price = close
+                # 买入：统一按收盘价，加滑点
+                fill_price = close * (1.0 + self.slippage_pct)
                 size = int(cash / fill_price)  # 简单全仓一股
                 if size <= 0:
                     pass
@@ -143,6 +225,7 @@ class BacktestEngine:
                     cost = size * fill_price + commission
                     if cost <= cash:
                         cash -= cost
+                        buy_reason = trades.reason_code(" | ".join(b.reason(i) for b in buy_batches))
                         if position == 0:
                             position_avg_cost = fill_price
                             position_entry_reason = buy_reason
@@ -153,34 +236,15 @@ class BacktestEngine:
                         high_since_entry = 0.0
                         holding_days_since_entry = 0
                         entry_bar_index = i
-                        rec = TradeRecord(
-                            timestamp=datetime.strptime(date_str, "%Y-%m-%d"),
-                            symbol=self.symbol,
-                            side="买入",
-                            price=fill_price,
-                            quantity=size,
-                            commission=commission,
-                            strategy_name=self.strategy_name,
-                            entry_reason=buy_reason,
-                            exit_reason="",
-                            pnl=0.0,
-                            roi=0.0,
-                            holdings_after=position,
-                        )
-                        trades.append(rec)
+                        trades.append(i, SIDE_BUY, fill_price, size, commission, entry_reason=buy_reason, holdings_after=position)
 
             elif sell_triggered and position > 0:
                 # 卖出：多策略同时触发时已选报价最高者；价格限制在当日 bar 的 [low, high] 内
-                raw_price = best_sell_price
-                if raw_price is None or raw_price <= 0:
-                    first_sell = next((s for s in sell_signals if s.action == SignalAction.SELL), None)
-                    raw_price = getattr(first_sell, "price", None) if first_sell else None
-                if raw_price is not None and raw_price > 0:
-                    bar_low = float(row.get("low", close))
-                    bar_high = float(row.get("high", close))
-                    fill_price = max(bar_low, min(bar_high, raw_price))
+                if sell_price is not None and sell_price > 0:
+                    fill_price = max(lows[i], min(highs[i], sell_price))
                 else:
                     fill_price = close
+                fill_price *= 1.0 - self.slippage_pct
                 size = position  # 简单全平
                 commission = size * self.commission_per_share
                 cash += size * fill_price - commission
@@ -188,62 +252,51 @@ class BacktestEngine:
                 pnl = gross_pnl - commission
                 roi = (pnl / (position_avg_cost * size)) * 100.0 if position_avg_cost else 0.0
                 position = 0
-                rec = TradeRecord(
-                    timestamp=datetime.strptime(date_str, "%Y-%m-%d"),
-                    symbol=self.symbol,
-                    side="卖出",
-                    price=fill_price,
-                    quantity=size,
-                    commission=commission,
-                    strategy_name=self.strategy_name,
+                trades.append(
+                    i, SIDE_SELL, fill_price, size, commission,
                     entry_reason=position_entry_reason,
-                    exit_reason=sell_reason,
+                    exit_reason=trades.reason_code(sell_reason),
                     pnl=pnl,
                     roi=roi,
-                    holdings_after=0,
                 )
-                trades.append(rec)
                 position_avg_cost = 0.0
-                position_entry_reason = ""
+                position_entry_reason = 0
                 high_since_entry = 0.0
                 holding_days_since_entry = 0
                 entry_bar_index = -1
+            if timing_fill:
+                prof.phases["fills"] += time.perf_counter() - t_fill
 
-            # 资金曲线：当日收盘后权益，以及当日是否持仓（用于仅按持仓期算绩效）
-            equity = cash + position * close
-            equity_by_date.append((date_str, equity, position > 0))
+            equity_curve[i] = cash + position * close
+            in_position[i] = position > 0
+            i += 1
 
-        final_capital = cash + position * float(df.iloc[-1]["close"])
-        equity_df = pd.DataFrame(equity_by_date, columns=["date", "equity", "in_position"])
+        if prof is not None:
+            t_phase = time.perf_counter()
+            prof.phases["loop"] += t_phase - t_loop
+        final_capital = cash + position * closes[-1]
+        equity_df = pd.DataFrame({"date": dates, "equity": equity_curve, "in_position": in_position})
 
         # 总收益：按整体资金曲线（最终 vs 初始），与多笔交易一致
         total_return_pct = (final_capital - self.initial_capital) / self.initial_capital * 100.0
         # 持仓天数与按持仓时间年化收益
-        holding_days = int(equity_df["in_position"].sum())
+        holding_days = int(in_position.sum())
         annualized_return_holding_pct: Optional[float] = None
         if holding_days >= 1 and self.initial_capital > 0:
             total_return = (final_capital - self.initial_capital) / self.initial_capital
             # 年化 = (1 + 总收益率)^(252/持仓天数) - 1
             annualized_return_holding_pct = ((1.0 + total_return) ** (252.0 / holding_days) - 1.0) * 100.0
-        # 最大回撤、夏普：仅使用有持仓日的序列
-        eq_in = equity_df[equity_df["in_position"]].copy()
+        # 最大回撤、夏普、索提诺：仅使用有持仓日的序列；收益序列沿用首日记 0 的口径
+        eq_in = equity_curve[in_position]
         if len(eq_in) < 2:
-            max_dd = 0.0
-            sharpe = 0.0
+            max_dd = sharpe = sortino = 0.0
         else:
-            max_dd = 0.0
-            peak = float(eq_in["equity"].iloc[0])
-            for _, row in eq_in.iterrows():
-                eq = float(row["equity"])
-                if eq > peak:
-                    peak = eq
-                dd = (peak - eq) / peak * 100.0 if peak else 0.0
-                if dd > max_dd:
-                    max_dd = dd
-            eq_in = eq_in.copy()
-            eq_in["ret"] = eq_in["equity"].pct_change().fillna(0)
-            std = eq_in["ret"].std()
-            sharpe = (eq_in["ret"].mean() / std) * (252 ** 0.5) if std and std > 0 else 0.0
+            max_dd = float(metrics.max_drawdown_pct(eq_in))
+            ret = np.concatenate(([0.0], metrics.equity_returns(eq_in)))
+            sharpe = float(metrics.sharpe_ratio(ret))
+            sortino = float(metrics.sortino_ratio(ret))
+        calmar = annualized_return_holding_pct / max_dd if annualized_return_holding_pct is not None and max_dd > 0 else 0.0
+        pnl = trades.column("pnl")[trades.sell_mask()]
 
         result = BacktestResult(
             trades=trades,
@@ -251,13 +304,123 @@ class BacktestEngine:
             total_return_pct=total_return_pct,
             max_drawdown_pct=max_dd,
             sharpe_ratio=sharpe,
+            sortino_ratio=sortino,
+            calmar_ratio=calmar,
             initial_capital=self.initial_capital,
             final_capital=final_capital,
             holding_days=holding_days,
             annualized_return_holding_pct=annualized_return_holding_pct,
+            exposure_pct=float(metrics.exposure_pct(in_position)),
+            profit_factor=metrics.profit_factor(pnl),
+            profile=prof,
         )
+        if prof is not None:
+            prof.phases["metrics"] += time.perf_counter() - t_phase
         return result
 
+    def _signal_batches(
+        self,
+        strategies: List[BaseStrategy],
+        df: pd.DataFrame,
+        indicators: IndicatorCache,
+        prof: Optional[RunProfile] = None,
+    ) -> Optional[List[SignalBatch]]:
+        """
+        一侧策略的整段批量信号，经 SignalStore 缓存；买入策略总能给出（precompute_signals），
+        卖出策略有任一未实现 compute_signals 时返回 None。prof 非 None 时按策略记录耗时与是否命中缓存。
+        """
+        store = get_signal_store()
+        fingerprint = cache_fingerprint(indicators)
+        batches = []
+        for s in strategies:
+            if isinstance(s, BaseBuyStrategy):
+                compute = lambda s=s: s.precompute_signals(df, indicator_cache=indicators)
+            else:
+                compute = lambda s=s: s.compute_signals(df, indicator_cache=indicators)
+            if prof is None:
+                b = store.get_or_compute(store.key(self.symbol, fingerprint, s), compute)
+            else:
+                sp = prof.strategy(s.name, "buy" if isinstance(s, BaseBuyStrategy) else "sell")
+                misses = store.misses
+                t0 = time.perf_counter()
+                b = store.get_or_compute(store.key(self.symbol, fingerprint, s), compute)
+                sp.cache_hit = store.misses == misses
+                sp.signal_seconds += 0.0 if sp.cache_hit else time.perf_counter() - t0
+            if b is None:
+                return None
+            batches.append(b)
+        return batches
+
+    def _next_sell_signal(
+        self, ctx: BarContext, position_state: dict, prof: Optional[RunProfile] = None
+    ) -> Tuple[bool, str, Optional[float]]:
+        """
+        逐 bar 调用卖出策略 next()，ctx 已指向当前 bar；任一命中即触发。
+        返回 (是否卖出, 卖出原因, 卖出报价)。
+        """
+        if prof is None:
+            sell_signals = [
+                s.next(current_bar=ctx, history_df=None, **position_state)
+                for s in self.sell_strategies
+            ]
+        else:
+            sell_signals = []
+            for s in self.sell_strategies:
+                t0 = time.perf_counter()
+                sig = s.next(current_bar=ctx, history_df=None, **position_state)
+                self._record_call(prof, s, time.perf_counter() - t0, sig.action == SignalAction.SELL)
+                sell_signals.append(sig)
+        # 多策略同时触发时，取报价最高的信号（优先止盈、避免误用止损价）
+        sell_candidates = [s for s in sell_signals if s.action == SignalAction.SELL]
+        if not sell_candidates:
+            return False, "信号", None
+
+        def _sell_price(sig):
+            p = getattr(sig, "price", None)
+            return float(p) if p is not None and p > 0 else 0.0
+        best_sell = max(sell_candidates, key=_sell_price)
+        sell_price = getattr(best_sell, "price", None)
+        if sell_price is None or sell_price <= 0:
+            sell_price = getattr(sell_candidates[0], "price", None)
+        return True, best_sell.reason, sell_price
+
+    def _batch_sell_signal(
+        self, sell_batches: List[SignalBatch], i: int, position_state: dict, prof: Optional[RunProfile] = None
+    ) -> Tuple[bool, str, Optional[float]]:
+        """快路径：从批量信号中取第 i 根 bar 的卖出结果，返回值同 _next_sell_signal。"""
+        best_price = -1.0
+        best: Optional[Tuple[SignalBatch, float]] = None
+        for s, batch in zip(self.sell_strategies, sell_batches):
+            if prof is None:
+                fired, price = s.batch_signal(batch, i, **position_state)
+            else:
+                t0 = time.perf_counter()
+                fired, price = s.batch_signal(batch, i, **position_state)
+                self._record_call(prof, s, time.perf_counter() - t0, fired)
+            if not fired:
+                continue
+            key = price if price > 0 else 0.0  # NaN 不大于 0，同无报价
+            if key > best_price:
+                best_price = key
+                best = (batch, price)
+        if best is None:
+            return False, "信号", None
+        batch, price = best
+        return True, batch.reason(i), (price if price > 0 else None)
+
+    @staticmethod
+    def _record_call(prof: RunProfile, strategy: BaseStrategy, seconds: float, fired: bool) -> None:
+        sp = prof.strategy(strategy.name, "sell")
+        sp.calls += 1
+        sp.seconds += seconds
+        sp.evaluated += 1
+        sp.hits += bool(fired)
+
+    def result_path(self, result_id: Optional[str] = None) -> Path:
+        """交割单 CSV 路径：store/backtest_results/bt_{策略名}_{标的}_{result_id 或当前时间}.csv。"""
+        suffix = datetime.now().strftime("%Y%m%d_%H%M%S") if not result_id else result_id
+        return BACKTEST_RESULTS_DIR / f"bt_{self.strategy_name}_{self.symbol}_{suffix}.csv"
+
     def run_and_save(
         self,
         start: Optional[str] = None,
@@ -267,37 +430,16 @@ class BacktestEngine:
         """执行回测并将交割单保存到 store/backtest_results，返回 (result, csv_path)。"""
         result = self.run(start=start, end=end)
         BACKTEST_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
-        suffix = datetime.now().strftime("%Y%m%d_%H%M%S") if not result_id else result_id
-        filename = f"bt_{self.strategy_name}_{self.symbol}_{suffix}.csv"
-        path = BACKTEST_RESULTS_DIR / filename
-        columns = [
-            "trade_id", "timestamp", "symbol", "side", "price", "quantity",
-            "commission", "strategy_name", "entry_reason", "exit_reason",
-            "pnl", "roi", "holdings_after",
-        ]
-        rows = [
-            {
-                "trade_id": t.trade_id,
-                "timestamp": t.timestamp.isoformat(),
-                "symbol": t.symbol,
-                "side": t.side,
-                "price": t.price,
-                "quantity": t.quantity,
-                "commission": t.commission,
-                "strategy_name": t.strategy_name,
-                "entry_reason": t.entry_reason,
-                "exit_reason": t.exit_reason,
-                "pnl": t.pnl,
-                "roi": t.roi,
-                "holdings_after": t.holdings_after,
-            }
-            for t in result.trades
-        ]
-        pd.DataFrame(rows, columns=columns).to_csv(path, index=False)
+        path = self.result_path(result_id)
+        result.trades.to_csv(path)
         # 同时保存资金曲线供 Web 展示
         equity_path = path.with_name(path.stem + "_equity.csv")
         if not result.equity_curve.empty:
             result.equity_curve.to_csv(equity_path, index=False)
         else:
             pd.DataFrame(columns=["date", "equity"]).to_csv(equity_path, index=False)
+        # 剖析结果与交割单同名，后缀 _profile.json
+        if result.profile is not None:
+            profile_path = path.with_name(path.stem + "_profile.json")
+            profile_path.write_text(json.dumps(result.profile.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
         return result, path
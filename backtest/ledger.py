@@ -0,0 +1,232 @@
+"""
+列式交割单：每个字段一列预分配的 NumPy 数组（按需倍增扩容），买卖方向与开平仓原因存为整数编码，
+成交日期存为日期轴上的下标。回测循环中每笔成交只写几个标量，不构造 Pydantic 对象、不生成 uuid、不解析日期；
+API / 界面需要时再按需转为 TradeRecord，保存时由整列直接生成 DataFrame 写 CSV / Parquet。
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Union
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+from core.dates import to_days
+from core.types import TradeRecord
+
+SIDE_BUY = 0
+SIDE_SELL = 1
+SIDE_LABELS = ("买入", "卖出")
+
+# 交割单 CSV 列顺序（Web 详情页按此读取）
+LEDGER_COLUMNS = [
+    "trade_id", "timestamp", "symbol", "side", "price", "quantity",
+    "commission", "strategy_name", "entry_reason", "exit_reason",
+    "pnl", "roi", "holdings_after",
+]
+
+_DTYPES: Dict[str, type] = {
+    "date_index": np.int32,  # 在 dates 上的下标
+    "symbol": np.int32,  # 在 symbols 上的下标
+    "side": np.int8,  # SIDE_BUY / SIDE_SELL
+    "price": np.float64,
+    "quantity": np.int64,
+    "commission": np.float64,
+    "entry_reason": np.int32,  # 在 reasons 上的下标
+    "exit_reason": np.int32,
+    "pnl": np.float64,
+    "roi": np.float64,
+    "holdings_after": np.int64,
+}
+
+
+class TradeLedger:
+    """
+    列式交割单。
+    - dates：成交日期轴（datetime64[D] 数组，通常即回测的 K 线日期），成交按下标引用
+    - symbols：标的表，单标的回测只有一项；组合回测按标的下标引用
+    - reasons：原因字符串表，相同原因只存一份，下标 0 为空串
+    len / 迭代 / 下标取值与 List[TradeRecord] 一致，旧调用方无需改动。
+    """
+
+    def __init__(
+        self,
+        dates: Sequence = (),
+        strategy_name: str = "",
+        symbols: Sequence[str] = (),
+        capacity: int = 64,
+    ) -> None:
+        self.dates = dates
+        self.strategy_name = strategy_name
+        self.symbols: List[str] = list(symbols)
+        self.reasons: List[str] = [""]
+        self._reason_codes: Dict[str, int] = {"": 0}
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in _DTYPES.items()}
+        self._n = 0
+        self._trade_ids: List[str] = []
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[TradeRecord]:
+        return iter(self.to_records())
+
+    def __getitem__(self, k: Union[int, slice]) -> Union[TradeRecord, List[TradeRecord]]:
+        """只构造所取的行：单笔 O(1)，切片与其长度成正比。"""
+        rows = range(self._n)[k]
+        if isinstance(rows, int):
+            return self._records([rows])[0]
+        return self._records(rows)
+
+    def column(self, name: str) -> np.ndarray:
+        """某一列已写入部分的只读视图，如 column("roi")、column("side")。"""
+        view = self._columns[name][: self._n]
+        view.flags.writeable = False
+        return view
+
+    def reason_code(self, reason: str) -> int:
+        """原因字符串的编码，首次出现时加入原因表。"""
+        code = self._reason_codes.get(reason)
+        if code is None:
+            code = self._reason_codes[reason] = len(self.reasons)
+            self.reasons.append(reason)
+        return code
+
+    def symbol_code(self, symbol: str) -> int:
+        if symbol not in self.symbols:
+            self.symbols.append(symbol)
+        return self.symbols.index(symbol)
+
+    # ----- 写入 -----
+
+    def append(
+        self,
+        date_index: int,
+        side: int,
+        price: float,
+        quantity: int,
+        commission: float = 0.0,
+        entry_reason: int = 0,
+        exit_reason: int = 0,
+        pnl: float = 0.0,
+        roi: float = 0.0,
+        holdings_after: int = 0,
+        symbol: int = 0,
+    ) -> None:
+        """追加一笔成交；原因与标的均传编码（reason_code / symbol_code）。"""
+        if self._n == len(self._columns["side"]):
+            self._reserve(self._n + 1)
+        k = self._n
+        c = self._columns
+        c["date_index"][k] = date_index
+        c["symbol"][k] = symbol
+        c["side"][k] = side
+        c["price"][k] = price
+        c["quantity"][k] = quantity
+        c["commission"][k] = commission
+        c["entry_reason"][k] = entry_reason
+        c["exit_reason"][k] = exit_reason
+        c["pnl"][k] = pnl
+        c["roi"][k] = roi
+        c["holdings_after"][k] = holdings_after
+        self._n = k + 1
+
+    def extend(self, **columns: np.ndarray) -> None:
+        """整列追加多笔成交：各列等长，缺省列按 append 的默认值填充。"""
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("各列长度不一致")
+        m = lengths.pop() if lengths else 0
+        if m == 0:
+            return
+        self._reserve(self._n + m)
+        for name, col in self._columns.items():
+            col[self._n: self._n + m] = columns.get(name, 0)
+        self._n += m
+
+    def _reserve(self, size: int) -> None:
+        capacity = max(size, 2 * len(self._columns["side"]), 16)
+        for name, col in self._columns.items():
+            grown = np.empty(capacity, dtype=col.dtype)
+            grown[: self._n] = col[: self._n]
+            self._columns[name] = grown
+
+    # ----- 读取与转换 -----
+
+    def timestamps(self) -> np.ndarray:
+        """各笔成交日期（datetime64[s]，当日零点）。"""
+        return to_days(self.dates)[self.column("date_index")].astype("datetime64[s]")
+
+    def trade_ids(self) -> List[str]:
+        """成交编号：首次需要时才生成 uuid，之后保持不变。"""
+        self._fill_trade_ids(self._n)
+        return self._trade_ids[: self._n]
+
+    def _fill_trade_ids(self, m: int) -> None:
+        while len(self._trade_ids) < m:
+            self._trade_ids.append(str(uuid4()))
+
+    def to_records(self) -> List[TradeRecord]:
+        """转为 TradeRecord 列表（供 API / 界面）。"""
+        return self._records(range(self._n))
+
+    def _records(self, rows: Sequence[int]) -> List[TradeRecord]:
+        """由各列构造指定行（非负下标）的 TradeRecord，只转换这些行的日期。"""
+        idx = np.asarray(rows, dtype=np.intp)
+        if idx.size == 0:
+            return []
+        self._fill_trade_ids(int(idx.max()) + 1)
+        c = {name: self._columns[name][idx].tolist() for name in _DTYPES}
+        days = to_days(np.asarray(self.dates)[self._columns["date_index"][idx]])
+        stamps: List[datetime] = days.astype("datetime64[s]").tolist()
+        return [
+            TradeRecord(
+                trade_id=self._trade_ids[row],
+                timestamp=stamps[k],
+                symbol=self.symbols[c["symbol"][k]],
+                side=SIDE_LABELS[c["side"][k]],
+                price=c["price"][k],
+                quantity=c["quantity"][k],
+                commission=c["commission"][k],
+                strategy_name=self.strategy_name,
+                entry_reason=self.reasons[c["entry_reason"][k]],
+                exit_reason=self.reasons[c["exit_reason"][k]],
+                pnl=c["pnl"][k],
+                roi=c["roi"][k],
+                holdings_after=c["holdings_after"][k],
+            )
+            for k, row in enumerate(idx.tolist())
+        ]
+
+    def to_frame(self) -> pd.DataFrame:
+        """交割单表（列同 LEDGER_COLUMNS），整列由编码查表生成，不经逐行 dict。"""
+        reasons = np.asarray(self.reasons, dtype=object)
+        symbols = np.asarray(self.symbols or [""], dtype=object)
+        return pd.DataFrame(
+            {
+                "trade_id": self.trade_ids(),
+                "timestamp": np.datetime_as_string(self.timestamps(), unit="s"),
+                "symbol": symbols[self.column("symbol")],
+                "side": np.asarray(SIDE_LABELS, dtype=object)[self.column("side")],
+                "price": self.column("price"),
+                "quantity": self.column("quantity"),
+                "commission": self.column("commission"),
+                "strategy_name": self.strategy_name,
+                "entry_reason": reasons[self.column("entry_reason")],
+                "exit_reason": reasons[self.column("exit_reason")],
+                "pnl": self.column("pnl"),
+                "roi": self.column("roi"),
+                "holdings_after": self.column("holdings_after"),
+            },
+            columns=LEDGER_COLUMNS,
+        )
+
+    def to_csv(self, path: Union[str, Path], **kwargs) -> None:
+        self.to_frame().to_csv(path, index=False, **kwargs)
+
+    def to_parquet(self, path: Union[str, Path], **kwargs) -> None:
+        """写 Parquet（需安装 pyarrow 或 fastparquet）。"""
+        self.to_frame().to_parquet(path, index=False, **kwargs)
+
+    def sell_mask(self) -> np.ndarray:
+        return self.column("side") == SIDE_SELL
@@ -0,0 +1,187 @@
+"""
+绩效指标：在资金曲线数组上向量化计算，与回测引擎解耦。
+时间沿最后一维：一维数组为单条资金曲线，二维 (曲线数 × bar 数) 为多条曲线（参数扫描、蒙特卡洛路径），
+逐条的标量指标一次算出，返回长度 = 曲线数的数组。
+"""
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.dates import to_days
+
+PERIODS_PER_YEAR = 252
+
+
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    """逐 bar 回撤（小数）：相对此前（含当日）最高权益的跌幅，峰值为 0 处记 0。"""
+    equity = np.asarray(equity, dtype=float)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(peak != 0, (peak - equity) / peak, 0.0)
+
+
+def max_drawdown_pct(equity: np.ndarray) -> np.ndarray:
+    """最大回撤（%），空序列为 0。"""
+    equity = np.asarray(equity, dtype=float)
+    if equity.shape[-1] == 0:
+        return np.zeros(equity.shape[:-1]) if equity.ndim > 1 else np.float64(0.0)
+    return drawdown(equity).max(axis=-1) * 100.0
+
+
+def equity_returns(equity: np.ndarray) -> np.ndarray:
+    """逐 bar 简单收益率（长度少 1），口径同 pandas pct_change。"""
+    equity = np.asarray(equity, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return equity[..., 1:] / equity[..., :-1] - 1.0
+
+
+def sharpe_ratio(returns: np.ndarray, periods: int = PERIODS_PER_YEAR) -> np.ndarray:
+    """年化夏普（无风险利率取 0）：均值 / 样本标准差 × √periods，标准差为 0 或样本不足 2 个时为 0。"""
+    returns = np.asarray(returns, dtype=float)
+    if returns.shape[-1] < 2:
+        return np.zeros(returns.shape[:-1]) if returns.ndim > 1 else np.float64(0.0)
+    std = returns.std(axis=-1, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, returns.mean(axis=-1) / std * periods ** 0.5, 0.0)
+
+
+def sortino_ratio(returns: np.ndarray, periods: int = PERIODS_PER_YEAR) -> np.ndarray:
+    """年化索提诺：均值 / 下行偏差 × √periods，下行偏差为负收益平方的均值开方（目标收益 0）；无下行时为 0。"""
+    returns = np.asarray(returns, dtype=float)
+    if returns.shape[-1] < 2:
+        return np.zeros(returns.shape[:-1]) if returns.ndim > 1 else np.float64(0.0)
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2, axis=-1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(downside > 0, returns.mean(axis=-1) / downside * periods ** 0.5, 0.0)
+
+
+def annualized_return_pct(equity: np.ndarray, periods: int = PERIODS_PER_YEAR) -> np.ndarray:
+    """年化收益（%）：(期末 / 期初)^(periods / bar 间隔数) - 1。"""
+    equity = np.asarray(equity, dtype=float)
+    n = equity.shape[-1]
+    if n < 2:
+        return np.zeros(equity.shape[:-1]) if equity.ndim > 1 else np.float64(0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.where(equity[..., 0] > 0, equity[..., -1] / equity[..., 0], np.nan)
+        return (np.power(np.maximum(growth, 0.0), periods / (n - 1)) - 1.0) * 100.0
+
+
+def calmar_ratio(equity: np.ndarray, periods: int = PERIODS_PER_YEAR) -> np.ndarray:
+    """卡玛比率：年化收益 / 最大回撤，回撤为 0 时为 0。"""
+    ann = annualized_return_pct(equity, periods)
+    dd = max_drawdown_pct(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(dd > 0, ann / dd, 0.0)
+
+
+def exposure_pct(in_position: np.ndarray) -> np.ndarray:
+    """持仓时间占比（%）。"""
+    in_position = np.asarray(in_position, dtype=bool)
+    if in_position.shape[-1] == 0:
+        return np.zeros(in_position.shape[:-1]) if in_position.ndim > 1 else np.float64(0.0)
+    return in_position.mean(axis=-1) * 100.0
+
+
+def win_rate_pct(pnl: np.ndarray) -> float:
+    """逐笔平仓盈亏中盈利笔数占比（%），无交易为 0。"""
+    pnl = np.asarray(pnl, dtype=float)
+    return float((pnl > 0).mean() * 100.0) if pnl.size else 0.0
+
+
+def profit_factor(pnl: np.ndarray) -> float:
+    """盈亏比：盈利总额 / 亏损总额绝对值；无亏损时有盈利为 inf、否则为 0。"""
+    pnl = np.asarray(pnl, dtype=float)
+    gains = float(pnl[pnl > 0].sum())
+    losses = float(-pnl[pnl < 0].sum())
+    if losses > 0:
+        return gains / losses
+    return float("inf") if gains > 0 else 0.0
+
+
+def batch_metrics(equity: np.ndarray, periods: int = PERIODS_PER_YEAR) -> pd.DataFrame:
+    """
+    多条资金曲线的指标表：equity 为 (曲线数 × bar 数)，每条曲线一行，
+    列为 return_pct、annualized_pct、max_dd_pct、sharpe、sortino、calmar。
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=float))
+    returns = equity_returns(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = (equity[:, -1] / equity[:, 0] - 1.0) * 100.0 if equity.shape[1] else np.zeros(len(equity))
+    return pd.DataFrame({
+        "return_pct": total,
+        "annualized_pct": annualized_return_pct(equity, periods),
+        "max_dd_pct": max_drawdown_pct(equity),
+        "sharpe": sharpe_ratio(returns, periods),
+        "sortino": sortino_ratio(returns, periods),
+        "calmar": calmar_ratio(equity, periods),
+    })
+
+
+def rolling_metrics(
+    equity: np.ndarray,
+    window: int = PERIODS_PER_YEAR,
+    dates: Optional[Sequence] = None,
+    periods: int = PERIODS_PER_YEAR,
+) -> pd.DataFrame:
+    """
+    滚动窗口指标：每个以第 i 根 bar 结尾、长 window 的窗口一行（前 window-1 根无值不输出），
+    列为 return_pct、max_dd_pct、sharpe、sortino；窗口取滑动视图后按二维批量计算。
+    """
+    equity = np.asarray(equity, dtype=float)
+    if len(equity) < window:
+        return pd.DataFrame(columns=["date", "return_pct", "max_dd_pct", "sharpe", "sortino"])
+    windows = np.lib.stride_tricks.sliding_window_view(equity, window)
+    returns = equity_returns(windows)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = (windows[:, -1] / windows[:, 0] - 1.0) * 100.0
+    frame = pd.DataFrame({
+        "return_pct": total,
+        "max_dd_pct": max_drawdown_pct(windows),
+        "sharpe": sharpe_ratio(returns, periods),
+        "sortino": sortino_ratio(returns, periods),
+    })
+    frame.insert(0, "date", np.asarray(dates)[window - 1:] if dates is not None else np.arange(window - 1, len(equity)))
+    return frame
+
+
+def yearly_metrics(dates: Sequence, equity: np.ndarray, periods: int = PERIODS_PER_YEAR) -> pd.DataFrame:
+    """
+    分年度指标：每个自然年一行，列为 year、return_pct、max_dd_pct、sharpe、sortino。
+    年度收益以上一年末权益为基准（首年以首日），回撤在年内计算。
+    """
+    equity = np.asarray(equity, dtype=float)
+    years = to_days(dates).astype("datetime64[Y]").astype(np.int64) + 1970
+    rows = []
+    bounds = np.flatnonzero(np.diff(years)) + 1
+    starts = np.concatenate(([0], bounds))
+    stops = np.concatenate((bounds, [len(equity)]))
+    for start, stop in zip(starts, stops):
+        base = equity[start - 1] if start > 0 else equity[start]
+        segment = equity[max(start - 1, 0):stop]
+        returns = equity_returns(segment)
+        rows.append({
+            "year": int(years[start]),
+            "return_pct": (equity[stop - 1] / base - 1.0) * 100.0 if base else 0.0,
+            "max_dd_pct": float(max_drawdown_pct(equity[start:stop])),
+            "sharpe": float(sharpe_ratio(returns, periods)),
+            "sortino": float(sortino_ratio(returns, periods)),
+        })
+    return pd.DataFrame(rows, columns=["year", "return_pct", "max_dd_pct", "sharpe", "sortino"])
+
+
+def equity_metrics(
+    equity: np.ndarray,
+    in_position: Optional[np.ndarray] = None,
+    trade_pnl: Optional[np.ndarray] = None,
+    periods: int = PERIODS_PER_YEAR,
+) -> Dict[str, float]:
+    """单条资金曲线的指标 dict；给出 in_position 时附持仓占比，给出逐笔平仓盈亏时附胜率与盈亏比。"""
+    equity = np.asarray(equity, dtype=float)
+    out = batch_metrics(equity, periods).iloc[0].to_dict() if len(equity) else {}
+    if in_position is not None:
+        out["exposure_pct"] = float(exposure_pct(in_position))
+    if trade_pnl is not None:
+        out["win_rate_pct"] = win_rate_pct(trade_pnl)
+        out["profit_factor"] = profit_factor(trade_pnl)
+    return out
@@ -0,0 +1,124 @@
+"""
+蒙特卡洛稳健性检验：对回测的逐笔交易收益做有放回重抽样（bootstrap）或打乱顺序（shuffle），
+生成成千上万条交易路径，统计期末收益、最大回撤与最长连亏笔数的分布。
+
+全部路径放在一个 (路径数 × 交易笔数) 二维数组上向量化计算，不按路径循环；
+路径数很大时按块处理以限制内存，块内仍为整块数组运算。
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from backtest import metrics
+from backtest.ledger import SIDE_SELL, TradeLedger
+from core.types import TradeRecord
+
+METHODS = ("bootstrap", "shuffle")
+
+# 单块路径数上限：100k 路径 × 数百笔时每块约几十 MB
+_CHUNK_PATHS = 10_000
+
+
+@dataclass
+class MonteCarloResult:
+    """各路径的统计量，均为长度 = 路径数的一维数组。"""
+    final_return_pct: np.ndarray
+    max_drawdown_pct: np.ndarray
+    longest_losing_streak: np.ndarray
+    n_trades: int = 0
+    method: str = "bootstrap"
+
+    def summary(self, percentiles: Sequence[float] = (5, 25, 50, 75, 95)) -> pd.DataFrame:
+        """分布摘要：每个统计量一行，列为均值、标准差与各分位数。"""
+        rows = {}
+        for name in ("final_return_pct", "max_drawdown_pct", "longest_losing_streak"):
+            values = getattr(self, name)
+            row = {"mean": float(values.mean()) if values.size else 0.0, "std": float(values.std()) if values.size else 0.0}
+            qs = np.percentile(values, percentiles) if values.size else np.zeros(len(percentiles))
+            row.update({f"p{p:g}": float(q) for p, q in zip(percentiles, qs)})
+            rows[name] = row
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def trade_returns(trades: Union[TradeLedger, List[TradeRecord], pd.DataFrame]) -> np.ndarray:
+    """
+    逐笔交易收益率（小数）：取每笔卖出的 roi（%）/ 100，按成交顺序。
+    支持 BacktestResult.trades（TradeLedger）、TradeRecord 列表或交割单 CSV 读出的 DataFrame。
+    """
+    if isinstance(trades, TradeLedger):
+        return trades.column("roi")[trades.column("side") == SIDE_SELL] / 100.0
+    if isinstance(trades, pd.DataFrame):
+        if trades.empty:
+            return np.zeros(0)
+        sells = trades[trades["side"] == "卖出"]
+        return sells["roi"].to_numpy(dtype=float) / 100.0
+    return np.array([t.roi for t in trades if t.side == "卖出"], dtype=float) / 100.0
+
+
+def sample_paths(
+    returns: np.ndarray,
+    n_paths: int,
+    method: str = "bootstrap",
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """生成 (n_paths × 交易笔数) 的收益路径：bootstrap 有放回抽样，shuffle 为每条路径独立打乱原序列。"""
+    if method not in METHODS:
+        raise ValueError(f"未知抽样方式 {method!r}，可选 {METHODS}")
+    rng = rng if rng is not None else np.random.default_rng()
+    returns = np.asarray(returns, dtype=float)
+    n = len(returns)
+    if n == 0:
+        return np.zeros((n_paths, 0))
+    if method == "bootstrap":
+        return returns[rng.integers(0, n, size=(n_paths, n))]
+    return rng.permuted(np.broadcast_to(returns, (n_paths, n)), axis=1)
+
+
+def path_statistics(paths: np.ndarray) -> tuple:
+    """
+    每条路径的 (期末收益 %, 最大回撤 %, 最长连亏笔数)。
+    资金按逐笔收益复利（全仓进出），回撤的峰值含初始资金。
+    """
+    n_paths = paths.shape[0]
+    equity = np.empty((n_paths, paths.shape[1] + 1))
+    equity[:, 0] = 1.0
+    np.cumprod(1.0 + paths, axis=1, out=equity[:, 1:])
+    max_dd = metrics.max_drawdown_pct(equity)
+    final = (equity[:, -1] - 1.0) * 100.0
+
+    # 连亏：亏损笔的累计计数减去最近一次非亏损处的计数，即当前连亏长度
+    loss = paths < 0
+    count = np.cumsum(loss, axis=1)
+    reset = np.maximum.accumulate(np.where(loss, 0, count), axis=1)
+    streak = (count - reset).max(axis=1) if paths.shape[1] else np.zeros(n_paths, dtype=np.int64)
+    return final, max_dd, streak
+
+
+def run_monte_carlo(
+    trades: Union[TradeLedger, List[TradeRecord], pd.DataFrame, np.ndarray],
+    n_paths: int = 10_000,
+    method: str = "bootstrap",
+    seed: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    API 入口：trades 为交割单（TradeLedger、TradeRecord 列表或 DataFrame）或直接给出逐笔收益率数组。
+    返回各路径统计量；seed 固定时结果可复现。
+    """
+    returns = trades if isinstance(trades, np.ndarray) else trade_returns(trades)
+    rng = np.random.default_rng(seed)
+    finals, dds, streaks = [], [], []
+    for start in range(0, n_paths, _CHUNK_PATHS):
+        paths = sample_paths(returns, min(_CHUNK_PATHS, n_paths - start), method=method, rng=rng)
+        final, dd, streak = path_statistics(paths)
+        finals.append(final)
+        dds.append(dd)
+        streaks.append(streak)
+    return MonteCarloResult(
+        final_return_pct=np.concatenate(finals) if finals else np.zeros(0),
+        max_drawdown_pct=np.concatenate(dds) if dds else np.zeros(0),
+        longest_losing_streak=np.concatenate(streaks) if streaks else np.zeros(0, dtype=np.int64),
+        n_trades=len(returns),
+        method=method,
+    )
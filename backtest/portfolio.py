@@ -0,0 +1,348 @@
+"""
+组合回测：多标的共用一个资金账户，按统一日期轴逐日推进。
+每个交易日对全部标的做一次横截面向量运算（(日期 × 标的) 二维数组），不按标的循环：
+先按各卖出策略的 cross_signal 平仓，再在空闲仓位内按信号强度排序开新仓。
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest import metrics
+from backtest.ledger import SIDE_BUY, SIDE_SELL, TradeLedger
+from core.config import BACKTEST_COMMISSION_PER_SHARE, BACKTEST_INITIAL_CAPITAL, BACKTEST_SLIPPAGE_PCT
+from core.dates import to_days
+from data.loader import get_bars_many
+from strategies.base import SignalBatch
+from strategies.buy.base import BaseBuyStrategy
+from strategies.indicators import IndicatorCache
+from strategies.sell.base import BaseSellStrategy
+from strategies.signal_store import cache_fingerprint, get_signal_store
+
+# 分配方式：equal_weight 每仓目标为当日权益 / max_positions；equal_cash 当日可用现金在新开仓间均分
+ALLOCATIONS = ("equal_weight", "equal_cash")
+
+
+@dataclass
+class PortfolioSignals:
+    """
+    组合回测输入：按统一日期轴对齐的行情与整段批量信号。
+    二维数组形状均为 (日期数, 标的数)，标的当日无 K 线处行情为 NaN、信号为 False。
+    """
+    symbols: List[str]
+    dates: np.ndarray  # datetime64[D]，升序
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    buy: np.ndarray  # bool，全部买入策略同时触发
+    strength: np.ndarray  # 买入信号强度（各买入策略均值），用于排序
+    buy_batches: List[SignalBatch] = field(default_factory=list)
+    sell_batches: List[SignalBatch] = field(default_factory=list)
+
+
+@dataclass
+class PortfolioResult:
+    """组合回测结果：交割单（列式）、资金曲线（date, equity, cash, positions）与绩效摘要。"""
+    trades: TradeLedger = field(default_factory=TradeLedger)
+    equity_curve: pd.DataFrame = field(default_factory=pd.DataFrame)
+    total_return_pct: float = 0.0
+    max_drawdown_pct: float = 0.0
+    sharpe_ratio: float = 0.0
+    initial_capital: float = 0.0
+    final_capital: float = 0.0
+
+
+def _ffill_rows(values: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """按行向前填充：present 为 False 的行取之前最近一行的值，开头无值处为 0。"""
+    idx = np.where(present, np.arange(len(values)), 0)
+    np.maximum.accumulate(idx, out=idx)
+    out = values[idx]
+    out[~present & (np.cumsum(present) == 0)] = 0
+    return out
+
+
+def _align(values: np.ndarray, rows: np.ndarray, n_dates: int) -> np.ndarray:
+    """把单标的逐 bar 数组放到统一日期轴上：bool 缺失为 False，整数（计数类）向前填充，其余为 NaN。"""
+    if values.dtype == bool:
+        out = np.zeros(n_dates, dtype=bool)
+    elif np.issubdtype(values.dtype, np.integer):
+        out = np.zeros(n_dates, dtype=values.dtype)
+    else:
+        out = np.full(n_dates, np.nan)
+    out[rows] = values
+    if np.issubdtype(values.dtype, np.integer):
+        present = np.zeros(n_dates, dtype=bool)
+        present[rows] = True
+        out = _ffill_rows(out, present)
+    return out
+
+
+def stack_batches(batches: List[SignalBatch], rows: List[np.ndarray], n_dates: int) -> SignalBatch:
+    """同一策略在各标的上的批量信号对齐到统一日期轴并按列拼成二维 SignalBatch，原因表取并集。"""
+    reasons: dict = {}
+    codes = []
+    for b in batches:
+        remap = np.array([reasons.setdefault(r, len(reasons)) for r in b.reasons], dtype=np.int16)
+        codes.append(remap[b.reason_code])
+    keys = batches[0].inputs.keys()
+    return SignalBatch(
+        action=np.column_stack([_align(b.action, r, n_dates) for b, r in zip(batches, rows)]),
+        price=np.column_stack([_align(b.price, r, n_dates) for b, r in zip(batches, rows)]),
+        reason_code=np.column_stack([_align(c, r, n_dates) for c, r in zip(codes, rows)]),
+        reasons=tuple(reasons),
+        inputs={k: np.column_stack([_align(b.inputs[k], r, n_dates) for b, r in zip(batches, rows)]) for k in keys},
+        strength=np.column_stack([_align(b.strengths(), r, n_dates) for b, r in zip(batches, rows)]),
+    )
+
+
+class PortfolioEngine:
+    """
+    组合回测引擎：symbols 共用 initial_capital 一个现金账户。
+    - 买入：buy_strategies 全部命中；最多持有 max_positions 只，候选按信号强度（或传入的 scores）降序、同分按标的顺序
+    - 卖出：sell_strategies 任一命中即全平，报价规则同 BacktestEngine（取最高报价，限制在当日 [low, high]）
+    - 滑点同 BacktestEngine：买入按收盘价上浮、卖出按成交价下调 slippage_pct（比例）
+    - 已持仓标的再次出现买入信号时不加仓，当日也不卖出（同单标的引擎的买入优先）
+    卖出策略须实现 compute_signals 与 cross_signal（内置卖出策略均已实现）。
+    """
+
+    def __init__(
+        self,
+        buy_strategies: List[BaseBuyStrategy],
+        sell_strategies: List[BaseSellStrategy],
+        symbols: List[str],
+        initial_capital: float = BACKTEST_INITIAL_CAPITAL,
+        slippage_pct: float = BACKTEST_SLIPPAGE_PCT,
+        commission_per_share: float = BACKTEST_COMMISSION_PER_SHARE,
+        max_positions: int = 5,
+        allocation: str = "equal_weight",
+        strategy_name: Optional[str] = None,
+    ) -> None:
+        if allocation not in ALLOCATIONS:
+            raise ValueError(f"未知分配方式 {allocation!r}，可选 {ALLOCATIONS}")
+        self.buy_strategies = buy_strategies
+        self.sell_strategies = sell_strategies
+        self.symbols = [s.upper() for s in symbols]
+        self.initial_capital = initial_capital
+        self.slippage_pct = slippage_pct
+        self.commission_per_share = commission_per_share
+        self.max_positions = max(1, int(max_positions))
+        self.allocation = allocation
+        self.strategy_name = strategy_name or "+".join(s.name for s in buy_strategies + sell_strategies)
+
+    def run(self, start: Optional[str] = None, end: Optional[str] = None) -> PortfolioResult:
+        """加载数据、预计算信号并执行组合回测。"""
+        return self.run_signals(self.prepare(start, end))
+
+    def prepare(self, start: Optional[str] = None, end: Optional[str] = None) -> PortfolioSignals:
+        """并发加载各标的 K 线，整段预计算买卖信号（经 SignalStore 缓存），对齐到全部标的日期的并集上。"""
+        frames = get_bars_many(self.symbols, start=start, end=end)
+        # 无数据的标的不进入日期轴与信号矩阵
+        frames = {sym: df for sym, df in frames.items() if not df.empty}
+        symbols = list(frames)
+        days = {sym: to_days(df["date"]) for sym, df in frames.items()}
+        dates = np.unique(np.concatenate(list(days.values()) or [np.zeros(0, dtype="datetime64[D]")]))
+        n = len(dates)
+        store = get_signal_store()
+        rows, buys, sells, close, high, low = [], [], [], [], [], []
+        for sym in symbols:
+            df = frames[sym]
+            r = np.searchsorted(dates, days[sym])
+            ind = IndicatorCache(df)
+            fingerprint = cache_fingerprint(ind)
+            rows.append(r)
+            buys.append([
+                store.get_or_compute(store.key(sym, fingerprint, s), lambda s=s: s.precompute_signals(df, indicator_cache=ind))
+                for s in self.buy_strategies
+            ])
+            sell_batches = []
+            for s in self.sell_strategies:
+                b = store.get_or_compute(store.key(sym, fingerprint, s), lambda s=s: s.compute_signals(df, indicator_cache=ind))
+                if b is None:
+                    raise ValueError(f"卖出策略 {s.name} 未实现 compute_signals，无法用于组合回测")
+                sell_batches.append(b)
+            sells.append(sell_batches)
+            close.append(_align(ind.column("close").to_numpy(), r, n))
+            high.append(_align(ind.column("high").to_numpy(), r, n))
+            low.append(_align(ind.column("low").to_numpy(), r, n))
+
+        buy_batches = [stack_batches([b[k] for b in buys], rows, n) for k in range(len(self.buy_strategies))]
+        sell_batches = [stack_batches([b[k] for b in sells], rows, n) for k in range(len(self.sell_strategies))]
+        shape = (n, len(symbols))
+        buy = np.logical_and.reduce([b.action for b in buy_batches]) if buy_batches else np.zeros(shape, dtype=bool)
+        strength = np.mean([b.strengths() for b in buy_batches], axis=0) if buy_batches else np.zeros(shape)
+        return PortfolioSignals(
+            symbols=symbols,
+            dates=dates,
+            close=np.column_stack(close) if symbols else np.empty(shape),
+            high=np.column_stack(high) if symbols else np.empty(shape),
+            low=np.column_stack(low) if symbols else np.empty(shape),
+            buy=buy,
+            strength=strength,
+            buy_batches=buy_batches,
+            sell_batches=sell_batches,
+        )
+
+    def run_signals(self, signals: PortfolioSignals, scores: Optional[np.ndarray] = None) -> PortfolioResult:
+        """
+        在预计算信号上执行组合回测。scores 为 (日期 × 标的) 排序分数，缺省为 signals.strength；
+        每个交易日只做按标的的一维数组运算。
+        """
+        close, high, low = signals.close, signals.high, signals.low
+        n_dates, n_sym = close.shape
+        if n_dates == 0 or n_sym == 0:
+            return PortfolioResult(initial_capital=self.initial_capital, final_capital=self.initial_capital)
+        scores = signals.strength if scores is None else scores
+        sell_batches = signals.sell_batches
+        n_sell = len(self.sell_strategies)
+        comm = self.commission_per_share
+        slip = self.slippage_pct
+        cols = np.arange(n_sym)
+        valid = ~np.isnan(close)
+        # 逐日估值用的收盘价：停牌/未上市日沿用最近收盘价，从未有价处为 0
+        last_idx = np.where(valid, np.arange(n_dates)[:, None], 0)
+        np.maximum.accumulate(last_idx, axis=0, out=last_idx)
+        mark = np.nan_to_num(np.take_along_axis(close, last_idx, axis=0), nan=0.0)
+        has_buy = signals.buy.any(axis=1)
+
+        cash = float(self.initial_capital)
+        pos = np.zeros(n_sym, dtype=np.int64)
+        avg_cost = np.zeros(n_sym)
+        entry = np.full(n_sym, -1, dtype=np.int64)
+        high_since = np.zeros(n_sym)
+        hold_days = np.zeros(n_sym, dtype=np.int64)
+        # 各标的上一根 K 线所在行（停牌、缺行的日期跳过），-1 为尚无 K 线；「买入次日」即买入后该标的的下一根 K 线
+        last_bar = np.full(n_sym, -1, dtype=np.int64)
+        n_held = 0
+        equity = np.empty(n_dates)
+        cash_curve = np.empty(n_dates)
+        n_pos = np.empty(n_dates, dtype=np.int64)
+        # 成交记录：(日期下标, 标的下标, 是否卖出, 价格, 数量, 盈亏, 收益率, 开仓日下标, 卖出策略下标)
+        fills: List[tuple] = []
+        keys = np.empty((n_sell, n_sym))
+        prices = np.empty((n_sell, n_sym))
+
+        for t in range(n_dates):
+            c = close[t]
+            buy_t = signals.buy[t]
+            if n_held:
+                live = (pos > 0) & valid[t]
+                # 移动止盈用「买入日至昨日」最高价，先保留昨日最高再更新
+                high_prev = high_since.copy()
+                np.fmax(high_since, high[t], out=high_since, where=live)
+                hold_days += live
+
+                # 卖出：当日有 K 线、持仓且无买入信号的标的，各卖出策略横截面求值，取报价最高者
+                cand = live & ~buy_t
+                if n_sell and cand.any():
+                    state = dict(
+                        current_position=np.where(cand, pos, 0),
+                        position_avg_cost=avg_cost,
+                        current_price=c,
+                        high_since_entry=high_since,
+                        high_since_entry_prev=high_prev,
+                        holding_days_since_entry=hold_days,
+                        entry_bar_index=entry,
+                        prev_bar_index=last_bar,
+                    )
+                    for k, (s, b) in enumerate(zip(self.sell_strategies, sell_batches)):
+                        fired_k, price_k = s.cross_signal(b, t, **state)
+                        keys[k] = np.where(fired_k, np.where(price_k > 0, price_k, 0.0), -1.0)
+                        prices[k] = price_k
+                    best = keys.argmax(axis=0)
+                    sold = np.flatnonzero(keys[best, cols] >= 0)
+                    if sold.size:
+                        quote = prices[best[sold], sold]
+                        fill = np.where(quote > 0, np.maximum(low[t, sold], np.minimum(high[t, sold], quote)), c[sold])
+                        fill = fill * (1.0 - slip)
+                        qty = pos[sold]
+                        pnl = (fill - avg_cost[sold]) * qty - qty * comm
+                        roi = np.where(avg_cost[sold] > 0, pnl / (avg_cost[sold] * qty) * 100.0, 0.0)
+                        cash += float((qty * fill - qty * comm).sum())
+                        for j, p, q, pl, r, k in zip(sold, fill, qty, pnl, roi, best[sold]):
+                            fills.append((t, j, True, p, q, pl, r, entry[j], k))
+                        pos[sold] = 0
+                        avg_cost[sold] = 0.0
+                        entry[sold] = -1
+                        high_since[sold] = 0.0
+                        hold_days[sold] = 0
+                        n_held -= sold.size
+
+            # 买入：空仓候选按分数降序（同分按标的顺序）填满空闲仓位
+            free = self.max_positions - n_held
+            if free > 0 and has_buy[t]:
+                cand_buy = np.flatnonzero(buy_t & (pos == 0))
+                if cand_buy.size:
+                    order = cand_buy[np.argsort(-scores[t, cand_buy], kind="stable")][:free]
+                    if self.allocation == "equal_weight":
+                        total = cash + float(pos @ mark[t])
+                        budget = min(total / self.max_positions, cash / order.size)
+                    else:
+                        budget = cash / order.size
+                    price = c[order] * (1.0 + slip)
+                    qty = np.floor(budget / (price + comm)).astype(np.int64)
+                    ok = qty > 0
+                    order, price, qty = order[ok], price[ok], qty[ok]
+                    if order.size:
+                        cash -= float((qty * price + qty * comm).sum())
+                        pos[order] = qty
+                        avg_cost[order] = price
+                        entry[order] = t
+                        high_since[order] = 0.0
+                        hold_days[order] = 0
+                        n_held += order.size
+                        for j, p, q in zip(order, price, qty):
+                            fills.append((t, j, False, p, q, 0.0, 0.0, t, -1))
+
+            last_bar[valid[t]] = t
+            equity[t] = cash + float(pos @ mark[t]) if n_held else cash
+            cash_curve[t] = cash
+            n_pos[t] = n_held
+
+        return self._result(signals, fills, equity, cash_curve, n_pos)
+
+    def _result(
+        self,
+        signals: PortfolioSignals,
+        fills: List[tuple],
+        equity: np.ndarray,
+        cash_curve: np.ndarray,
+        n_pos: np.ndarray,
+    ) -> PortfolioResult:
+        """成交记录转交割单，资金曲线上算收益、最大回撤与夏普（全区间逐日）。"""
+        trades = TradeLedger(signals.dates, strategy_name=self.strategy_name, symbols=signals.symbols)
+        if fills:
+            t, j, is_sell, price, qty, pnl, roi, entry_t, k = (np.asarray(col) for col in zip(*fills))
+            entry_reason = [
+                trades.reason_code(" | ".join(b.reason((et, jj)) for b in signals.buy_batches))
+                for et, jj in zip(entry_t.tolist(), j.tolist())
+            ]
+            exit_reason = [
+                trades.reason_code(signals.sell_batches[kk].reason((tt, jj))) if sell else 0
+                for tt, jj, sell, kk in zip(t.tolist(), j.tolist(), is_sell.tolist(), k.tolist())
+            ]
+            qty = qty.astype(np.int64)
+            trades.extend(
+                date_index=t,
+                symbol=j,
+                side=np.where(is_sell, SIDE_SELL, SIDE_BUY),
+                price=price,
+                quantity=qty,
+                commission=qty * self.commission_per_share,
+                entry_reason=np.asarray(entry_reason),
+                exit_reason=np.asarray(exit_reason),
+                pnl=pnl,
+                roi=roi,
+                holdings_after=np.where(is_sell, 0, qty),  # 组合回测不加仓：买入持仓即成交量，卖出全平
+            )
+
+        final_capital = float(equity[-1])
+        return PortfolioResult(
+            trades=trades,
+            equity_curve=pd.DataFrame({"date": signals.dates, "equity": equity, "cash": cash_curve, "positions": n_pos}),
+            total_return_pct=(final_capital - self.initial_capital) / self.initial_capital * 100.0,
+            max_drawdown_pct=float(metrics.max_drawdown_pct(equity)),
+            sharpe_ratio=float(metrics.sharpe_ratio(metrics.equity_returns(equity))),
+            initial_capital=self.initial_capital,
+            final_capital=final_capital,
+        )
@@ -0,0 +1,105 @@
+"""
+回测剖析：BacktestEngine(profile=True) 时记录各阶段耗时（加载、信号、逐 bar 循环、撮合、绩效）
+以及每个策略的信号预计算耗时、逐 bar 调用次数与耗时、信号命中率，挂在 BacktestResult.profile 上。
+关闭时引擎不创建 RunProfile，热路径只多一次 None 判断。
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional
+
+import pandas as pd
+
+# 阶段名，按发生顺序；fills 为 loop 的一部分
+PHASES = ("load", "signals", "loop", "fills", "metrics")
+
+
+@dataclass
+class StrategyProfile:
+    """
+    单个策略的剖析数据。
+    - signal_seconds：整段批量信号耗时（compute_signals / precompute_signals），命中信号缓存时为 0
+    - calls / seconds：持仓循环中逐 bar 求值（batch_signal 或 next()）的次数与累计耗时
+    - evaluated / hits：参与判断的 bar 数与其中出信号的次数；买入策略按整段，卖出策略按持仓期逐 bar
+    """
+    name: str
+    side: str  # buy / sell
+    signal_seconds: float = 0.0
+    cache_hit: bool = False
+    calls: int = 0
+    seconds: float = 0.0
+    evaluated: int = 0
+    hits: int = 0
+
+    @property
+    def hit_rate_pct(self) -> float:
+        return self.hits / self.evaluated * 100.0 if self.evaluated else 0.0
+
+
+@dataclass
+class RunProfile:
+    """一次回测的剖析结果：phases 为各阶段累计秒数，strategies 按 "side:name" 索引。"""
+    phases: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+    strategies: Dict[str, StrategyProfile] = field(default_factory=dict)
+
+    def strategy(self, name: str, side: str) -> StrategyProfile:
+        key = f"{side}:{name}"
+        sp = self.strategies.get(key)
+        if sp is None:
+            sp = self.strategies[key] = StrategyProfile(name=name, side=side)
+        return sp
+
+    def to_dict(self) -> dict:
+        """可 JSON 序列化、可跨进程传递的 dict。"""
+        return {
+            "phases": dict(self.phases),
+            "strategies": [{**asdict(sp), "hit_rate_pct": sp.hit_rate_pct} for sp in self.strategies.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunProfile":
+        profile = cls(phases=dict(data.get("phases", {})))
+        for row in data.get("strategies", []):
+            row = {k: v for k, v in row.items() if k != "hit_rate_pct"}
+            profile.strategies[f"{row['side']}:{row['name']}"] = StrategyProfile(**row)
+        return profile
+
+    def strategies_frame(self) -> pd.DataFrame:
+        """每个策略一行，按总耗时降序。"""
+        rows = [{**asdict(sp), "hit_rate_pct": sp.hit_rate_pct} for sp in self.strategies.values()]
+        frame = pd.DataFrame(rows, columns=[
+            "side", "name", "signal_seconds", "cache_hit", "calls", "seconds", "evaluated", "hits", "hit_rate_pct",
+        ])
+        order = (frame["signal_seconds"] + frame["seconds"]).sort_values(ascending=False).index
+        return frame.loc[order].reset_index(drop=True)
+
+    def format(self, indent: str = "  ") -> str:
+        """多行文本：阶段耗时一行，之后每个策略一行。"""
+        lines = [indent + "阶段: " + ", ".join(f"{k} {v * 1e3:.1f}ms" for k, v in self.phases.items())]
+        for row in self.strategies_frame().itertuples(index=False):
+            cached = " (缓存)" if row.cache_hit else ""
+            per_call = f", {row.seconds / row.calls * 1e6:.1f}us/次" if row.calls else ""
+            lines.append(
+                f"{indent}{row.side:<4} {row.name:<32} 信号 {row.signal_seconds * 1e3:8.2f}ms{cached}, "
+                f"逐 bar {row.calls} 次 {row.seconds * 1e3:.2f}ms{per_call}, 命中 {row.hits}/{row.evaluated} ({row.hit_rate_pct:.1f}%)"
+            )
+        return "\n".join(lines)
+
+
+def merge_profiles(profiles) -> Optional[RunProfile]:
+    """多次回测（如全部标的）的剖析结果按阶段与策略累加。"""
+    total: Optional[RunProfile] = None
+    for p in profiles:
+        if p is None:
+            continue
+        if total is None:
+            total = RunProfile()
+        for k, v in p.phases.items():
+            total.phases[k] = total.phases.get(k, 0.0) + v
+        for sp in p.strategies.values():
+            acc = total.strategy(sp.name, sp.side)
+            acc.signal_seconds += sp.signal_seconds
+            acc.cache_hit = acc.cache_hit or sp.cache_hit
+            acc.calls += sp.calls
+            acc.seconds += sp.seconds
+            acc.evaluated += sp.evaluated
+            acc.hits += sp.hits
+    return total
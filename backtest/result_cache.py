@@ -0,0 +1,86 @@
+"""
+回测结果缓存：按内容寻址，键为 (标的 CSV 的 mtime 与大小, 买卖策略名与参数, 日期区间, 资金与成本设置, 引擎与策略源码指纹) 的哈希。
+条目保存一次回测的交割单 CSV、资金曲线 CSV 与摘要 JSON；再次运行时数据与配置都没变的标的直接复制结果文件，
+只有 CSV 被更新过（或配置改变）的标的重新回测。
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from backtest.engine import BacktestEngine
+from core.config import RESULT_CACHE_DIR
+from core.sources import source_fingerprint
+from data.loader import bars_stamp
+
+# 决定回测结果的源码：撮合、交割单、绩效口径与策略；任一改动后旧条目自然失效
+_ENGINE_SOURCES = (
+    "backtest/engine.py",
+    "backtest/ledger.py",
+    "backtest/metrics.py",
+    "strategies",
+    "core/types.py",
+    "core/dates.py",
+)
+
+_TRADES = "trades.csv"
+_EQUITY = "equity.csv"
+_SUMMARY = "summary.json"
+
+
+def result_key(engine: BacktestEngine, start: Optional[str], end: Optional[str]) -> Optional[str]:
+    """回测结果的缓存键；标的无数据文件时返回 None（不缓存）。"""
+    stamp = bars_stamp(engine.symbol)
+    if stamp is None:
+        return None
+    parts = (
+        source_fingerprint(*_ENGINE_SOURCES),
+        engine.symbol,
+        stamp,
+        tuple(s.cache_key() for s in engine.buy_strategies),
+        tuple(s.cache_key() for s in engine.sell_strategies),
+        start,
+        end,
+        engine.initial_capital,
+        engine.slippage_pct,
+        engine.commission_per_share,
+        engine.strategy_name,
+    )
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """directory/<key>/ 下保存一次回测的交割单、资金曲线与摘要。"""
+
+    def __init__(self, directory: Path = RESULT_CACHE_DIR) -> None:
+        self.directory = Path(directory)
+
+    def restore(self, key: str, trades_path: Path) -> Optional[dict]:
+        """命中时把缓存的交割单与资金曲线复制到 trades_path 及其 _equity.csv，返回摘要；未命中返回 None。"""
+        entry = self.directory / key
+        try:
+            summary = json.loads((entry / _SUMMARY).read_text(encoding="utf-8"))
+            trades_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(entry / _TRADES, trades_path)
+            shutil.copyfile(entry / _EQUITY, trades_path.with_name(trades_path.stem + "_equity.csv"))
+        except (OSError, ValueError):
+            return None
+        return summary
+
+    def put(self, key: str, summary: dict, trades_path: Path) -> None:
+        """保存一次回测的结果文件与摘要；先写临时目录再改名，并发进程不会读到不完整的条目。"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=self.directory, prefix=".tmp"))
+        try:
+            shutil.copyfile(trades_path, tmp / _TRADES)
+            shutil.copyfile(trades_path.with_name(trades_path.stem + "_equity.csv"), tmp / _EQUITY)
+            (tmp / _SUMMARY).write_text(json.dumps(summary, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.directory / key)
+        except OSError:  # 同键条目已由其他进程写入
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,170 @@
+"""
+参数扫描：对策略工厂参数（rsi_period、stop_loss_pct、trailing_pullback_pct、slow_period）与标的做笛卡尔积回测，
+结果汇总为一张整洁的绩效表（每个组合一行）。
+
+任务按 (标的, rsi_period, 卖出参数组合分块) 切分，单只标的的大网格也能铺满进程池；
+每个进程内每只标的只读一次 K 线、共用一份 IndicatorCache。买入信号只依赖 rsi_period，
+仅卖出参数不同的组合（同块内、同进程的其他块经内存层、跨进程经磁盘层信号缓存）复用同一份买入批量信号与指标。
+"""
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from backtest.engine import BacktestEngine
+from core.backtest_config import BacktestConfig, get_backtest_config
+from core.config import SIGNAL_CACHE_DIR
+from data.loader import get_bars
+from data.shared import SharedBars, SharedBarsDescriptor, attach_bars
+from strategies.factory import create_buy_strategies, create_sell_strategies
+from strategies.indicators import IndicatorCache
+from strategies.signal_store import configure_signal_store
+
+# 可扫描的参数名；rsi_period 作用于买入侧，其余作用于卖出侧
+BUY_PARAMS = ("rsi_period",)
+SELL_PARAMS = ("stop_loss_pct", "trailing_pullback_pct", "slow_period")
+SWEEP_PARAMS = BUY_PARAMS + SELL_PARAMS
+
+
+def param_grid(cfg: BacktestConfig, params: Dict[str, Optional[Sequence]]) -> Dict[str, list]:
+    """未给出取值范围的参数取配置中的单值。"""
+    grid = {}
+    for name in SWEEP_PARAMS:
+        values = params.get(name)
+        grid[name] = list(values) if values else [getattr(cfg, name)]
+    return grid
+
+
+def value_list(cast: Callable[[str], Any]) -> Callable[[str], list]:
+    """命令行取值列表的解析器（argparse 的 type）：逗号分隔（支持全角逗号），各项经 cast 转换。"""
+    def parse(text: str) -> list:
+        return [cast(v) for v in text.replace("，", ",").split(",") if v.strip()]
+    return parse
+
+
+def init_worker(descriptor: Optional[SharedBarsDescriptor]) -> None:
+    """进程池 worker 初始化：开启共享的磁盘层信号缓存，并附加父进程装入共享内存的 K 线。"""
+    configure_signal_store(512, SIGNAL_CACHE_DIR)
+    attach_bars(descriptor)
+
+
+@lru_cache(maxsize=8)
+def symbol_data(symbol: str, start: Optional[str], end: Optional[str]) -> Tuple[pd.DataFrame, IndicatorCache]:
+    """每个进程内每只标的只读一次 K 线、只建一份整段指标缓存，供该进程处理的全部任务共享。"""
+    df = get_bars(symbol, start=start, end=end)
+    return df, IndicatorCache(df)
+
+
+def sweep_symbol(
+    cfg: BacktestConfig,
+    symbol: str,
+    grid: Dict[str, list],
+    sell_combos: Optional[Sequence[tuple]] = None,
+) -> List[dict]:
+    """扫描单只标的的参数组合（sell_combos 见 sweep_bars），返回绩效行列表（可跨进程传递）。"""
+    df, indicators = symbol_data(symbol, cfg.start_date, cfg.end_date)
+    return sweep_bars(cfg, symbol, df, indicators, grid, sell_combos)
+
+
+def sweep_bars(
+    cfg: BacktestConfig,
+    symbol: str,
+    df: pd.DataFrame,
+    indicators: IndicatorCache,
+    grid: Dict[str, list],
+    sell_combos: Optional[Sequence[tuple]] = None,
+) -> List[dict]:
+    """
+    在已加载的 K 线与指标缓存上扫描全部参数组合（walk-forward 的样本内优化也用它）。
+    sell_combos 为按 SELL_PARAMS 顺序的卖出参数元组列表，缺省为 grid 中卖出参数的笛卡尔积。
+    """
+    if sell_combos is None:
+        sell_combos = _sell_combos(grid)
+    rows = []
+    for rsi_period in grid["rsi_period"]:
+        buy_list = create_buy_strategies(cfg.buy_strategies, rsi_period=rsi_period)
+        for combo in sell_combos:
+            sell_params = dict(zip(SELL_PARAMS, combo))
+            sell_list = create_sell_strategies(
+                cfg.sell_strategies,
+                trailing_trigger_pct=cfg.trailing_trigger_pct,
+                **sell_params,
+            )
+            engine = BacktestEngine(
+                buy_strategies=buy_list,
+                sell_strategies=sell_list,
+                symbol=symbol,
+                initial_capital=cfg.initial_capital,
+                slippage_pct=cfg.slippage_pct,
+                commission_per_share=cfg.commission_per_share,
+                strategy_name=cfg.strategy_name,
+            )
+            # 买入信号与持仓无关：同一 rsi_period 下首次运行后由 SignalStore 命中，全部卖出参数组合复用
+            result = engine.run_bars(df, indicators=indicators)
+            rows.append({"symbol": symbol, "rsi_period": rsi_period, **sell_params, **result.summary()})
+    return rows
+
+
+def _sell_combos(grid: Dict[str, list]) -> List[tuple]:
+    return list(itertools.product(*(grid[p] for p in SELL_PARAMS)))
+
+
+def _sweep_tasks(cfg: BacktestConfig, symbols: Sequence[str], grid: Dict[str, list], workers: int) -> list:
+    """
+    切分任务：每个 (标的, rsi_period) 的卖出参数组合等分为若干块，使总任务数约为进程数的 4 倍；
+    顺序执行时不切分。任务按 (标的, rsi_period, 块) 排列，拼接结果即顺序执行的行顺序。
+    """
+    sell_combos = _sell_combos(grid)
+    groups = len(symbols) * len(grid["rsi_period"])
+    parts = 1 if workers <= 1 else min(len(sell_combos), math.ceil(workers * 4 / max(groups, 1)))
+    size = math.ceil(len(sell_combos) / parts)
+    tasks = []
+    for symbol in symbols:
+        for rsi_period in grid["rsi_period"]:
+            sub = {**grid, "rsi_period": [rsi_period]}
+            for k in range(0, len(sell_combos), size):
+                tasks.append((cfg, symbol, sub, sell_combos[k:k + size]))
+    return tasks
+
+
+def _sweep_symbol_task(args: tuple) -> List[dict]:
+    return sweep_symbol(*args)
+
+
+def run_sweep(
+    cfg: Optional[BacktestConfig] = None,
+    symbols: Optional[List[str]] = None,
+    rsi_period: Optional[Sequence[int]] = None,
+    stop_loss_pct: Optional[Sequence[float]] = None,
+    trailing_pullback_pct: Optional[Sequence[float]] = None,
+    slow_period: Optional[Sequence[int]] = None,
+    workers: int = 1,
+) -> pd.DataFrame:
+    """
+    参数扫描入口：各参数传入取值列表（缺省用配置值），与 symbols 做笛卡尔积回测。
+    返回 DataFrame：每行一个 (标的, 参数组合)，列为参数与 BacktestResult.summary() 各项。
+    workers > 1 时按 (标的, rsi_period, 卖出参数分块) 分发到进程池，单只标的的大网格同样并行，行顺序与顺序执行一致；
+    各 worker 经磁盘层信号缓存共享买入信号，K 线由父进程装入共享内存，worker 零拷贝读取。
+    """
+    cfg = cfg or get_backtest_config()
+    symbols = symbols or cfg.symbols
+    grid = param_grid(cfg, dict(
+        rsi_period=rsi_period,
+        stop_loss_pct=stop_loss_pct,
+        trailing_pullback_pct=trailing_pullback_pct,
+        slow_period=slow_period,
+    ))
+    tasks = _sweep_tasks(cfg, symbols, grid, workers)
+    workers = max(1, min(workers, len(tasks)))
+    if workers > 1:
+        with SharedBars(symbols) as shared:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(shared.descriptor,)) as executor:
+                chunks = list(executor.map(_sweep_symbol_task, tasks))
+    else:
+        chunks = [_sweep_symbol_task(t) for t in tasks]
+    rows = [row for chunk in chunks for row in chunk]
+    columns = ["symbol", *SWEEP_PARAMS]
+    return pd.DataFrame(rows, columns=columns + [c for c in (rows[0] if rows else {}) if c not in columns])
@@ -0,0 +1,207 @@
+"""
+Walk-forward 优化：把每只标的的历史切成滚动的样本内 / 样本外窗口，
+在样本内窗口上扫描策略工厂参数选出最优组合，再用该组合回测紧随其后的样本外窗口，
+各样本外窗口的资金曲线按收益率复利拼接为最终报告。
+
+指标在整段序列上只算一次（IndicatorCache.window 取切片，窗口开头沿用之前的数据预热），
+各窗口只跑自己区间内的回测，总成本随窗口数线性增长；窗口之间相互独立，可按进程并行。
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest import metrics
+from backtest.engine import BacktestEngine, BacktestResult
+from backtest.sweep import SELL_PARAMS, SWEEP_PARAMS, init_worker, param_grid, sweep_bars, symbol_data
+from core.backtest_config import BacktestConfig, get_backtest_config
+from core.dates import to_days
+from data.shared import SharedBars
+from strategies.factory import create_buy_strategies, create_sell_strategies
+
+# 样本内选参可用的指标：BacktestResult.summary() 的键
+METRICS = tuple(BacktestResult().summary())
+
+
+@dataclass
+class WalkForwardWindow:
+    """单个窗口：样本内/样本外区间（含首尾日期）、样本内选出的参数与得分、样本外绩效摘要。"""
+    symbol: str
+    is_start: np.datetime64
+    is_end: np.datetime64
+    oos_start: np.datetime64
+    oos_end: np.datetime64
+    params: Dict[str, float] = field(default_factory=dict)
+    is_score: float = 0.0
+    oos: dict = field(default_factory=dict)
+    equity_curve: pd.DataFrame = field(default_factory=pd.DataFrame)  # 样本外 date, equity, in_position
+
+
+@dataclass
+class WalkForwardResult:
+    """walk-forward 报告：各窗口明细与拼接后的样本外资金曲线。"""
+    symbol: str
+    windows: List[WalkForwardWindow] = field(default_factory=list)
+    equity_curve: pd.DataFrame = field(default_factory=pd.DataFrame)  # date, equity, in_position, window
+    initial_capital: float = 0.0
+    final_capital: float = 0.0
+    total_return_pct: float = 0.0
+    max_drawdown_pct: float = 0.0
+
+    def windows_frame(self) -> pd.DataFrame:
+        """每个窗口一行：区间、选中参数、样本内得分与样本外绩效。"""
+        rows = []
+        for w in self.windows:
+            rows.append({
+                "symbol": w.symbol,
+                "is_start": w.is_start,
+                "is_end": w.is_end,
+                "oos_start": w.oos_start,
+                "oos_end": w.oos_end,
+                **w.params,
+                "is_score": w.is_score,
+                **{f"oos_{k}": v for k, v in w.oos.items()},
+            })
+        return pd.DataFrame(rows)
+
+
+def window_bounds(n: int, is_bars: int, oos_bars: int, step: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """
+    滚动窗口下标：返回 [(is_start, oos_start, oos_end)]，样本内为 [is_start, oos_start)，样本外为 [oos_start, oos_end)。
+    step 缺省为 oos_bars（样本外首尾相接）；末尾不足 30 根的样本外窗口舍弃（引擎最少需 30 根）。
+    """
+    step = step or oos_bars
+    out = []
+    start = 0
+    while start + is_bars < n:
+        oos_start = start + is_bars
+        oos_end = min(oos_start + oos_bars, n)
+        if oos_end - oos_start < 30:
+            break
+        out.append((start, oos_start, oos_end))
+        start += step
+    return out
+
+
+def run_window(
+    cfg: BacktestConfig,
+    symbol: str,
+    bounds: Tuple[int, int, int],
+    grid: Dict[str, list],
+    metric: str = "sharpe",
+) -> WalkForwardWindow:
+    """单个窗口：样本内扫描选参（metric 最大者，并列取先出现者），再以选中参数回测样本外区间。"""
+    df, indicators = symbol_data(symbol, cfg.start_date, cfg.end_date)
+    is_start, oos_start, oos_end = bounds
+    dates = to_days(df["date"])
+    window = WalkForwardWindow(
+        symbol=symbol,
+        is_start=dates[is_start],
+        is_end=dates[oos_start - 1],
+        oos_start=dates[oos_start],
+        oos_end=dates[oos_end - 1],
+    )
+
+    rows = sweep_bars(cfg, symbol, df.iloc[is_start:oos_start], indicators.window(is_start, oos_start), grid)
+    best = max(rows, key=lambda r: r[metric] if r[metric] is not None else float("-inf"))
+    window.params = {p: best[p] for p in SWEEP_PARAMS}
+    window.is_score = best[metric]
+
+    sell_params = {p: best[p] for p in SELL_PARAMS}
+    engine = BacktestEngine(
+        buy_strategies=create_buy_strategies(cfg.buy_strategies, rsi_period=best["rsi_period"]),
+        sell_strategies=create_sell_strategies(
+            cfg.sell_strategies,
+            trailing_trigger_pct=cfg.trailing_trigger_pct,
+            **sell_params,
+        ),
+        symbol=symbol,
+        initial_capital=cfg.initial_capital,
+        slippage_pct=cfg.slippage_pct,
+        commission_per_share=cfg.commission_per_share,
+        strategy_name=cfg.strategy_name,
+    )
+    result = engine.run_bars(df.iloc[oos_start:oos_end], indicators=indicators.window(oos_start, oos_end))
+    window.oos = result.summary()
+    window.equity_curve = result.equity_curve
+    return window
+
+
+def _run_window_task(args: tuple) -> WalkForwardWindow:
+    return run_window(*args)
+
+
+def _stitch(symbol: str, windows: List[WalkForwardWindow], initial_capital: float) -> WalkForwardResult:
+    """各样本外窗口均以初始资金独立回测，按窗口收益率复利拼接成一条资金曲线。"""
+    report = WalkForwardResult(symbol=symbol, windows=windows, initial_capital=initial_capital)
+    capital = initial_capital
+    parts = []
+    for k, w in enumerate(windows):
+        eq = w.equity_curve
+        if eq.empty:
+            continue
+        part = eq.copy()
+        part["equity"] = part["equity"] * (capital / initial_capital)
+        part["window"] = k
+        parts.append(part)
+        capital = float(part["equity"].iloc[-1])
+    report.final_capital = capital
+    report.total_return_pct = (capital - initial_capital) / initial_capital * 100.0 if initial_capital else 0.0
+    if parts:
+        curve = pd.concat(parts, ignore_index=True)
+        report.max_drawdown_pct = float(metrics.max_drawdown_pct(curve["equity"].to_numpy()))
+        report.equity_curve = curve
+    return report
+
+
+def run_walk_forward(
+    cfg: Optional[BacktestConfig] = None,
+    symbols: Optional[List[str]] = None,
+    is_bars: int = 504,
+    oos_bars: int = 126,
+    step: Optional[int] = None,
+    metric: str = "sharpe",
+    rsi_period: Optional[Sequence[int]] = None,
+    stop_loss_pct: Optional[Sequence[float]] = None,
+    trailing_pullback_pct: Optional[Sequence[float]] = None,
+    slow_period: Optional[Sequence[int]] = None,
+    workers: int = 1,
+) -> Dict[str, WalkForwardResult]:
+    """
+    walk-forward 入口：is_bars / oos_bars 为样本内 / 样本外窗口长度（交易日），step 为滚动步长（缺省 oos_bars）。
+    参数取值范围同 run_sweep（缺省用配置值）；metric 为样本内选参依据，取 BacktestResult.summary() 的键。
+    workers > 1 时 (标的, 窗口) 分发到进程池；返回 {symbol: WalkForwardResult}。
+    """
+    if metric not in METRICS:
+        raise ValueError(f"未知选参指标 {metric!r}，可选 {METRICS}")
+    cfg = cfg or get_backtest_config()
+    symbols = symbols or cfg.symbols
+    grid = param_grid(cfg, dict(
+        rsi_period=rsi_period,
+        stop_loss_pct=stop_loss_pct,
+        trailing_pullback_pct=trailing_pullback_pct,
+        slow_period=slow_period,
+    ))
+    tasks = []
+    for symbol in symbols:
+        df, _ = symbol_data(symbol, cfg.start_date, cfg.end_date)
+        for bounds in window_bounds(len(df), is_bars, oos_bars, step):
+            tasks.append((cfg, symbol, bounds, grid, metric))
+
+    workers = max(1, min(workers, len(tasks)))
+    if workers > 1:
+        # 连续窗口成块分给同一进程，进程内按标的复用整段指标
+        chunksize = max(1, len(tasks) // (workers * 4))
+        # K 线由父进程装入共享内存，各 worker 零拷贝读取，不再各自读文件
+        with SharedBars(symbols) as shared:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(shared.descriptor,)) as executor:
+                windows = list(executor.map(_run_window_task, tasks, chunksize=chunksize))
+    else:
+        windows = [_run_window_task(t) for t in tasks]
+
+    by_symbol: Dict[str, List[WalkForwardWindow]] = {s: [] for s in symbols}
+    for w in windows:
+        by_symbol[w.symbol].append(w)
+    return {s: _stitch(s, ws, cfg.initial_capital) for s, ws in by_symbol.items()}
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+逐 bar 数据访问开销对比：旧式 df.iloc 行 + 历史切片 + astype(float)，与 BarContext 游标 + 数组视图。
+输出每根 bar 的耗时（微秒）与分配字节数。
+
+    python benchmarks/bench_bar_context.py [SYMBOL]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from data.loader import get_bars
+from strategies.context import BarContext
+from strategies.indicators import IndicatorCache
+
+
+def _legacy_access(df, i):
+    row = df.iloc[i]
+    history = df.iloc[: i + 1]
+    close = history["close"].astype(float)
+    return float(row.get("low", 0.0)), float(close.iloc[-1]), len(history)
+
+
+def _context_access(ctx, i):
+    ctx.seek(i)
+    close = ctx.history("close")
+    return ctx.get("low", 0.0), float(close[-1]), len(ctx)
+
+
+def _measure(fn, n):
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    for i in range(n):
+        fn(i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / n * 1e6, peak
+
+
+def main() -> None:
+    symbol = sys.argv[1] if len(sys.argv) > 1 else "NVDA"
+    df = get_bars(symbol)
+    if df.empty:
+        print(f"未找到 {symbol} 的数据")
+        return
+    n = len(df)
+    ctx = BarContext.from_frame(df, IndicatorCache(df))
+    ctx.history("close"), ctx.get("low")  # 预热列数组
+
+    legacy_us, legacy_peak = _measure(lambda i: _legacy_access(df, i), n)
+    ctx_us, ctx_peak = _measure(lambda i: _context_access(ctx, i), n)
+    print(f"{symbol}: {n} bars")
+    print(f"  旧式 iloc 行+切片+astype : {legacy_us:8.2f} us/bar, 峰值分配 {legacy_peak / 1024:8.1f} KiB")
+    print(f"  BarContext 游标+视图     : {ctx_us:8.2f} us/bar, 峰值分配 {ctx_peak / 1024:8.1f} KiB")
+    print(f"  加速 {legacy_us / ctx_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
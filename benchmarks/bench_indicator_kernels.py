@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Wilder 平滑 / RSI / ADX 微基准：对 store/market_data 下全部 *_daily.csv，
+比较原 pandas 逐元素赋值实现与 NumPy 内核，并校验结果逐位一致。
+
+    python benchmarks/bench_indicator_kernels.py
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+import pandas as pd
+
+from data.loader import get_bars, list_symbols
+from strategies import indicators
+from strategies.indicators import _wilder_smooth, adx, rsi_wilder
+
+
+def _legacy_rsi_wilder(close: pd.Series, period: int = 14) -> pd.Series:
+    """原实现：Python 循环 + out.iloc[i] 赋值。"""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = (-delta).where(delta < 0, 0.0)
+    out = pd.Series(index=close.index, dtype=float)
+    if len(close) < period + 1:
+        return out
+    avg_g = gain.iloc[1 : period + 1].mean()
+    avg_l = loss.iloc[1 : period + 1].mean()
+    for i in range(period, len(close)):
+        if i > period:
+            avg_g = (avg_g * (period - 1) + gain.iloc[i]) / period
+            avg_l = (avg_l * (period - 1) + loss.iloc[i]) / period
+        rs = avg_g / (avg_l + 1e-10)
+        out.iloc[i] = 100 - (100 / (1 + rs))
+    return out
+
+
+def _legacy_wilder_smooth(series: pd.Series, period: int) -> pd.Series:
+    """原实现：Python 循环 + out.iloc[i] 赋值。"""
+    out = pd.Series(index=series.index, dtype=float)
+    if len(series) < period:
+        return out
+    out.iloc[period - 1] = series.iloc[:period].sum()
+    for i in range(period, len(series)):
+        out.iloc[i] = out.iloc[i - 1] * (period - 1) / period + series.iloc[i]
+    return out
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, tuple):
+        return all(_same(x, y) for x, y in zip(a, b))
+    return np.array_equal(np.asarray(a, dtype=float), np.asarray(b, dtype=float), equal_nan=True)
+
+
+def main() -> None:
+    symbols = list_symbols()
+    if not symbols:
+        print("未找到 store/market_data/*_daily.csv")
+        return
+    totals = {"rsi": [0.0, 0.0], "wilder": [0.0, 0.0], "adx": [0.0, 0.0]}
+    bars = 0
+    print(f"{'symbol':<8}{'bars':>6}  {'rsi old/new (ms)':>18}  {'wilder old/new (ms)':>20}  {'adx old/new (ms)':>18}")
+    for symbol in symbols:
+        df = get_bars(symbol)
+        close = df["close"].astype(float)
+        high = df["high"].astype(float)
+        low = df["low"].astype(float)
+        bars += len(df)
+
+        old_rsi, t_old_rsi = _timed(_legacy_rsi_wilder, close, 14)
+        new_rsi, t_new_rsi = _timed(rsi_wilder, close, 14)
+        old_ws, t_old_ws = _timed(_legacy_wilder_smooth, close, 14)
+        new_ws, t_new_ws = _timed(_wilder_smooth, close, 14)
+        new_adx, t_new_adx = _timed(adx, high, low, close, 14)
+        # 旧 ADX：临时换回旧版 _wilder_smooth
+        indicators._wilder_smooth = _legacy_wilder_smooth
+        try:
+            old_adx, t_old_adx = _timed(adx, high, low, close, 14)
+        finally:
+            indicators._wilder_smooth = _wilder_smooth
+
+        for name, a, b in (("rsi", old_rsi, new_rsi), ("wilder", old_ws, new_ws), ("adx", old_adx, new_adx)):
+            if not _same(a, b):
+                raise SystemExit(f"{symbol}: {name} 结果与原实现不一致")
+        totals["rsi"][0] += t_old_rsi
+        totals["rsi"][1] += t_new_rsi
+        totals["wilder"][0] += t_old_ws
+        totals["wilder"][1] += t_new_ws
+        totals["adx"][0] += t_old_adx
+        totals["adx"][1] += t_new_adx
+        print(
+            f"{symbol:<8}{len(df):>6}  {t_old_rsi * 1e3:8.2f}/{t_new_rsi * 1e3:<8.2f}  "
+            f"{t_old_ws * 1e3:9.2f}/{t_new_ws * 1e3:<9.2f}  {t_old_adx * 1e3:8.2f}/{t_new_adx * 1e3:<8.2f}"
+        )
+    print("-" * 76)
+    print(f"共 {len(symbols)} 只标的, {bars} 根 bar；结果与原实现逐位一致")
+    for name, (old, new) in totals.items():
+        print(f"  {name:<7} 原 {old * 1e3:9.1f} ms  内核 {new * 1e3:7.1f} ms  加速 {old / new:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+基准测试集：在 store/market_data 自带的 CSV 上对数据加载、各指标函数、单标的回测（工厂中每个买入/卖出策略各一例）、
+与 run_backtest.py 一致的全标的回测，以及进程内调用的 /api/market/kline、/api/backtest/detail 处理函数计时。
+每个用例报告最短/中位耗时、每根 bar 耗时与峰值内存分配，结果写 JSON；compare 对比基线标出回归。
+
+    python benchmarks/bench_suite.py run [--out FILE] [--repeat 5] [--symbol NVDA] [--only REGEX]
+    python benchmarks/bench_suite.py compare BASELINE.json CURRENT.json [--threshold 0.10]
+
+计时期间关闭进程级信号缓存，重复运行不命中前一次的结果，各次耗时可比。
+compare 在任一用例耗时或峰值内存超过基线 (1 + threshold) 倍时以退出码 1 结束，可用于 CI。
+"""
+import argparse
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from backtest.engine import BacktestEngine
+from core.backtest_config import get_backtest_config
+from data.loader import get_bar_cache, get_bars, get_bars_many
+from data.panel import load_panel
+from scripts.run_backtest import _create_strategies
+from strategies import indicators
+from strategies.factory import create_buy_strategies, create_sell_strategies
+from strategies.signal_store import configure_signal_store
+from web.backend.routers import backtest as backtest_router
+from web.backend.routers import market as market_router
+
+BUY_STRATEGIES = ["oversold_score_buy", "oversold_rebound_buy", "boll_trend_pullback_buy"]
+SELL_STRATEGIES = [
+    "stop_loss_8pct_sell", "trailing_take_profit_sell", "boll_upper_break_sell",
+    "two_day_no_profit_sell", "dif_next_day_weaker_sell", "first_red_hist_shrink_sell",
+]
+
+
+@dataclass
+class BenchCase:
+    """一个用例：fn 无参调用一次为一次计时，bars 为一次调用处理的 K 线根数（算每根 bar 耗时）。"""
+    name: str
+    fn: Callable[[], object]
+    bars: int
+
+
+def _engine(cfg, buy_names: List[str], sell_names: List[str], symbol: str) -> BacktestEngine:
+    return BacktestEngine(
+        buy_strategies=create_buy_strategies(buy_names, rsi_period=cfg.rsi_period),
+        sell_strategies=create_sell_strategies(
+            sell_names,
+            slow_period=cfg.slow_period,
+            stop_loss_pct=cfg.stop_loss_pct,
+            trailing_trigger_pct=cfg.trailing_trigger_pct,
+            trailing_pullback_pct=cfg.trailing_pullback_pct,
+        ),
+        symbol=symbol,
+        initial_capital=cfg.initial_capital,
+        slippage_pct=cfg.slippage_pct,
+        commission_per_share=cfg.commission_per_share,
+        strategy_name=cfg.strategy_name,
+    )
+
+
+def _run_universe(cfg) -> int:
+    """同 run_backtest.py 的顺序执行：每只标的按配置策略回测（不写结果文件）。"""
+    trades = 0
+    for symbol in cfg.symbols:
+        buy_list, sell_list = _create_strategies(cfg)
+        engine = BacktestEngine(
+            buy_strategies=buy_list,
+            sell_strategies=sell_list,
+            symbol=symbol,
+            initial_capital=cfg.initial_capital,
+            slippage_pct=cfg.slippage_pct,
+            commission_per_share=cfg.commission_per_share,
+            strategy_name=cfg.strategy_name,
+        )
+        trades += len(engine.run(start=cfg.start_date, end=cfg.end_date).trades)
+    return trades
+
+
+def build_cases(symbol: str, detail_id: str) -> List[BenchCase]:
+    cfg = get_backtest_config()
+    df = get_bars(symbol, start=cfg.start_date, end=cfg.end_date)
+    n = len(df)
+    close = df["close"].astype(float)
+    universe_bars = sum(len(get_bars(s, start=cfg.start_date, end=cfg.end_date)) for s in cfg.symbols)
+    buys = cfg.buy_strategies or BUY_STRATEGIES[:1]
+    sells = cfg.sell_strategies or SELL_STRATEGIES
+
+    cases = [
+        BenchCase(f"loader.get_bars[{symbol}]", lambda: get_bars(symbol, start=cfg.start_date, end=cfg.end_date), n),
+        BenchCase(f"loader.get_bars[{symbol}, cold]", lambda: _cold_bars(symbol, cfg.start_date, cfg.end_date), n),
+        BenchCase("loader.get_bars[universe]", lambda: [get_bars(s, start=cfg.start_date, end=cfg.end_date) for s in cfg.symbols], universe_bars),
+        BenchCase("loader.get_bars_many[universe, cold]", lambda: _cold_bars_many(cfg.symbols, cfg.start_date, cfg.end_date), universe_bars),
+        BenchCase("panel.load_panel[universe]", lambda: load_panel(cfg.symbols).slice(cfg.start_date, cfg.end_date), universe_bars),
+        BenchCase("indicators.rsi_wilder", lambda: indicators.rsi_wilder(close, 14), n),
+        BenchCase("indicators.macd", lambda: indicators.macd(close), n),
+        BenchCase("indicators.bollinger_bands", lambda: indicators.bollinger_bands(close), n),
+        BenchCase("indicators.adx", lambda: indicators.adx(df["high"], df["low"], close), n),
+        BenchCase("indicators.IndicatorCache[all]", lambda: _all_indicators(df), n),
+    ]
+    for name in BUY_STRATEGIES:
+        engine = _engine(cfg, [name], sells, symbol)
+        cases.append(BenchCase(f"engine.run[{symbol}, buy={name}]", lambda e=engine: e.run(cfg.start_date, cfg.end_date), n))
+    for name in SELL_STRATEGIES:
+        engine = _engine(cfg, buys, [name], symbol)
+        cases.append(BenchCase(f"engine.run[{symbol}, sell={name}]", lambda e=engine: e.run(cfg.start_date, cfg.end_date), n))
+    cases.append(BenchCase(f"engine.run[universe x {len(cfg.symbols)}]", lambda: _run_universe(cfg), universe_bars))
+    cases.append(BenchCase(
+        f"api.market.kline[{symbol}]",
+        lambda: jsonable_encoder(market_router.get_kline(symbol)),
+        len(get_bars(symbol)),
+    ))
+    cases.append(BenchCase(
+        "api.backtest.detail",
+        lambda: jsonable_encoder(backtest_router.backtest_detail(detail_id)),
+        n,
+    ))
+    return cases
+
+
+def _cold_bars(symbol: str, start: Optional[str], end: Optional[str]) -> pd.DataFrame:
+    """绕过进程级 K 线缓存（仍走列式库）"""
+    get_bar_cache().discard(symbol)
+    return get_bars(symbol, start=start, end=end)
+
+
+def _cold_bars_many(symbols: List[str], start: Optional[str], end: Optional[str]) -> Dict[str, pd.DataFrame]:
+    """清空进程级 K 线缓存后批量读取（仍走列式库）"""
+    get_bar_cache().clear()
+    return get_bars_many(symbols, start=start, end=end)
+
+
+def _all_indicators(df: pd.DataFrame) -> None:
+    ind = indicators.IndicatorCache(df)
+    ind.sma(5), ind.sma(10), ind.sma(20), ind.rsi(6), ind.rsi(14), ind.macd(), ind.bollinger(), ind.adx()
+
+
+def _prepare_detail(symbol: str) -> Path:
+    """为 detail 接口写一份回测结果（交割单 + 资金曲线），计时结束后删除。"""
+    cfg = get_backtest_config()
+    engine = _engine(cfg, cfg.buy_strategies or BUY_STRATEGIES[:1], cfg.sell_strategies or SELL_STRATEGIES, symbol)
+    engine.strategy_name = "bench_suite"
+    _, path = engine.run_and_save(start=cfg.start_date, end=cfg.end_date, result_id="detail")
+    return path
+
+
+def run_case(case: BenchCase, repeat: int) -> dict:
+    """预热一次后计时 repeat 次，再在 tracemalloc 下单独跑一次取峰值分配（不计入耗时）。"""
+    case.fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        case.fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    case.fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    best = min(times)
+    return {
+        "seconds_min": best,
+        "seconds_median": statistics.median(times),
+        "bars": case.bars,
+        "us_per_bar": best / case.bars * 1e6 if case.bars else None,
+        "peak_mb": peak / 2 ** 20,
+        "repeat": repeat,
+    }
+
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def run_suite(symbol: str, repeat: int, only: Optional[str] = None) -> dict:
+    configure_signal_store(max_entries=0)
+    detail_path = _prepare_detail(symbol)
+    results: Dict[str, dict] = {}
+    try:
+        for case in build_cases(symbol, detail_path.stem):
+            if only and not re.search(only, case.name):
+                continue
+            r = run_case(case, repeat)
+            results[case.name] = r
+            per_bar = f"{r['us_per_bar']:9.2f} us/bar" if r["us_per_bar"] is not None else ""
+            print(f"  {case.name:<55} {r['seconds_min'] * 1e3:10.2f} ms {per_bar}  峰值 {r['peak_mb']:8.2f} MB", flush=True)
+    finally:
+        detail_path.unlink(missing_ok=True)
+        detail_path.with_name(detail_path.stem + "_equity.csv").unlink(missing_ok=True)
+    return {"meta": _meta(), "cases": results}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """逐用例对比最短耗时与峰值内存，返回超过基线 (1 + threshold) 倍的回归项说明。"""
+    regressions = []
+    base_cases, cur_cases = baseline["cases"], current["cases"]
+    print(f"  {'用例':<55} {'基线 ms':>10} {'当前 ms':>10} {'耗时比':>7} {'内存比':>7}")
+    for name, cur in cur_cases.items():
+        base = base_cases.get(name)
+        if base is None:
+            print(f"  {name:<55} {'-':>10} {cur['seconds_min'] * 1e3:10.2f}   (新增)")
+            continue
+        t_ratio = cur["seconds_min"] / base["seconds_min"] if base["seconds_min"] else float("inf")
+        m_ratio = cur["peak_mb"] / base["peak_mb"] if base["peak_mb"] else 1.0
+        flags = []
+        if t_ratio > 1 + threshold:
+            flags.append("耗时回归")
+            regressions.append(f"{name}: 耗时 {t_ratio:.2f}x")
+        if m_ratio > 1 + threshold:
+            flags.append("内存回归")
+            regressions.append(f"{name}: 峰值内存 {m_ratio:.2f}x")
+        print(
+            f"  {name:<55} {base['seconds_min'] * 1e3:10.2f} {cur['seconds_min'] * 1e3:10.2f} "
+            f"{t_ratio:6.2f}x {m_ratio:6.2f}x  {' '.join(flags)}"
+        )
+    for name in base_cases.keys() - cur_cases.keys():
+        print(f"  {name:<55} (当前结果中缺失)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="基准测试集：计时、峰值内存与基线对比")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_p = sub.add_parser("run", help="运行基准并输出 JSON")
+    run_p.add_argument("--out", type=Path, default=None, help="结果 JSON 路径，缺省只打印")
+    run_p.add_argument("--repeat", type=int, default=5, help="每个用例计时次数，取最短与中位，默认 5")
+    run_p.add_argument("--symbol", default="NVDA", help="单标的用例所用标的，默认 NVDA")
+    run_p.add_argument("--only", default=None, help="只运行名称匹配该正则的用例")
+    cmp_p = sub.add_parser("compare", help="对比两份结果 JSON，标出回归")
+    cmp_p.add_argument("baseline", type=Path)
+    cmp_p.add_argument("current", type=Path)
+    cmp_p.add_argument("--threshold", type=float, default=0.10, help="允许的相对变慢/变大比例，默认 0.10")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_suite(args.symbol.upper(), args.repeat, args.only)
+        if args.out is not None:
+            args.out.parent.mkdir(parents=True, exist_ok=True)
+            args.out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+            print(f"结果 -> {args.out}")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"发现 {len(regressions)} 项回归（阈值 {args.threshold:.0%}）:")
+        for r in regressions:
+            print(f"  - {r}")
+        sys.exit(1)
+    print("无回归。")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+walk-forward 窗口信号校验：对 store/market_data 下全部 *_daily.csv，按滚动窗口（默认 504/126）
+在 IndicatorCache.window 视图上计算各买入策略（及与持仓无关的布林上轨卖出）的整段信号，
+校验样本外窗口内与整段序列上的信号逐 bar 一致（窗口开头由之前的数据预热），并给出两种路径的耗时。
+compute_signals 校验整个窗口；逐 bar 的 next() 较慢，只校验各窗口开头 --head 根（预热与回看受影响的区段）。
+
+    python benchmarks/bench_window_signals.py [--symbols NVDA,TSLA] [--is-bars 504] [--oos-bars 126] [--head 64]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from backtest.sweep import value_list
+from backtest.walk_forward import window_bounds
+from core.types import SignalAction
+from data.loader import get_bars, list_symbols
+from strategies.context import BarContext
+from strategies.factory import create_buy_strategies, create_sell_strategies
+from strategies.indicators import IndicatorCache
+
+BUY_STRATEGIES = ["oversold_score_buy", "oversold_rebound_buy", "boll_trend_pullback_buy"]
+# 与持仓无关的卖出策略（其余卖出信号取决于买入日，不做整段比较）
+SELL_STRATEGIES = ["boll_upper_break_sell"]
+
+
+def _batch_actions(strategy, df, ind) -> np.ndarray:
+    batch = strategy.compute_signals(df, indicator_cache=ind)
+    return batch.action if batch is not None else _next_actions(strategy, df, ind, range(len(df)))
+
+
+def _next_actions(strategy, df, ind, rows: range) -> np.ndarray:
+    """对 rows 中各 bar 调用 next()（买入以空仓、卖出以持仓视角）。"""
+    ctx = BarContext.from_frame(df, ind)
+    position = 1 if strategy.name.endswith("_sell") else 0
+    want = SignalAction.SELL if position else SignalAction.BUY
+    return np.array([
+        strategy.next(current_bar=ctx.seek(i), history_df=None, current_position=position).action == want
+        for i in rows
+    ], dtype=bool)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="walk-forward 窗口信号与整段信号一致性校验")
+    parser.add_argument("--symbols", type=value_list(lambda v: v.strip().upper()), default=None, help="标的列表，缺省为全部")
+    parser.add_argument("--is-bars", type=int, default=504)
+    parser.add_argument("--oos-bars", type=int, default=126)
+    parser.add_argument("--head", type=int, default=64, help="next() 路径每个窗口校验的开头根数")
+    args = parser.parse_args()
+
+    symbols = args.symbols or list_symbols()
+    if not symbols:
+        print("未找到 store/market_data/*_daily.csv")
+        return
+    strategies = create_buy_strategies(BUY_STRATEGIES) + create_sell_strategies(SELL_STRATEGIES)
+    t_full = t_window = 0.0
+    windows = signals = 0
+    for symbol in symbols:
+        df = get_bars(symbol)
+        root = IndicatorCache(df)
+        for s in strategies:
+            t0 = time.perf_counter()
+            full_batch = _batch_actions(s, df, root)
+            t_full += time.perf_counter() - t0
+            for _, start, stop in window_bounds(len(df), args.is_bars, args.oos_bars):
+                view = root.window(start, stop)
+                part = df.iloc[start:stop]
+                head = min(args.head, stop - start)
+                t0 = time.perf_counter()
+                got_batch = _batch_actions(s, part, view)
+                t_window += time.perf_counter() - t0
+                got_next = _next_actions(s, part, view, range(head))
+                full_next = _next_actions(s, df, root, range(start, start + head))
+                for path, full, got in (("compute_signals", full_batch[start:stop], got_batch), ("next", full_next, got_next)):
+                    if not np.array_equal(full, got):
+                        k = int(np.flatnonzero(full != got)[0])
+                        raise SystemExit(
+                            f"{symbol} {s.name} {path}: 窗口 [{start}, {stop}) 第 {k} 根信号与整段不一致"
+                        )
+                windows += 1
+                signals += int(got_batch.sum())
+    print(f"共 {len(symbols)} 只标的, {len(strategies)} 个策略, {windows} 个窗口, 窗口内 {signals} 个信号；与整段逐 bar 一致")
+    print(f"  整段 {t_full * 1e3:9.1f} ms  窗口 {t_window * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
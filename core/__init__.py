@@ -1,3 +1,3 @@
-from core.types import Bar, Signal, SignalAction, TradeRecord
+from core.types import Bar, FastSignal, Signal, SignalAction, TradeRecord
 
-__all__ = ["Bar", "Signal", "SignalAction", "TradeRecord"]
+__all__ = ["Bar", "FastSignal", "Signal", "SignalAction", "TradeRecord"]
@@ -5,19 +5,13 @@ import re
 from dataclasses import dataclass, field
 from typing import List, Optional
 
-from core.config import MARKET_DATA_DIR
+from core.config import market_data_symbols
 from core.properties_loader import get, get_float, get_int
 
 
 def _default_symbols() -> List[str]:
-    """当 default.symbols 为空时：扫描 market_data 下所有 *_daily.csv。"""
-    if not MARKET_DATA_DIR.exists():
-        return []
-    symbols = []
-    for f in MARKET_DATA_DIR.iterdir():
-        if f.suffix.lower() == ".csv" and f.stem.endswith("_daily"):
-            symbols.append(f.stem.replace("_daily", "").upper())
-    return sorted(symbols)
+    """当 default.symbols 为空时：market_data 下全部 *_daily.csv 对应的标的。"""
+    return market_data_symbols()
 
 
 def _parse_symbols(value: Optional[str]) -> List[str]:
@@ -2,6 +2,7 @@
 全局配置：路径、IB、回测、实盘等。可修改项从 config/config.properties 读取，未配置则用下方默认值。
 """
 from pathlib import Path
+from typing import List
 
 from core.properties_loader import get, get_float, get_int
 
@@ -11,9 +12,22 @@ ROOT = Path(__file__).resolve().parent.parent
 # 数据中心 - 文件数据库（路径固定，不通过 properties 修改）
 STORE = ROOT / "store"
 MARKET_DATA_DIR = STORE / "market_data"
+COLUMN_STORE_DIR = MARKET_DATA_DIR / "columns"
+PANEL_DIR = MARKET_DATA_DIR / "panel"
 BACKTEST_RESULTS_DIR = STORE / "backtest_results"
+SWEEP_RESULTS_DIR = STORE / "sweep_results"
+SIGNAL_CACHE_DIR = STORE / "signal_cache"
+RESULT_CACHE_DIR = STORE / "result_cache"
 LIVE_STATE_DIR = STORE / "live_state"
 
+
+def market_data_symbols() -> List[str]:
+    """MARKET_DATA_DIR 下全部 *_daily.csv 对应的标的（大写、排序）。"""
+    if not MARKET_DATA_DIR.exists():
+        return []
+    return sorted(p.name[: -len("_daily.csv")].upper() for p in MARKET_DATA_DIR.glob("*_daily.csv"))
+
+
 # IBKR 连接配置（来自 config.properties，未配置则用默认）
 IB_HOST = get("ib.host") or "127.0.0.1"
 IB_PORT = get_int("ib.port") or 7497
@@ -0,0 +1,30 @@
+"""
+日期轴工具：K 线日期在内部统一为 numpy datetime64[D]（DataFrame 列为 pandas 支持的最粗单位 datetime64[s]），
+只在写 CSV、返回 API 等序列化时才转为 'YYYY-MM-DD' 字符串。
+"""
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def to_days(values: Any) -> np.ndarray:
+    """日期序列（datetime64 列、'YYYY-MM-DD' 字符串、date / Timestamp 等）转为 datetime64[D] 数组，已是 datetime64 时不解析。"""
+    arr = values.to_numpy() if isinstance(values, (pd.Series, pd.Index)) else np.asarray(values)
+    if arr.dtype.kind == "M":
+        return arr.astype("datetime64[D]", copy=False)
+    if arr.size == 0:
+        return np.zeros(0, dtype="datetime64[D]")
+    return pd.to_datetime(arr).to_numpy().astype("datetime64[D]")
+
+
+def to_day(value: Any) -> np.datetime64:
+    """单个日期参数取到日；字符串只看前 10 位 'YYYY-MM-DD'。"""
+    if isinstance(value, str):
+        return np.datetime64(value[:10], "D")
+    return pd.Timestamp(value).to_datetime64().astype("datetime64[D]")
+
+
+def day_strings(days: Any) -> np.ndarray:
+    """datetime64 日期数组转为 'YYYY-MM-DD' 字符串数组（序列化用）。"""
+    return np.datetime_as_string(to_days(days), unit="D")
@@ -0,0 +1,24 @@
+"""
+源码指纹：持久化缓存（磁盘信号缓存、回测结果缓存）的键中代替手工递增的版本号，
+相关源码一改，旧条目的键自然对不上，不会把旧代码算出的结果当作新结果返回。
+"""
+import hashlib
+from functools import lru_cache
+
+from core.config import ROOT
+
+
+@lru_cache(maxsize=None)
+def source_fingerprint(*names: str) -> str:
+    """
+    项目内源码的哈希。names 为相对项目根的 .py 文件或包目录（目录取其下全部 .py，按路径排序）。
+    同一进程内源码不变，结果按参数缓存。
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for name in names:
+        path = ROOT / name
+        files = sorted(path.rglob("*.py")) if path.is_dir() else [path]
+        for f in files:
+            h.update(f.relative_to(ROOT).as_posix().encode())
+            h.update(f.read_bytes())
+    return h.hexdigest()
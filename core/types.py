@@ -1,10 +1,10 @@
 """
 核心数据模型 - 系统的"法律"。
-定义 Bar、Signal、TradeRecord 等 Pydantic 模型。
+定义 Bar、Signal、TradeRecord 等 Pydantic 模型，以及策略逐 bar 输出用的轻量信号 FastSignal。
 """
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Callable, Dict, Optional, Union
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
@@ -37,6 +37,55 @@ class Signal(BaseModel):
     reason: str = ""  # 关键：如 "MA5_Cross_Up_MA20"
     price: Optional[float] = None  # 卖出时可选：盘中卖出价，仅 SELL 时有效
 
+    def to_signal(self) -> "Signal":
+        return self
+
+
+class FastSignal:
+    """
+    策略 next() 的轻量返回值：字段同 Signal，但不做校验、不经 Pydantic 构造。
+    HOLD 信号按原因预分配、全局共享（hold()），逐 bar 返回不产生新对象；
+    reason 可传无参可调用对象，读取时才格式化，只有导致成交的信号才会真正生成原因字符串。
+    对外（API、实盘）时经 to_signal() 转为 Signal 校验。
+    """
+    __slots__ = ("action", "strength", "price", "_reason")
+
+    def __init__(
+        self,
+        action: SignalAction = SignalAction.HOLD,
+        strength: float = 0.0,
+        reason: Union[str, Callable[[], str]] = "",
+        price: Optional[float] = None,
+    ) -> None:
+        self.action = action
+        self.strength = strength
+        self.price = price
+        self._reason = reason
+
+    @property
+    def reason(self) -> str:
+        if callable(self._reason):
+            self._reason = self._reason()
+        return self._reason
+
+    @classmethod
+    def hold(cls, reason: str = "hold") -> "FastSignal":
+        """该原因的共享 HOLD 信号，调用方不得修改。"""
+        sig = _HOLD_SIGNALS.get(reason)
+        if sig is None:
+            sig = _HOLD_SIGNALS[reason] = cls(SignalAction.HOLD, 0.0, reason)
+        return sig
+
+    def to_signal(self) -> Signal:
+        """转为校验过的 Signal（strength 越界等在此报错）。"""
+        return Signal(action=self.action, strength=self.strength, reason=self.reason, price=self.price)
+
+    def __repr__(self) -> str:
+        return f"FastSignal(action={self.action.value}, strength={self.strength}, reason={self.reason!r}, price={self.price})"
+
+
+_HOLD_SIGNALS: Dict[str, FastSignal] = {}
+
 
 # ----- TradeRecord (详细交割单 - 回测与实盘共用) -----
 class TradeRecord(BaseModel):
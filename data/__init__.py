@@ -1,3 +1,9 @@
-from data.loader import append_bars, get_bars, save_bars, update_history
+from data.loader import append_bars, configure_bar_cache, get_bar_cache, get_bars, get_bars_many, list_symbols, save_bars, update_history
+from data.panel import Panel, build_panel, load_panel, open_panel
+from data.shared import SharedBars, attach_bars
 
-__all__ = ["get_bars", "save_bars", "append_bars", "update_history"]
+__all__ = [
+    "get_bars", "get_bars_many", "save_bars", "append_bars", "update_history", "get_bar_cache", "configure_bar_cache", "list_symbols",
+    "Panel", "build_panel", "load_panel", "open_panel",
+    "SharedBars", "attach_bars",
+]
@@ -0,0 +1,128 @@
+"""
+列式二进制行情库：store/market_data/columns/ 下每个标的三份文件，与 *_daily.csv 一一对应。
+- {SYMBOL}.f8：数值列按列存为 (列数 × bar 数) float64 矩阵（无文件头的本机字节序原始字节），每列在文件中连续
+- {SYMBOL}.days：日期列，datetime64[D]（1970-01-01 起的天数，int64）的原始字节
+- {SYMBOL}.json：行数、列名、原始 dtype 与源 CSV 的 (mtime_ns, 字节数)
+两份数据文件以 mmap 映射后 np.frombuffer 取只读视图，不经过 .npy 头解析，打开一个标的约几十微秒。
+
+CSV 是唯一数据源：读取时源 CSV 的 mtime 或大小与记录不符即视为过期，由 loader 重新解析 CSV 后重建。
+各文件写临时文件后原子替换，元数据最后写入，读者不会读到新旧混杂的条目。
+"""
+import json
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.config import COLUMN_STORE_DIR
+from core.dates import to_days
+
+
+def _paths(symbol: str) -> Tuple[Path, Path, Path]:
+    base = COLUMN_STORE_DIR / symbol.upper()
+    return base.with_suffix(".f8"), base.with_suffix(".days"), base.with_suffix(".json")
+
+
+def map_array(path: Path, dtype: str) -> np.ndarray:
+    """只读映射整个无文件头的二进制文件为一维数组；映射随数组存活。"""
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return np.frombuffer(buf, dtype=dtype)
+
+
+def read_columns(symbol: str, stamp: Tuple[int, int]) -> Optional[Tuple[np.ndarray, List[str], np.ndarray, List[str]]]:
+    """
+    读取列式文件：返回 (dates, 列名, 数值矩阵, 各列 dtype)，数组均为只读内存映射。
+    不存在、与 stamp（源 CSV 的 mtime_ns, 字节数）不符或文件不完整时返回 None。
+    """
+    values_path, dates_path, meta_path = _paths(symbol)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if tuple(meta["source"]) != tuple(stamp):
+            return None
+        values = map_array(values_path, "f8")
+        dates = map_array(dates_path, "datetime64[D]")
+    except (OSError, ValueError, KeyError):
+        return None
+    n, columns = meta["rows"], meta["columns"]
+    if values.size != len(columns) * n or dates.size != n:
+        return None
+    return dates, columns, values.reshape(len(columns), n), meta["dtypes"]
+
+
+def write_columns(symbol: str, df: pd.DataFrame, stamp: Tuple[int, int]) -> bool:
+    """
+    由已解析的 K 线（date 为 datetime64 列、已按日期升序）写列式文件，stamp 为对应 CSV 的 (mtime_ns, 字节数)。
+    含非数值列时不写（返回 False），loader 继续读 CSV。
+    """
+    columns = [c for c in df.columns if c != "date"]
+    if "date" not in df.columns or any(not pd.api.types.is_numeric_dtype(df[c]) for c in columns):
+        return False
+    values = np.empty((len(columns), len(df)))
+    for k, c in enumerate(columns):
+        values[k] = df[c].to_numpy(dtype=float)
+    return _write(symbol, to_days(df["date"]), columns, values, [str(df[c].dtype) for c in columns], stamp)
+
+
+def _write(symbol: str, dates: np.ndarray, columns: List[str], values: np.ndarray, dtypes: List[str], stamp: Tuple[int, int]) -> bool:
+    """写三份文件：数据文件先写，元数据最后写（见模块说明）。"""
+    values_path, dates_path, meta_path = _paths(symbol)
+    arrays: Dict[Path, np.ndarray] = {values_path: values, dates_path: to_days(dates)}
+    meta = {
+        "source": list(stamp),
+        "rows": values.shape[1],
+        "columns": columns,
+        "dtypes": dtypes,
+    }
+    COLUMN_STORE_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        for path, arr in arrays.items():
+            atomic_write(path, lambda f, arr=arr: f.write(arr.tobytes()))
+        atomic_write(meta_path, lambda f: f.write(json.dumps(meta).encode()))
+    except OSError:
+        return False
+    return True
+
+
+def append_columns(
+    symbol: str,
+    columns: Tuple[np.ndarray, List[str], np.ndarray, List[str]],
+    fresh: pd.DataFrame,
+    stamp: Tuple[int, int],
+) -> bool:
+    """
+    在 read_columns 返回的已有列后拼上新行（date 为 datetime64 列、晚于已有日期）并写回，stamp 为追加后 CSV 的 (mtime_ns, 字节数)。
+    直接在数组上拼接，不经 DataFrame；新行缺的列为 NaN，原为整数的列因此转为 float64（与重新解析 CSV 一致）。
+    """
+    dates, names, values, dtypes = columns
+    if any(c != "date" and c not in names for c in fresh.columns):
+        return False
+    block = np.empty((len(names), len(fresh)))
+    new_dtypes = []
+    for k, (name, dtype) in enumerate(zip(names, dtypes)):
+        if name in fresh.columns and pd.api.types.is_numeric_dtype(fresh[name]):
+            block[k] = fresh[name].to_numpy(dtype=float)
+            dtype = str(np.result_type(np.dtype(dtype), fresh[name].dtype))
+        else:
+            block[k] = np.nan
+        if np.isnan(block[k]).any():
+            dtype = "float64"
+        new_dtypes.append(dtype)
+    merged_dates = np.concatenate([dates, to_days(fresh["date"])])
+    return _write(symbol, merged_dates, names, np.concatenate([values, block], axis=1), new_dtypes, stamp)
+
+
+def atomic_write(path: Path, write) -> None:
+    """write(f) 写同目录临时文件（二进制）后原子替换 path。"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+        raise
@@ -1,13 +1,31 @@
 """
-数据模块：读取/清洗 CSV，更新 CSV。
-提供 get_bars(symbol, start, end) 与 update_history(symbol)。
+数据模块：读取/清洗 CSV，更新 CSV；读取经列式二进制库（data.column_store）加速。
+提供 get_bars(symbol, start, end)、批量的 get_bars_many(symbols, start, end) 与 update_history(symbol)；已解析的 K 线缓存在进程级 BarCache 中。
 """
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from core.config import MARKET_DATA_DIR
+from core.config import MARKET_DATA_DIR, market_data_symbols
+from core.dates import to_day, to_days
+from data import column_store
+
+# 进程级 K 线缓存的默认内存上限（字节）
+BAR_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# append_bars 从文件尾向前读取的块大小（字节）
+_TAIL_BLOCK = 64 * 1024
+# get_bars_many 的默认线程数上限（另不超过 CPU 数）
+BULK_LOAD_WORKERS = 8
 
 
 def _csv_path(symbol: str) -> Path:
@@ -15,68 +33,384 @@ def _csv_path(symbol: str) -> Path:
     return MARKET_DATA_DIR / f"{symbol.upper()}_daily.csv"
 
 
+def list_symbols() -> List[str]:
+    """store/market_data 下全部 *_daily.csv 对应的标的（大写、排序）。"""
+    return market_data_symbols()
+
+
+def bars_stamp(symbol: str) -> Optional[Tuple[int, int]]:
+    """某标的 CSV 的 (mtime_ns, 字节数)，不读文件内容；文件不存在为 None。用于判断数据是否变化。"""
+    try:
+        st = _csv_path(symbol).stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class BarCache:
+    """
+    进程级已解析 K 线的 LRU 缓存：symbol -> 整段 DataFrame 及其 datetime64[D] 日期索引。
+    - 以 CSV 的 (mtime_ns, 字节数) 判断失效，命中时只 stat 一次文件
+    - max_bytes：缓存 DataFrame 占用内存上限，超出淘汰最久未用者；0 表示不缓存
+    - hits / misses：命中与未命中（含失效重载）次数
+    web API 在线程池中调用 get_bars，读写经锁保护。
+    """
+
+    def __init__(self, max_bytes: int = BAR_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], pd.DataFrame, np.ndarray, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, symbol: str, stamp: Tuple[int, int]) -> Optional[Tuple[pd.DataFrame, np.ndarray]]:
+        """stamp 与缓存一致时返回 (整段 DataFrame, 日期索引)，否则返回 None。"""
+        key = symbol.upper()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], entry[2]
+            self.misses += 1
+            return None
+
+    def put(self, symbol: str, stamp: Tuple[int, int], frame: pd.DataFrame, index: np.ndarray) -> None:
+        if self.max_bytes <= 0:
+            return
+        nbytes = _frame_nbytes(frame) + index.nbytes
+        key = symbol.upper()
+        with self._lock:
+            self._pop(key)
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (stamp, frame, index, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def discard(self, symbol: str) -> None:
+        with self._lock:
+            self._pop(symbol.upper())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[3]
+
+
+_cache = BarCache()
+
+
+def get_bar_cache() -> BarCache:
+    """进程级 K 线缓存（get_bars 使用）。"""
+    return _cache
+
+
+def configure_bar_cache(max_bytes: int = BAR_CACHE_MAX_BYTES) -> BarCache:
+    """替换进程级 K 线缓存，如调整内存上限或以 max_bytes=0 关闭（基准测试测冷加载）。"""
+    global _cache
+    _cache = BarCache(max_bytes=max_bytes)
+    return _cache
+
+
 def get_bars(
     symbol: str,
     start: Optional[str] = None,
     end: Optional[str] = None,
+    copy: bool = False,
 ) -> pd.DataFrame:
     """
-    读取日 K CSV，返回 DataFrame。
+    读取日 K，返回 DataFrame。
     列约定: date, open, high, low, close, volume, average, barCount
+    整段数据缓存在进程级 BarCache 中，CSV 未变化时不再读文件；未命中时优先读列式二进制库
+    （data.column_store，内存映射），库中缺失或比 CSV 旧时解析 CSV 并重建。
+    date 列为按日的 datetime64；日期区间在有序的 datetime64[D] 日期索引上二分查找切片。返回的 DataFrame 与缓存共享数据（Copy-on-Write 下
+    原地修改不会影响缓存）；copy=True 时返回独立副本。
     """
-    path = _csv_path(symbol)
-    if not path.exists():
+    stamp = bars_stamp(symbol)
+    if stamp is None:
         return pd.DataFrame()
 
-    df = pd.read_csv(path)
+    cached = _cache.get(symbol, stamp)
+    if cached is None:
+        frame, index = _load_frame(symbol, stamp)
+        if frame.empty:
+            return frame
+        _cache.put(symbol, stamp, frame, index)
+    else:
+        frame, index = cached
+
+    lo = int(index.searchsorted(to_day(start))) if start else 0
+    hi = int(index.searchsorted(to_day(end), side="right")) if end else len(index)
+    df = frame.iloc[lo:hi]
+    if lo:
+        df = df.reset_index(drop=True)
+    return df.copy() if copy else df
+
+
+def get_bars_many(
+    symbols: Optional[Sequence[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    long: bool = False,
+    max_workers: Optional[int] = None,
+) -> Union[Dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    批量读取多个标的的日 K（symbols 缺省为 store/market_data 下全部标的），在线程池中并发 get_bars。
+    CSV 解析与列式库的文件读写大部分时间释放 GIL，冷启动总耗时接近最大单个文件的耗时；已缓存的标的直接命中。
+    返回 {标的: DataFrame}（键与传入的 symbols 逐项相同、不改大小写，按其顺序；无数据的标的为空 DataFrame）；
+    long=True 时返回首列为 symbol 的长表（各标的按顺序纵向拼接，无数据的标的不出现）。
+    """
+    symbols = list(symbols) if symbols is not None else list_symbols()
+    workers = max(1, min(max_workers or min(BULK_LOAD_WORKERS, os.cpu_count() or 1), len(symbols)))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            frames = list(executor.map(lambda s: get_bars(s, start, end), symbols))
+    else:
+        frames = [get_bars(s, start, end) for s in symbols]
+    result = dict(zip(symbols, frames))
+    if not long:
+        return result
+    parts = [df.assign(symbol=s)[["symbol", *df.columns]] for s, df in result.items() if not df.empty]
+    if not parts:
+        return pd.DataFrame(columns=["symbol"])
+    return pd.concat(parts, ignore_index=True)
+
+
+def _load_frame(symbol: str, stamp: Tuple[int, int]) -> Tuple[pd.DataFrame, np.ndarray]:
+    """整段读取，返回 (DataFrame, datetime64[D] 日期索引)：列式库有效时直接映射，否则解析 CSV 并重建列式库"""
+    columns = column_store.read_columns(symbol, stamp)
+    if columns is not None:
+        return _columns_frame(columns), np.array(columns[0])
+    df = _read_csv(_csv_path(symbol))
     if df.empty:
-        return df
+        return df, np.empty(0, dtype="datetime64[D]")
+    column_store.write_columns(symbol, df, stamp)
+    return df, to_days(df["date"])
 
-    # 确保 date 为字符串，便于筛选
+
+def _frame_nbytes(frame: pd.DataFrame) -> int:
+    """DataFrame 占用内存的估计：数值列按元素宽度，字符串列按首个元素大小（避免 memory_usage(deep=True) 逐元素统计）"""
+    n = len(frame)
+    total = 0
+    for name, dtype in frame.dtypes.items():
+        if isinstance(dtype, np.dtype) and dtype != object:
+            total += n * dtype.itemsize
+        elif n:
+            total += n * (8 + sys.getsizeof(frame[name].iloc[0]))
+    return total
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """统一列名 Date -> date，date 转为按日的 datetime64 列"""
     if "date" not in df.columns and "Date" in df.columns:
         df = df.rename(columns={"Date": "date"})
-    df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
+    else:
+        df = df.copy()
+    df["date"] = to_days(df["date"]).astype("datetime64[s]")
+    return df
 
-    if start:
-        df = df[df["date"] >= start]
-    if end:
-        df = df[df["date"] <= end]
 
-    return df.reset_index(drop=True)
+def _read_csv(path: Path) -> pd.DataFrame:
+    """解析日 K CSV：统一 date 列，并保证按日期升序（列式库按有序日期二分切片）"""
+    df = pd.read_csv(path)
+    if df.empty:
+        return df
+    df = _normalize(df)
+    if not df["date"].is_monotonic_increasing:
+        df = df.sort_values("date", kind="stable").reset_index(drop=True)
+    return df
+
+
+def _columns_frame(columns) -> pd.DataFrame:
+    """由列式库的 (dates, 列名, 数值矩阵, dtype) 构造 DataFrame"""
+    dates, names, values, dtypes = columns
+    data = {"date": dates.astype("datetime64[s]")}
+    for k, (name, dtype) in enumerate(zip(names, dtypes)):
+        col = values[k]
+        data[name] = col if dtype == "float64" else col.astype(dtype)
+    return pd.DataFrame(data)
 
 
 def save_bars(symbol: str, df: pd.DataFrame) -> None:
-    """将 DataFrame 写入 CSV（用于初次创建或全量覆盖）。"""
+    """
+    将 DataFrame 写入 CSV（用于初次创建或全量覆盖；日期写为 YYYY-MM-DD），并同步刷新列式库。
+    先写同目录临时文件再原子替换，并发读取方（Web API）只会看到完整的旧文件或新文件。
+    """
     path = _csv_path(symbol)
     path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=False)
+    if not df.empty:
+        df = _normalize(df).reset_index(drop=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            df.to_csv(f, index=False, date_format="%Y-%m-%d")
+        if path.exists():
+            shutil.copymode(path, tmp)
+        else:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    _cache.discard(symbol)
+    stamp = bars_stamp(symbol)
+    if stamp is not None and not df.empty and df["date"].is_monotonic_increasing:
+        column_store.write_columns(symbol, df, stamp)
 
 
 def append_bars(symbol: str, new_df: pd.DataFrame) -> None:
     """
     将新 K 线追加到现有 CSV，按 date 去重（保留新数据）。
+    增量路径：末行日期取自列式库（有效时）或文件尾，只把晚于末行的 K 线追加到文件尾，写入量与文件长度无关；
+    与已有日期重叠的部分只从文件尾按块读回比对，仅当新数据修订了历史（数值不同或插入缺失日期）时才整体合并重写。
     """
     path = _csv_path(symbol)
-    if not path.exists():
-        save_bars(symbol, new_df)
+    stamp = bars_stamp(symbol)
+    if stamp is None or new_df.empty:
+        if stamp is None:
+            save_bars(symbol, new_df)
+        return
+
+    new_df = _normalize(new_df).drop_duplicates(subset=["date"], keep="last").sort_values("date")
+    header = _csv_header(path)
+    columns = column_store.read_columns(symbol, stamp)
+    last = columns[0][-1] if columns is not None and len(columns[0]) else _last_date(path, header)
+    if last is None or "date" not in header or not set(new_df.columns) <= set(header):
+        _merge_bars(symbol, new_df)
         return
 
-    existing = pd.read_csv(path)
-    if "Date" in existing.columns and "date" not in existing.columns:
-        existing = existing.rename(columns={"Date": "date"})
-    existing["date"] = pd.to_datetime(existing["date"]).astype(str)
+    days = to_days(new_df["date"])
+    overlap = new_df[days <= last]
+    if len(overlap):
+        if columns is not None:
+            existing_days, existing = columns[0], dict(zip(columns[1], columns[2]))
+        else:
+            tail = _read_tail(path, header, days[0])
+            existing_days, existing = to_days(tail["date"]), {c: tail[c].to_numpy() for c in tail.columns if c != "date"}
+        if _revises(existing_days, existing, overlap):
+            _merge_bars(symbol, new_df)
+            return
+    fresh = new_df[days > last].reindex(columns=header)
+    if fresh.empty:
+        return
+
+    _append_rows(path, fresh.to_csv(index=False, header=False, date_format="%Y-%m-%d").encode())
+    _cache.discard(symbol)
+    # 追加前列式库有效时在数组上直接拼上新行，无需重新解析 CSV；否则留待下次读取时重建
+    new_stamp = bars_stamp(symbol)
+    if columns is not None and new_stamp is not None:
+        column_store.append_columns(symbol, columns, fresh, new_stamp)
 
-    new_df = new_df.copy()
-    if "date" not in new_df.columns and "Date" in new_df.columns:
-        new_df = new_df.rename(columns={"Date": "date"})
-    new_df["date"] = pd.to_datetime(new_df["date"]).astype(str)
 
-    combined = pd.concat([existing, new_df], ignore_index=True)
+def _merge_bars(symbol: str, new_df: pd.DataFrame) -> None:
+    """全量合并：读入已有 K 线，与新数据按 date 去重（保留新数据）、排序后整体重写。"""
+    existing = get_bars(symbol)
+    combined = pd.concat([existing, new_df], ignore_index=True) if not existing.empty else new_df
     combined = combined.drop_duplicates(subset=["date"], keep="last")
     combined = combined.sort_values("date").reset_index(drop=True)
     save_bars(symbol, combined)
 
 
+def _csv_header(path: Path) -> List[str]:
+    with open(path, "r", newline="") as f:
+        columns = f.readline().strip().split(",")
+    return ["date" if c == "Date" else c for c in columns]
+
+
+def _tail_lines(path: Path, since: Optional[np.datetime64], date_col: int) -> List[bytes]:
+    """
+    从文件尾按块向前读，返回末尾的完整数据行：since 为 None 时只取最后一行，否则取日期 >= since 的各行。
+    文件按日期升序、日期以 YYYY-MM-DD 开头，按字节比较即可；读取量只与所取行数有关。
+    """
+    key = str(since).encode() if since is not None else None
+
+    def day(line: bytes) -> bytes:
+        return line.split(b",")[date_col][:10]
+
+    with open(path, "rb") as f:
+        body_start = len(f.readline())
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        complete: List[bytes] = []
+        while pos > body_start:
+            step = min(_TAIL_BLOCK, pos - body_start)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            lines = buf.splitlines()
+            complete = [line for line in (lines if pos == body_start else lines[1:]) if line.strip()]  # 块首行可能不完整
+            if complete and (key is None or day(complete[0]) < key):
+                break
+    if key is None:
+        return complete[-1:]
+    k = len(complete)
+    while k > 0 and day(complete[k - 1]) >= key:
+        k -= 1
+    return complete[k:]
+
+
+def _last_date(path: Path, header: List[str]) -> Optional[np.datetime64]:
+    """CSV 末行日期（文件按日期升序）；无数据行时为 None。"""
+    if "date" not in header:
+        return None
+    lines = _tail_lines(path, None, header.index("date"))
+    return to_day(lines[0].split(b",")[header.index("date")].decode()) if lines else None
+
+
+def _read_tail(path: Path, header: List[str], since: np.datetime64) -> pd.DataFrame:
+    """CSV 中 date >= since 的末尾各行（只读文件尾）。"""
+    lines = _tail_lines(path, since, header.index("date"))
+    df = pd.read_csv(io.BytesIO(b"\n".join([",".join(header).encode()] + lines)))
+    return _normalize(df) if not df.empty else df
+
+
+def _revises(existing_days: np.ndarray, existing: Dict[str, np.ndarray], overlap: pd.DataFrame) -> bool:
+    """
+    新数据与已有日期重叠的部分是否修订了历史：含已有数据中没有的日期，或任一共同列数值不同。
+    existing_days 为已有数据（可只含末尾一段）的升序日期，existing 为各列数组。
+    """
+    days = to_days(overlap["date"])
+    pos = np.minimum(existing_days.searchsorted(days), len(existing_days) - 1)
+    if len(existing_days) == 0 or (existing_days[pos] != days).any():
+        return True
+    for name in overlap.columns:
+        if name == "date" or name not in existing:
+            continue
+        new = overlap[name].to_numpy(dtype=float)
+        old = np.asarray(existing[name], dtype=float)[pos]
+        if not np.allclose(new, old, rtol=1e-12, atol=0.0, equal_nan=True):
+            return True
+    return False
+
+
+def _append_rows(path: Path, data: bytes) -> None:
+    """把若干完整行一次写到文件尾（O_APPEND）；原文件末尾缺换行时先补上。"""
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            data = b"\n" + data
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 def update_history(symbol: str) -> None:
     """
     调用 skills.ib_client 获取最新日 K 并追加到 store/market_data/*.csv。
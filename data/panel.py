@@ -0,0 +1,181 @@
+"""
+全市场面板：把 store/market_data/ 下全部标的日 K 打包为一个内存映射的三维 float64 数组，
+在全部标的交易日的并集日历上对齐，标的当日无 K 线（上市前、停牌）处为 NaN。
+
+文件（store/market_data/panel/）：
+- panel.f8：(字段数 × 日期数 × 标的数) 矩阵的原始字节，每个字段为一块连续的 (日期 × 标的) 二维数组
+- panel.days：日期轴，datetime64[D]
+- panel.json：字段、标的与各标的 CSV 的 (mtime_ns, 字节数)
+
+build_panel() 为构建步骤；load_panel() 只读映射打开（不读数据页，多进程共享页缓存），
+所需标的的 CSV 变化或面板中缺少所需标的时自动重建（保留面板中其余标的），只要部分标的时取子面板。组合回测、全市场筛选、相关性分析可直接在二维视图上计算：
+
+    panel = load_panel()
+    panel.close["NVDA"]                  # 一维视图（按日期）
+    panel.close.values                   # (日期 × 标的) 二维视图
+    panel.slice("2022-01-01", "2023-12-31").field("volume")
+"""
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.config import PANEL_DIR
+from core.dates import to_day, to_days
+from data.column_store import atomic_write, map_array
+from data.loader import bars_stamp, get_bars, list_symbols
+
+_VALUES = "panel.f8"
+_DATES = "panel.days"
+_META = "panel.json"
+
+
+class FieldView:
+    """面板中一个字段：panel.close["NVDA"] 为该标的一维视图，values 为 (日期 × 标的) 二维视图。"""
+
+    __slots__ = ("panel", "name", "values")
+
+    def __init__(self, panel: "Panel", name: str, values: np.ndarray) -> None:
+        self.panel = panel
+        self.name = name
+        self.values = values
+
+    def __getitem__(self, symbol: str) -> np.ndarray:
+        return self.values[:, self.panel.symbol_index(symbol)]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.values if dtype is None else self.values.astype(dtype)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    def frame(self) -> pd.DataFrame:
+        """DataFrame 形式：日期为索引、标的为列。"""
+        return pd.DataFrame(self.values, index=pd.DatetimeIndex(self.panel.dates, name="date"), columns=self.panel.symbols)
+
+
+@dataclass
+class Panel:
+    """
+    (字段 × 日期 × 标的) 面板，values 为只读数组（通常为内存映射）。
+    字段按属性访问（panel.close、panel.volume），或 panel.field(name)。
+    """
+    fields: List[str]
+    symbols: List[str]
+    dates: np.ndarray  # datetime64[D]，升序
+    values: np.ndarray
+
+    def __post_init__(self) -> None:
+        self._symbol_index: Dict[str, int] = {s: k for k, s in enumerate(self.symbols)}
+
+    def __getattr__(self, name: str) -> FieldView:
+        fields = self.__dict__.get("fields")
+        if fields is not None and name in fields:
+            return self.field(name)
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def symbol_index(self, symbol: str) -> int:
+        try:
+            return self._symbol_index[symbol.upper()]
+        except KeyError:
+            raise KeyError(f"面板中无标的 {symbol}") from None
+
+    def field(self, name: str) -> FieldView:
+        return FieldView(self, name, self.values[self.fields.index(name)])
+
+    @property
+    def mask(self) -> np.ndarray:
+        """(日期 × 标的) 布尔数组：当日有 K 线为 True（上市前、停牌为 False）。"""
+        return ~np.isnan(self.values[self.fields.index("close") if "close" in self.fields else 0])
+
+    def slice(self, start: Optional[str] = None, end: Optional[str] = None) -> "Panel":
+        """日期区间 [start, end]（含首尾）的子面板，数组为视图。"""
+        lo = int(self.dates.searchsorted(to_day(start))) if start else 0
+        hi = int(self.dates.searchsorted(to_day(end), side="right")) if end else len(self.dates)
+        return Panel(self.fields, self.symbols, self.dates[lo:hi], self.values[:, lo:hi])
+
+    def select(self, symbols: Sequence[str]) -> "Panel":
+        """指定标的的子面板（按给定顺序，数组为副本）。"""
+        idx = [self.symbol_index(s) for s in symbols]
+        return Panel(self.fields, [self.symbols[k] for k in idx], self.dates, self.values[:, :, idx])
+
+
+def build_panel(symbols: Optional[Sequence[str]] = None) -> Panel:
+    """
+    读取各标的 K 线（经 get_bars）对齐到并集日历并写入面板文件，返回打开的面板。
+    symbols 缺省为 store/market_data/ 下全部标的；字段为各标的数值列的并集（按首次出现顺序）。
+    """
+    symbols = [s.upper() for s in (symbols if symbols is not None else list_symbols())]
+    frames = {}
+    sources = {}
+    for s in symbols:
+        stamp = bars_stamp(s)
+        df = get_bars(s)
+        if stamp is None or df.empty:
+            continue
+        frames[s], sources[s] = df, list(stamp)
+    symbols = list(frames)
+    fields: List[str] = []
+    for df in frames.values():
+        fields += [c for c in df.columns if c != "date" and c not in fields and pd.api.types.is_numeric_dtype(df[c])]
+    days = {s: to_days(df["date"]) for s, df in frames.items()}
+    dates = np.unique(np.concatenate(list(days.values()) or [np.zeros(0, dtype="datetime64[D]")]))
+
+    values = np.full((len(fields), len(dates), len(symbols)), np.nan)
+    for j, s in enumerate(symbols):
+        rows = np.searchsorted(dates, days[s])
+        df = frames[s]
+        for k, name in enumerate(fields):
+            if name in df.columns:
+                values[k, rows, j] = df[name].to_numpy(dtype=float)
+
+    PANEL_DIR.mkdir(parents=True, exist_ok=True)
+    atomic_write(PANEL_DIR / _VALUES, lambda f: f.write(values.tobytes()))
+    atomic_write(PANEL_DIR / _DATES, lambda f: f.write(dates.tobytes()))
+    meta = {"fields": fields, "symbols": symbols, "rows": len(dates), "sources": sources}
+    atomic_write(PANEL_DIR / _META, lambda f: f.write(json.dumps(meta).encode()))
+    return open_panel()
+
+
+def open_panel() -> Optional[Panel]:
+    """只读映射打开已构建的面板；不存在或文件不完整时返回 None（不检查是否过期）。"""
+    panel, _ = _open()
+    return panel
+
+
+def load_panel(symbols: Optional[Sequence[str]] = None) -> Panel:
+    """
+    打开面板，返回 symbols（缺省为 store/market_data/ 下全部标的，无数据者略去）的面板。
+    已构建的面板包含全部所需标的且其 CSV 均未变化时直接使用，标的集合不同则取子面板（select）；
+    缺标的或任一所需标的 CSV 已变化时，以所需标的与原面板中仍有数据的标的之并集重建，
+    不同标的集合的调用方不会互相覆盖。
+    """
+    wanted = [s.upper() for s in (symbols if symbols is not None else list_symbols())]
+    current = {s: bars_stamp(s) for s in wanted}
+    wanted = [s for s in wanted if current[s] is not None]
+    panel, sources = _open()
+    if panel is None or any(s not in sources or list(current[s]) != sources[s] for s in wanted):
+        keep = [s for s in sources if s not in current and bars_stamp(s) is not None]
+        panel = build_panel(sorted(set(wanted) | set(keep)))
+    if panel.symbols == wanted:
+        return panel
+    return panel.select(wanted)
+
+
+def _open() -> Tuple[Optional[Panel], Dict[str, list]]:
+    try:
+        meta = json.loads((PANEL_DIR / _META).read_text(encoding="utf-8"))
+        values = map_array(PANEL_DIR / _VALUES, "f8")
+        dates = map_array(PANEL_DIR / _DATES, "datetime64[D]")
+        fields, symbols, n = meta["fields"], meta["symbols"], meta["rows"]
+    except (OSError, ValueError, KeyError):
+        return None, {}
+    if dates.size != n or values.size != len(fields) * n * len(symbols):
+        return None, {}
+    return Panel(fields, symbols, dates, values.reshape(len(fields), n, len(symbols))), meta.get("sources", {})
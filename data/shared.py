@@ -0,0 +1,116 @@
+"""
+进程池共享行情：父进程把各标的整段 K 线一次性装入一块 multiprocessing.shared_memory，
+只把轻量的 SharedBarsDescriptor（块名与各列偏移）传给 worker；worker 的 initializer 调 attach_bars()
+在共享块上建零拷贝的只读 DataFrame 并放入进程级 BarCache，之后的 get_bars 直接命中，不再读文件、不再解析。
+N 个 worker 共用同一份物理内存，行情部分的总驻留内存不随 worker 数增长。
+
+    with SharedBars(symbols) as shared:
+        with ProcessPoolExecutor(workers, initializer=attach_bars, initargs=(shared.descriptor,)) as ex:
+            ...
+"""
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.loader import bars_stamp, get_bar_cache, get_bars
+
+# 每列占一段连续的 8 字节元素（float64 / int64 / datetime64[s]）
+_ITEMSIZE = 8
+
+
+@dataclass(frozen=True)
+class SharedSymbol:
+    """共享块中一个标的：stamp 为装入时 CSV 的 (mtime_ns, 字节数)，各列依次从 offset 起各占 rows 个元素。"""
+    symbol: str
+    stamp: Tuple[int, int]
+    offset: int
+    rows: int
+    columns: Tuple[str, ...]  # 含 date
+    dtypes: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class SharedBarsDescriptor:
+    """传给 worker 的描述：共享内存块名与各标的布局，可 pickle，大小与 K 线根数无关。"""
+    name: str
+    symbols: Tuple[SharedSymbol, ...]
+
+
+class SharedBars:
+    """
+    父进程持有的共享行情块：构造时经 get_bars 读取各标的整段 K 线并写入共享内存；
+    用作 with 块或调用 close() 释放（worker 退出前须先结束）。无数据或含非数值列的标的不装入，worker 照常读文件。
+    """
+
+    def __init__(self, symbols: Sequence[str]) -> None:
+        frames: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+        for s in symbols:
+            stamp = bars_stamp(s)
+            df = get_bars(s)
+            if stamp is None or df.empty or not all(_shareable(df[c]) for c in df.columns):
+                continue
+            frames[s.upper()] = (stamp, df)
+        size = sum(len(df) * len(df.columns) for _, df in frames.values()) * _ITEMSIZE
+        self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        entries = []
+        offset = 0
+        for s, (stamp, df) in frames.items():
+            n = len(df)
+            for k, c in enumerate(df.columns):
+                view = np.ndarray(n, dtype=df[c].dtype, buffer=self._shm.buf, offset=offset + k * n * _ITEMSIZE)
+                view[:] = df[c].to_numpy()
+            entries.append(SharedSymbol(
+                symbol=s,
+                stamp=stamp,
+                offset=offset,
+                rows=n,
+                columns=tuple(df.columns),
+                dtypes=tuple(str(df[c].dtype) for c in df.columns),
+            ))
+            offset += n * len(df.columns) * _ITEMSIZE
+        self.descriptor = SharedBarsDescriptor(name=self._shm.name, symbols=tuple(entries))
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedBars":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _shareable(col: pd.Series) -> bool:
+    dtype = col.dtype
+    return isinstance(dtype, np.dtype) and dtype.itemsize == _ITEMSIZE and dtype.kind in "fiM"
+
+
+# worker 进程内已附加的共享块（保持引用，映射随进程存活）
+_attached: Optional[shared_memory.SharedMemory] = None
+
+
+def attach_bars(descriptor: Optional[SharedBarsDescriptor]) -> None:
+    """
+    worker initializer：附加共享块，把各标的的零拷贝只读 DataFrame 放入进程级 BarCache。
+    descriptor 为 None 时什么也不做（顺序执行或未共享）。
+    """
+    global _attached
+    if descriptor is None:
+        return
+    # worker 与父进程共用同一个 resource_tracker（fork / spawn 均继承），附加时的重复登记不会导致提前删除；
+    # 块由父进程 SharedBars.close() 释放
+    shm = shared_memory.SharedMemory(name=descriptor.name)
+    _attached = shm
+    cache = get_bar_cache()
+    for entry in descriptor.symbols:
+        data = {}
+        for k, (c, dtype) in enumerate(zip(entry.columns, entry.dtypes)):
+            view = np.ndarray(entry.rows, dtype=dtype, buffer=shm.buf, offset=entry.offset + k * entry.rows * _ITEMSIZE)
+            view.flags.writeable = False
+            data[c] = view
+        frame = pd.DataFrame(data, copy=False)
+        cache.put(entry.symbol, entry.stamp, frame, data["date"].astype("datetime64[D]"))
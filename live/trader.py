@@ -41,8 +41,9 @@ def run_once(symbol: str = "AAPL") -> None:
     bars = get_bars(symbol)
     if len(bars) >= 20:
         last = bars.iloc[-1]
-        buy_strategy.next(last, bars, 0)
-        sell_strategy.next(last, bars, 0)
+        # 对外边界：策略的轻量信号在此转为校验过的 Signal
+        buy_strategy.next(last, bars, 0).to_signal()
+        sell_strategy.next(last, bars, 0).to_signal()
         # 风控示例：单笔亏损不超过总资金 1% 等，此处省略
         # 若需下单可调用 ib_client.place_market_order(...)
     export_state()
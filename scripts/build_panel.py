@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+构建全市场面板：store/market_data/ 下全部（或指定）标的日 K 打包为内存映射的 (字段 × 日期 × 标的) 数组。
+
+    python scripts/build_panel.py [--symbols AAPL,NVDA]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.config import PANEL_DIR
+from data.panel import build_panel
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="构建全市场面板")
+    parser.add_argument("--symbols", default=None, help="逗号分隔的标的，缺省为全部 *_daily.csv")
+    args = parser.parse_args(argv)
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()] if args.symbols else None
+    t0 = time.perf_counter()
+    panel = build_panel(symbols)
+    if panel is None or not panel.symbols:
+        print("未找到标的：请确保 store/market_data/ 下存在 *_daily.csv 文件。")
+        return
+    nbytes = panel.values.size * panel.values.itemsize
+    print(
+        f"面板: {len(panel.symbols)} 只标的 × {len(panel.dates)} 个交易日 × {len(panel.fields)} 个字段 "
+        f"({panel.dates[0]} ~ {panel.dates[-1]}), {nbytes / 2 ** 20:.1f} MB, 耗时 {time.perf_counter() - t0:.2f}s -> {PANEL_DIR}"
+    )
+    listed = panel.mask.sum(axis=0)
+    print("  各标的有效交易日: " + ", ".join(f"{s} {n}" for s, n in zip(panel.symbols, listed)))
+
+
+if __name__ == "__main__":
+    main()
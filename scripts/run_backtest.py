@@ -2,28 +2,36 @@
 """
 运行回测并写入 store/backtest_results。
 从 config 读取买入/卖出策略列表：买入需全部命中，卖出任一命中即生效。
+
+    python scripts/run_backtest.py [--workers N] [--profile] [--no-cache]
+
+--workers N 按标的分发到 N 个进程并行回测，输出与结果文件与顺序执行一致。
+--profile 记录各阶段与各策略耗时、调用次数与命中率，逐标的打印，并保存为交割单旁的 *_profile.json。
+结果缓存（store/result_cache）：标的 CSV 与配置均未变化时直接复用上次的结果文件，只重跑数据或配置变化的标的；
+--no-cache 强制全部重跑（--profile 时也不使用缓存）。
 """
+import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
 from backtest.engine import BacktestEngine
-from core.backtest_config import get_backtest_config
+from backtest.profiling import RunProfile, merge_profiles
+from backtest.result_cache import ResultCache, result_key
+from core.backtest_config import BacktestConfig, get_backtest_config
 from core.config import BACKTEST_RESULTS_DIR
+from strategies.buy.base import BaseBuyStrategy
 from strategies.factory import create_buy_strategies, create_sell_strategies
+from strategies.sell.base import BaseSellStrategy
 
 
-def main() -> None:
-    cfg = get_backtest_config()
-    BACKTEST_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
-    for old in BACKTEST_RESULTS_DIR.glob("bt_*.csv"):
-        old.unlink(missing_ok=True)
-    if not cfg.symbols:
-        print("未找到标的：请确保 store/market_data/ 下存在 *_daily.csv 文件。")
-        return
-
+def _create_strategies(cfg: BacktestConfig) -> Tuple[List[BaseBuyStrategy], List[BaseSellStrategy]]:
+    """按配置由工厂创建买入/卖出策略（并行时每个 worker 各自重建，不 pickle 策略实例）。"""
     buy_list = create_buy_strategies(cfg.buy_strategies, rsi_period=cfg.rsi_period)
     sell_list = create_sell_strategies(
         cfg.sell_strategies,
@@ -32,6 +40,88 @@ def main() -> None:
         trailing_trigger_pct=cfg.trailing_trigger_pct,
         trailing_pullback_pct=cfg.trailing_pullback_pct,
     )
+    return buy_list, sell_list
+
+
+def run_symbol(
+    cfg: BacktestConfig,
+    symbol: str,
+    result_id: Optional[str] = None,
+    profile: bool = False,
+    use_cache: bool = True,
+) -> dict:
+    """
+    回测单只标的并保存交割单，返回摘要 dict（可跨进程传递）；profile 时附剖析结果 dict。
+    use_cache 时先查结果缓存，命中则复制缓存的结果文件、不再回测（cached 为 True）。
+    """
+    buy_list, sell_list = _create_strategies(cfg)
+    engine = BacktestEngine(
+        buy_strategies=buy_list,
+        sell_strategies=sell_list,
+        symbol=symbol,
+        initial_capital=cfg.initial_capital,
+        slippage_pct=cfg.slippage_pct,
+        commission_per_share=cfg.commission_per_share,
+        strategy_name=cfg.strategy_name,
+        profile=profile,
+    )
+    cache = ResultCache() if use_cache and not profile else None
+    key = result_key(engine, cfg.start_date, cfg.end_date) if cache is not None else None
+    if key is not None:
+        path = engine.result_path(result_id)
+        summary = cache.restore(key, path)
+        if summary is not None:
+            return {"symbol": symbol, **summary, "path": path.name, "profile": None, "cached": True}
+    result, path = engine.run_and_save(
+        start=cfg.start_date,
+        end=cfg.end_date,
+        result_id=result_id,
+    )
+    summary = result.summary()
+    if key is not None:
+        cache.put(key, summary, path)
+    return {
+        "symbol": symbol,
+        **summary,
+        "path": path.name,
+        "profile": result.profile.to_dict() if result.profile is not None else None,
+        "cached": False,
+    }
+
+
+def _run_symbol_task(args: Tuple[BacktestConfig, str, Optional[str], bool, bool]) -> dict:
+    return run_symbol(*args)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="运行回测并写入 store/backtest_results")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="并行进程数，按标的分发；1 为顺序执行（默认）",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="记录并打印各阶段与各策略的耗时、调用次数与信号命中率",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="不使用结果缓存，全部标的重新回测",
+    )
+    args = parser.parse_args(argv)
+
+    cfg = get_backtest_config()
+    BACKTEST_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    for old in [*BACKTEST_RESULTS_DIR.glob("bt_*.csv"), *BACKTEST_RESULTS_DIR.glob("bt_*_profile.json")]:
+        old.unlink(missing_ok=True)
+    if not cfg.symbols:
+        print("未找到标的：请确保 store/market_data/ 下存在 *_daily.csv 文件。")
+        return
+
+    buy_list, sell_list = _create_strategies(cfg)
     if not buy_list:
         print("未配置有效买入策略，请检查 backtest.buy_strategies。")
         return
@@ -46,49 +136,45 @@ def main() -> None:
 
     total_trades = 0
     results_summary = []
+    # 同一次运行的全部结果文件共用一个后缀，顺序与并行执行产出的文件名一致
+    result_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    tasks = [(cfg, symbol, result_id, args.profile, not args.no_cache) for symbol in cfg.symbols]
+    workers = max(1, min(args.workers, len(tasks)))
+
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # map 按提交顺序返回结果，输出顺序与顺序执行一致
+        summaries = executor.map(_run_symbol_task, tasks)
+    else:
+        executor = None
+        summaries = map(_run_symbol_task, tasks)
 
-    for symbol in cfg.symbols:
-        engine = BacktestEngine(
-            buy_strategies=buy_list,
-            sell_strategies=sell_list,
-            symbol=symbol,
-            initial_capital=cfg.initial_capital,
-            slippage_pct=cfg.slippage_pct,
-            commission_per_share=cfg.commission_per_share,
-            strategy_name=cfg.strategy_name,
-        )
-        result, path = engine.run_and_save(
-            start=cfg.start_date,
-            end=cfg.end_date,
-        )
-        sells = [t for t in result.trades if t.side == "卖出"]
-        win_sells = sum(1 for t in sells if t.pnl > 0)
-        total_sells = len(sells)
-        win_rate_pct = (win_sells / total_sells * 100.0) if total_sells else 0.0
-
-        total_trades += len(result.trades)
-        ann_holding = result.annualized_return_holding_pct
-        ann_str = f"{ann_holding:.2f}%" if ann_holding is not None else "N/A"
-        results_summary.append({
-            "symbol": symbol,
-            "trades": len(result.trades),
-            "win_rate_pct": win_rate_pct,
-            "return_pct": result.total_return_pct,
-            "max_dd_pct": result.max_drawdown_pct,
-            "sharpe": result.sharpe_ratio,
-            "holding_days": result.holding_days,
-            "annualized_holding_pct": ann_holding,
-            "final_capital": result.final_capital,
-            "path": path.name,
-        })
-        print(
-            f"  {symbol}: 成交 {len(result.trades)} 笔, 交易成功率 {win_rate_pct:.1f}% ({win_sells}/{total_sells}), "
-            f"收益 {result.total_return_pct:.2f}%, 最大回撤 {result.max_drawdown_pct:.2f}%, "
-            f"夏普 {result.sharpe_ratio:.2f}, 持仓天数 {result.holding_days}, 年化(按持仓) {ann_str}  -> {path.name}"
-        )
+    try:
+        for r in summaries:
+            total_trades += r["trades"]
+            ann_holding = r["annualized_holding_pct"]
+            ann_str = f"{ann_holding:.2f}%" if ann_holding is not None else "N/A"
+            results_summary.append(r)
+            print(
+                f"  {r['symbol']}: 成交 {r['trades']} 笔, 交易成功率 {r['win_rate_pct']:.1f}% ({r['win_sells']}/{r['total_sells']}), "
+                f"收益 {r['return_pct']:.2f}%, 最大回撤 {r['max_dd_pct']:.2f}%, "
+                f"夏普 {r['sharpe']:.2f}, 持仓天数 {r['holding_days']}, 年化(按持仓) {ann_str}  -> {r['path']}"
+                + ("  (缓存)" if r["cached"] else "")
+            )
+            if r["profile"] is not None:
+                print(RunProfile.from_dict(r["profile"]).format(indent="      "))
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     print("-" * 60)
-    print(f"回测完成. 共 {len(cfg.symbols)} 只标的, 总成交 {total_trades} 笔.")
+    if args.profile and len(results_summary) > 1:
+        total = merge_profiles(RunProfile.from_dict(r["profile"]) for r in results_summary)
+        print("剖析汇总（全部标的）:")
+        print(total.format(indent="  "))
+        print("-" * 60)
+    n_cached = sum(1 for r in results_summary if r["cached"])
+    print(f"回测完成. 共 {len(cfg.symbols)} 只标的（{n_cached} 只复用缓存）, 总成交 {total_trades} 笔.")
     for r in results_summary:
         ann = r.get("annualized_holding_pct")
         ann_s = f", 年化(按持仓) {ann:.2f}%" if ann is not None else ""
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+蒙特卡洛稳健性检验：对逐笔交易收益重抽样，打印期末收益、最大回撤、最长连亏的分布。
+
+    python scripts/run_monte_carlo.py --symbol NVDA [--paths 100000] [--method bootstrap|shuffle] [--seed 0]
+    python scripts/run_monte_carlo.py --trades store/backtest_results/bt_Default_NVDA_xxx.csv
+
+--symbol 按 config 的策略先回测该标的；--trades 直接读取已保存的交割单。
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backtest.engine import BacktestEngine
+from backtest.monte_carlo import METHODS, run_monte_carlo
+from core.backtest_config import get_backtest_config
+from scripts.run_backtest import _create_strategies
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="蒙特卡洛重抽样交易序列")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--symbol", help="按 config 策略回测该标的后取交割单")
+    source.add_argument("--trades", type=Path, help="已保存的交割单 CSV")
+    parser.add_argument("--paths", type=int, default=10_000, help="路径数，默认 10000")
+    parser.add_argument("--method", choices=METHODS, default="bootstrap", help="bootstrap 有放回抽样（默认）或 shuffle 打乱顺序")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子，固定后结果可复现")
+    args = parser.parse_args(argv)
+
+    if args.trades is not None:
+        trades = pd.read_csv(args.trades)
+        label = args.trades.name
+    else:
+        cfg = get_backtest_config()
+        buy_list, sell_list = _create_strategies(cfg)
+        engine = BacktestEngine(
+            buy_strategies=buy_list,
+            sell_strategies=sell_list,
+            symbol=args.symbol.upper(),
+            initial_capital=cfg.initial_capital,
+            slippage_pct=cfg.slippage_pct,
+            commission_per_share=cfg.commission_per_share,
+            strategy_name=cfg.strategy_name,
+        )
+        trades = engine.run(start=cfg.start_date, end=cfg.end_date).trades
+        label = args.symbol.upper()
+
+    t0 = time.perf_counter()
+    result = run_monte_carlo(trades, n_paths=args.paths, method=args.method, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+    if result.n_trades == 0:
+        print(f"{label}: 无已平仓交易，无法重抽样。")
+        return
+    print(f"{label}: {result.n_trades} 笔交易, {args.paths} 条路径 ({args.method}), 耗时 {elapsed:.2f}s")
+    with pd.option_context("display.width", 200, "display.float_format", "{:.2f}".format):
+        print(result.summary().to_string())
+
+
+if __name__ == "__main__":
+    main()
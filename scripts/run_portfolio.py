@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+组合回测：config 中的全部标的共用一个资金账户，按统一日期轴推进，打印绩效摘要。
+
+    python scripts/run_portfolio.py [--max-positions 5] [--allocation equal_weight|equal_cash] [--out trades.csv]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backtest.portfolio import ALLOCATIONS, PortfolioEngine
+from core.backtest_config import get_backtest_config
+from strategies.factory import create_buy_strategies, create_sell_strategies
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="组合回测（共享资金）")
+    parser.add_argument("--max-positions", type=int, default=5, help="最多同时持有的标的数，默认 5")
+    parser.add_argument("--allocation", choices=ALLOCATIONS, default="equal_weight", help="仓位分配方式，默认 equal_weight")
+    parser.add_argument("--out", type=Path, default=None, help="交割单 CSV 路径，缺省不保存")
+    args = parser.parse_args(argv)
+
+    cfg = get_backtest_config()
+    if not cfg.symbols:
+        print("未找到标的：请确保 store/market_data/ 下存在 *_daily.csv 文件。")
+        return
+    engine = PortfolioEngine(
+        buy_strategies=create_buy_strategies(cfg.buy_strategies, rsi_period=cfg.rsi_period),
+        sell_strategies=create_sell_strategies(
+            cfg.sell_strategies,
+            slow_period=cfg.slow_period,
+            stop_loss_pct=cfg.stop_loss_pct,
+            trailing_trigger_pct=cfg.trailing_trigger_pct,
+            trailing_pullback_pct=cfg.trailing_pullback_pct,
+        ),
+        symbols=cfg.symbols,
+        initial_capital=cfg.initial_capital,
+        slippage_pct=cfg.slippage_pct,
+        commission_per_share=cfg.commission_per_share,
+        max_positions=args.max_positions,
+        allocation=args.allocation,
+        strategy_name=cfg.strategy_name,
+    )
+    t0 = time.perf_counter()
+    signals = engine.prepare(cfg.start_date, cfg.end_date)
+    t1 = time.perf_counter()
+    result = engine.run_signals(signals)
+    t2 = time.perf_counter()
+
+    print(f"组合回测: {len(signals.symbols)} 只标的, {len(signals.dates)} 个交易日, 最多持仓 {args.max_positions}, 分配 {args.allocation}")
+    print(f"  信号预计算 {t1 - t0:.2f}s, 组合撮合 {t2 - t1:.2f}s")
+    print(
+        f"  成交 {len(result.trades)} 笔, 收益 {result.total_return_pct:.2f}%, 最大回撤 {result.max_drawdown_pct:.2f}%, "
+        f"夏普 {result.sharpe_ratio:.2f}, 期末资金 {result.final_capital:,.2f}"
+    )
+    if args.out is not None:
+        result.trades.to_csv(args.out, encoding="utf-8-sig")
+        print(f"  交割单 -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
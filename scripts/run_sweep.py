@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+参数扫描：按 config 的买入/卖出策略，对参数取值与标的做笛卡尔积回测，结果表写入 store/sweep_results。
+
+    python scripts/run_sweep.py --rsi-period 6,9,14 --stop-loss-pct 6,8,10 --workers 4
+    python scripts/run_sweep.py --symbols NVDA,AAPL --trailing-pullback-pct 3,5 --slow-period 20,30
+
+未给出的参数取 config 中的值；--symbols 缺省为配置的全部标的。
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backtest.sweep import run_sweep, value_list
+from core.backtest_config import get_backtest_config
+from core.config import SWEEP_RESULTS_DIR
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="参数扫描并写入 store/sweep_results")
+    parser.add_argument("--symbols", type=value_list(lambda v: v.strip().upper()), default=None, help="标的列表，逗号分隔")
+    parser.add_argument("--rsi-period", type=value_list(int), default=None, help="RSI 周期取值，如 6,9,14")
+    parser.add_argument("--stop-loss-pct", type=value_list(float), default=None, help="止损百分比取值，如 6,8,10")
+    parser.add_argument("--trailing-pullback-pct", type=value_list(float), default=None, help="移动止盈回撤百分比取值")
+    parser.add_argument("--slow-period", type=value_list(int), default=None, help="布林带周期取值")
+    parser.add_argument("--workers", type=int, default=1, help="并行进程数，按 (标的, rsi_period, 卖出参数分块) 分发；1 为顺序执行（默认）")
+    parser.add_argument("--out", type=Path, default=None, help="结果 CSV 路径，缺省写入 store/sweep_results/sweep_<时间>.csv")
+    args = parser.parse_args(argv)
+
+    cfg = get_backtest_config()
+    symbols = args.symbols or cfg.symbols
+    if not symbols:
+        print("未找到标的：请确保 store/market_data/ 下存在 *_daily.csv 文件。")
+        return
+    if not cfg.buy_strategies or not cfg.sell_strategies:
+        print("未配置买入/卖出策略，请检查 backtest.buy_strategies / backtest.sell_strategies。")
+        return
+
+    table = run_sweep(
+        cfg,
+        symbols=symbols,
+        rsi_period=args.rsi_period,
+        stop_loss_pct=args.stop_loss_pct,
+        trailing_pullback_pct=args.trailing_pullback_pct,
+        slow_period=args.slow_period,
+        workers=args.workers,
+    )
+    out = args.out
+    if out is None:
+        SWEEP_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        out = SWEEP_RESULTS_DIR / f"sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    table.to_csv(out, index=False, encoding="utf-8-sig")
+
+    print(f"参数扫描完成: {len(symbols)} 只标的, {len(table)} 个组合 -> {out}")
+    if not table.empty:
+        print("收益前 10 的组合:")
+        with pd.option_context("display.width", 200, "display.max_columns", 20, "display.float_format", "{:.2f}".format):
+            print(table.sort_values("return_pct", ascending=False).head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Walk-forward 优化：样本内扫描选参、样本外回测，拼接样本外资金曲线，结果写入 store/sweep_results。
+
+    python scripts/run_walk_forward.py --is-bars 504 --oos-bars 126 --rsi-period 6,9,14 --stop-loss-pct 6,8,10 --workers 4
+
+每只标的输出两份 CSV：wf_<标的>_<时间>_windows.csv（各窗口参数与绩效）、wf_<标的>_<时间>_equity.csv（拼接资金曲线）。
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backtest.sweep import value_list
+from backtest.walk_forward import METRICS, run_walk_forward
+from core.backtest_config import get_backtest_config
+from core.config import SWEEP_RESULTS_DIR
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Walk-forward 优化并写入 store/sweep_results")
+    parser.add_argument("--symbols", type=value_list(lambda v: v.strip().upper()), default=None, help="标的列表，逗号分隔")
+    parser.add_argument("--is-bars", type=int, default=504, help="样本内窗口长度（交易日），默认 504")
+    parser.add_argument("--oos-bars", type=int, default=126, help="样本外窗口长度（交易日），默认 126")
+    parser.add_argument("--step", type=int, default=None, help="滚动步长（交易日），默认等于 --oos-bars")
+    parser.add_argument("--metric", choices=METRICS, default="sharpe", help="样本内选参指标（BacktestResult.summary() 的键），默认 sharpe")
+    parser.add_argument("--rsi-period", type=value_list(int), default=None, help="RSI 周期取值，如 6,9,14")
+    parser.add_argument("--stop-loss-pct", type=value_list(float), default=None, help="止损百分比取值，如 6,8,10")
+    parser.add_argument("--trailing-pullback-pct", type=value_list(float), default=None, help="移动止盈回撤百分比取值")
+    parser.add_argument("--slow-period", type=value_list(int), default=None, help="布林带周期取值")
+    parser.add_argument("--workers", type=int, default=1, help="并行进程数，按窗口分发；1 为顺序执行（默认）")
+    args = parser.parse_args(argv)
+
+    cfg = get_backtest_config()
+    symbols = args.symbols or cfg.symbols
+    if not symbols:
+        print("未找到标的：请确保 store/market_data/ 下存在 *_daily.csv 文件。")
+        return
+    if not cfg.buy_strategies or not cfg.sell_strategies:
+        print("未配置买入/卖出策略，请检查 backtest.buy_strategies / backtest.sell_strategies。")
+        return
+
+    reports = run_walk_forward(
+        cfg,
+        symbols=symbols,
+        is_bars=args.is_bars,
+        oos_bars=args.oos_bars,
+        step=args.step,
+        metric=args.metric,
+        rsi_period=args.rsi_period,
+        stop_loss_pct=args.stop_loss_pct,
+        trailing_pullback_pct=args.trailing_pullback_pct,
+        slow_period=args.slow_period,
+        workers=args.workers,
+    )
+    SWEEP_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    print(f"Walk-forward: 样本内 {args.is_bars} 根, 样本外 {args.oos_bars} 根, 选参指标 {args.metric}")
+    print("-" * 60)
+    for symbol, rep in reports.items():
+        if not rep.windows:
+            print(f"  {symbol}: 数据不足一个窗口，跳过")
+            continue
+        windows_path = SWEEP_RESULTS_DIR / f"wf_{symbol}_{stamp}_windows.csv"
+        equity_path = SWEEP_RESULTS_DIR / f"wf_{symbol}_{stamp}_equity.csv"
+        table = rep.windows_frame()
+        table.to_csv(windows_path, index=False, encoding="utf-8-sig")
+        rep.equity_curve.to_csv(equity_path, index=False, encoding="utf-8-sig")
+        print(
+            f"  {symbol}: {len(rep.windows)} 个窗口, 样本外拼接收益 {rep.total_return_pct:.2f}%, "
+            f"最大回撤 {rep.max_drawdown_pct:.2f}%  -> {windows_path.name}, {equity_path.name}"
+        )
+        with pd.option_context("display.width", 200, "display.max_columns", 20, "display.float_format", "{:.2f}".format):
+            cols = ["oos_start", "oos_end", "rsi_period", "stop_loss_pct", "trailing_pullback_pct", "slow_period", "is_score", "oos_return_pct"]
+            print(table[cols].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
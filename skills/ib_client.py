@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional
 import pandas as pd
 
 from core.config import IB_ACCOUNT_ID, IB_CLIENT_ID, IB_HOST, IB_PORT
+from core.dates import to_days
 
 
 _ib = None  # 单例连接
@@ -76,7 +77,7 @@ def fetch_daily_bars(symbol: str, duration: str = "1 M", bar_size: str = "1 day"
         df = df.rename(columns={"date": "date"})
         if "Date" in df.columns and "date" not in df.columns:
             df = df.rename(columns={"Date": "date"})
-        df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
+        df["date"] = to_days(df["date"]).astype("datetime64[s]")
         return df[["date", "open", "high", "low", "close", "volume"]]
     except Exception:
         return None
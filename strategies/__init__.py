@@ -3,7 +3,7 @@
 - strategies/buy/  仅输出 BUY 或 HOLD
 - strategies/sell/ 仅输出 SELL 或 HOLD
 """
-from strategies.base import BaseStrategy
+from strategies.base import BaseStrategy, SignalBatch
 from strategies.buy import BaseBuyStrategy, BollTrendPullbackBuyStrategy, OversoldFactorsBuyStrategy
 from strategies.sell import BaseSellStrategy, BollUpperBreakSellStrategy, StopLossPctSellStrategy, TrailingTakeProfitSellStrategy
 
@@ -14,6 +14,7 @@ __all__ = [
     "BollTrendPullbackBuyStrategy",
     "BollUpperBreakSellStrategy",
     "OversoldFactorsBuyStrategy",
+    "SignalBatch",
     "StopLossPctSellStrategy",
     "TrailingTakeProfitSellStrategy",
 ]
@@ -2,15 +2,62 @@
 策略基类：只接收数据，只输出信号，不直接下单。
 """
 from abc import ABC, abstractmethod
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from core.types import Signal
+from core.types import FastSignal
+from strategies.context import BarContext
+from strategies.indicators import IndicatorCache
+
+
+@dataclass
+class SignalBatch:
+    """
+    整段批量信号：compute_signals 的返回值，各数组长度与 df 相同，下标即 bar 序号。
+    - action: bool，该 bar 是否触发（买入策略为 BUY，卖出策略为 SELL）
+    - price: float64，触发时的报价，NaN 表示无（按收盘价成交）
+    - reason_code: int16，原因在 reasons 中的下标
+    - inputs: 路径相关的卖出策略在引擎持仓循环中求值所需的逐 bar 输入（如 low）
+    - strength: float64，信号强度（同 Signal.strength），None 表示触发处为 1
+    组合回测中各数组为 (日期 × 标的) 二维，首维仍为 bar 序号。
+    """
+    action: np.ndarray
+    price: np.ndarray
+    reason_code: np.ndarray
+    reasons: Tuple[str, ...]
+    inputs: Dict[str, np.ndarray] = field(default_factory=dict)
+    strength: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_mask(cls, mask, reason: str, hold_reason: str = "") -> "SignalBatch":
+        """由布尔序列构造：触发处原因为 reason，其余为 hold_reason，无报价。"""
+        action = np.asarray(mask, dtype=bool)
+        return cls(
+            action=action,
+            price=np.full(len(action), np.nan),
+            reason_code=action.astype(np.int16),
+            reasons=(hold_reason, reason),
+        )
+
+    def reason(self, i) -> str:
+        return self.reasons[self.reason_code[i]]
+
+    def strengths(self) -> np.ndarray:
+        """逐 bar 信号强度，未触发处为 0。"""
+        if self.strength is None:
+            return self.action.astype(float)
+        return np.where(self.action, self.strength, 0.0)
 
 
 class BaseStrategy(ABC):
-    """策略抽象基类。输入：当前 K 线、历史 DataFrame、当前持仓；输出：Signal。"""
+    """
+    策略抽象基类。输入：当前 K 线、历史 DataFrame、当前持仓；输出：FastSignal（对外经 to_signal() 转为 Signal）。
+    回测引擎以 BarContext 作为 current_bar 传入（history_df 为 None）；旧式 (Series, DataFrame) 调用仍然支持，
+    策略统一用 self._context() 取得 BarContext。
+    """
 
     name: str = "BaseStrategy"
 
@@ -21,9 +68,39 @@ class BaseStrategy(ABC):
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
+    ) -> FastSignal:
         """
         根据当前 bar、历史数据、当前持仓量计算并返回信号。
         - current_position > 0 表示多头持仓数量，< 0 表示空头（若支持）。
+        - current_bar 可为 BarContext（此时 history_df 可为 None）；旧式调用时 history_df 含当日 K 线。
+        - kwargs 可含 indicator_cache：与 history_df 下标对齐的整段 IndicatorCache。
+        - 返回 FastSignal（HOLD 用 FastSignal.hold 共享实例），也可返回 Signal；引擎只读 action/strength/reason/price。
         """
         ...
+
+    def compute_signals(
+        self,
+        df: pd.DataFrame,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ) -> Optional[SignalBatch]:
+        """
+        可选的批量接口：用 NumPy/pandas 列运算一次算出整段逐 bar 信号，结果须与逐 bar next() 一致。
+        返回 None 表示未实现，回测引擎回退到逐 bar 调用 next()。
+        """
+        return None
+
+    def cache_key(self) -> tuple:
+        """(策略名, 参数) 标识：同类同参的实例信号相同，批量信号可按此键在多次运行间共享。"""
+        return (self.name, type(self).__name__, tuple(sorted(vars(self).items())))
+
+    @staticmethod
+    def _context(current_bar: Any, history_df: Optional[pd.DataFrame], kwargs: dict) -> Optional[BarContext]:
+        """
+        统一输入：current_bar 已是 BarContext 则直接用；否则由 history_df 构建（其末行即当前 bar）。
+        无历史数据时返回 None。
+        """
+        if isinstance(current_bar, BarContext):
+            return current_bar
+        if history_df is None:
+            return None
+        return BarContext.from_frame(history_df, indicators=kwargs.get("indicator_cache"))
@@ -2,12 +2,15 @@
 买入策略基类：只输出 BUY 或 HOLD，不输出 SELL。
 """
 from abc import abstractmethod
-from typing import Any
+from typing import Any, Optional
 
+import numpy as np
 import pandas as pd
 
-from core.types import Signal, SignalAction
-from strategies.base import BaseStrategy
+from core.types import FastSignal, SignalAction
+from strategies.base import BaseStrategy, SignalBatch
+from strategies.context import BarContext
+from strategies.indicators import IndicatorCache
 
 
 class BaseBuyStrategy(BaseStrategy):
@@ -20,9 +23,47 @@ class BaseBuyStrategy(BaseStrategy):
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
+    ) -> FastSignal:
         """返回 BUY 或 HOLD，不应返回 SELL。"""
         ...
 
-    def _hold(self, reason: str = "hold") -> Signal:
-        return Signal(action=SignalAction.HOLD, strength=0.0, reason=reason)
+    def _hold(self, reason: str = "hold") -> FastSignal:
+        return FastSignal.hold(reason)
+
+    def precompute_signals(
+        self,
+        df: pd.DataFrame,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ) -> SignalBatch:
+        """
+        整段买入信号：优先 compute_signals；未实现时以空仓视角逐 bar 调用 next() 汇总。
+        买入策略只看行情不看持仓，结果可在卖出参数不同的多次回测间复用。
+        """
+        if indicator_cache is None:
+            indicator_cache = IndicatorCache(df)
+        batch = self.compute_signals(df, indicator_cache=indicator_cache)
+        if batch is not None:
+            return batch
+        n = len(df)
+        ctx = BarContext.from_frame(df, indicator_cache)
+        action = np.zeros(n, dtype=bool)
+        price = np.full(n, np.nan)
+        reason_code = np.zeros(n, dtype=np.int16)
+        strength = np.zeros(n)
+        reasons = {"": 0}
+        for i in range(n):
+            sig = self.next(current_bar=ctx.seek(i), history_df=None, current_position=0)
+            if sig.action != SignalAction.BUY:
+                continue
+            action[i] = True
+            strength[i] = sig.strength
+            if sig.price is not None:
+                price[i] = sig.price
+            reason_code[i] = reasons.setdefault(sig.reason, len(reasons))
+        return SignalBatch(
+            action=action,
+            price=price,
+            reason_code=reason_code,
+            reasons=tuple(reasons),
+            strength=strength,
+        )
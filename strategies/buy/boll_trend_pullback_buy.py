@@ -8,9 +8,14 @@ from typing import Any
 
 import pandas as pd
 
-from core.types import Signal, SignalAction
+from core.types import FastSignal, SignalAction
 from strategies.buy.base import BaseBuyStrategy
-from strategies.indicators import adx, bollinger_bands
+from strategies.indicators import IndicatorCache
+
+
+def _window(series: pd.Series, i: int, n: int) -> pd.Series:
+    """截至下标 i（含）的最近 n 个值，等价于 series.iloc[: i + 1].iloc[-n:]。"""
+    return series.iloc[max(0, i - n + 1) : i + 1]
 
 
 class BollTrendPullbackBuyStrategy(BaseBuyStrategy):
@@ -56,60 +61,68 @@ class BollTrendPullbackBuyStrategy(BaseBuyStrategy):
         self.pullback_near_midpoint_tol = pullback_near_midpoint_tol
         self.slope_lookback = slope_lookback
 
+    def _bandwidth(self, ind: IndicatorCache) -> pd.Series:
+        """布林带宽（上轨 - 下轨），按参数缓存在 IndicatorCache 中。"""
+        def compute() -> pd.Series:
+            _, upper, lower = ind.bollinger(self.boll_period, self.num_std)
+            return upper - lower
+
+        return ind.memo(("boll_bandwidth", self.boll_period, self.num_std), compute)
+
     def next(
         self,
         current_bar: pd.Series,
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
+    ) -> FastSignal:
         need = max(
             self.boll_period + self.slope_lookback,
             self.band_extreme_lookback,
             self.adx_period + 5,
         ) + 5
-        if history_df is None or len(history_df) < need:
+        ctx = self._context(current_bar, history_df, kwargs)
+        if ctx is None:
             return self._hold("数据不足")
-
-        close_series = history_df["close"].astype(float)
-        high_series = history_df["high"].astype(float)
-        low_series = history_df["low"].astype(float)
-        middle, upper, lower = bollinger_bands(
-            close_series, self.boll_period, self.num_std
-        )
+        # 按整段序列计数与回看：walk-forward 窗口开头的斜率、分位数窗口取窗口之前的数据
+        ind, i = ctx.origin()
+        if i + 1 < need:
+            return self._hold("数据不足")
+        close_series = ind.column("close")
+        middle, upper, lower = ind.bollinger(self.boll_period, self.num_std)
         ma20 = middle
-        ma5 = close_series.rolling(5, min_periods=5).mean()
-        ma10 = close_series.rolling(10, min_periods=10).mean()
+        ma5 = ind.sma(5)
+        ma10 = ind.sma(10)
 
-        bandwidth = upper - lower
-        adx_series, _, _ = adx(high_series, low_series, close_series, self.adx_period)
+        bandwidth = self._bandwidth(ind)
+        adx_series, _, _ = ind.adx(self.adx_period)
 
-        close = float(close_series.iloc[-1])
-        current_low = float(current_bar.get("low", close))
-        up = float(upper.iloc[-1])
-        mid = float(middle.iloc[-1])
-        ma5_val = float(ma5.iloc[-1]) if not pd.isna(ma5.iloc[-1]) else None
-        ma10_val = float(ma10.iloc[-1]) if not pd.isna(ma10.iloc[-1]) else None
+        close = ctx.close
+        current_low = float(ctx.get("low", close))
+        up = float(upper.iloc[i])
+        mid = float(middle.iloc[i])
+        ma5_val = float(ma5.iloc[i]) if not pd.isna(ma5.iloc[i]) else None
+        ma10_val = float(ma10.iloc[i]) if not pd.isna(ma10.iloc[i]) else None
 
         # 当前带宽、斜率
-        bw_now = float(bandwidth.iloc[-1])
-        up_now = float(upper.iloc[-1])
-        up_old = float(upper.iloc[-1 - self.slope_lookback])
-        low_now = float(lower.iloc[-1])
-        low_old = float(lower.iloc[-1 - self.slope_lookback])
-        ma20_now = float(ma20.iloc[-1])
-        ma20_old = float(ma20.iloc[-1 - 5])
-        adx_now = float(adx_series.iloc[-1]) if not pd.isna(adx_series.iloc[-1]) else 0.0
+        bw_now = float(bandwidth.iloc[i])
+        up_now = float(upper.iloc[i])
+        up_old = float(upper.iloc[i - self.slope_lookback])
+        low_now = float(lower.iloc[i])
+        low_old = float(lower.iloc[i - self.slope_lookback])
+        ma20_now = float(ma20.iloc[i])
+        ma20_old = float(ma20.iloc[i - 5])
+        adx_now = float(adx_series.iloc[i]) if not pd.isna(adx_series.iloc[i]) else 0.0
         adx_old = (
-            float(adx_series.iloc[-1 - self.slope_lookback])
-            if len(adx_series) > self.slope_lookback
+            float(adx_series.iloc[i - self.slope_lookback])
+            if i + 1 > self.slope_lookback
             else 0.0
         )
 
         # ---------- 买点1：突破进场（挤压后开口 + 站稳上轨） ----------
         # 近期是否出现过挤压：过去 N 天内带宽曾处于过去 20 天的下 25%
-        bw_last_20 = bandwidth.iloc[-self.squeeze_lookback :]
-        bw_last_10 = bandwidth.iloc[-self.breakout_squeeze_days :]
+        bw_last_20 = _window(bandwidth, i, self.squeeze_lookback)
+        bw_last_10 = _window(bandwidth, i, self.breakout_squeeze_days)
         if len(bw_last_20) >= self.squeeze_lookback and len(bw_last_10) >= 1:
             p25 = float(bw_last_20.quantile(self.squeeze_quantile))
             squeeze_occurred = float(bw_last_10.min()) <= p25
@@ -117,7 +130,7 @@ class BollTrendPullbackBuyStrategy(BaseBuyStrategy):
             squeeze_occurred = False
 
         # 带宽未处于历史极值（不追高）
-        bw_roll = bandwidth.iloc[-self.band_extreme_lookback :]
+        bw_roll = _window(bandwidth, i, self.band_extreme_lookback)
         if len(bw_roll) >= self.band_extreme_lookback:
             p95 = float(bw_roll.quantile(self.band_extreme_quantile))
             band_not_extreme = bw_now <= p95
@@ -134,7 +147,7 @@ class BollTrendPullbackBuyStrategy(BaseBuyStrategy):
             and adx_now >= self.adx_min
             and adx_now > adx_old
         ):
-            return Signal(
+            return FastSignal(
                 action=SignalAction.BUY,
                 strength=1.0,
                 reason="布林趋势突破(挤压后开口+站稳上轨+ADX确认)",
@@ -145,9 +158,9 @@ class BollTrendPullbackBuyStrategy(BaseBuyStrategy):
             return self._hold("均线未就绪")
 
         # 趋势状态：近 N 日收盘多在 MA10 之上，或曾站上过上轨
-        closes_last = close_series.iloc[-self.trend_days :]
-        ma10_last = ma10.iloc[-self.trend_days :]
-        upper_last = upper.iloc[-self.trend_days :]
+        closes_last = _window(close_series, i, self.trend_days)
+        ma10_last = _window(ma10, i, self.trend_days)
+        upper_last = _window(upper, i, self.trend_days)
         above_ma10_count = (closes_last.values > ma10_last.values).sum()
         ever_above_upper = (closes_last.values >= upper_last.values).any()
         trend_ok = (
@@ -175,7 +188,7 @@ class BollTrendPullbackBuyStrategy(BaseBuyStrategy):
         )
 
         if near_ma5 or near_midpoint:
-            return Signal(
+            return FastSignal(
                 action=SignalAction.BUY,
                 strength=1.0,
                 reason="布林趋势回踩(MA5或上中轨1/2+不破MA10)",
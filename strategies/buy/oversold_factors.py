@@ -1,13 +1,19 @@
 """
 超跌买入策略：收盘价小于 MA5/MA10/MA20，且 RSI<20，且 MACD 为绿柱时买入。
 """
-from typing import Any
+from typing import Any, Optional
 
+import numpy as np
 import pandas as pd
 
-from core.types import Signal, SignalAction
+from core.types import FastSignal, SignalAction
+from strategies.base import SignalBatch
 from strategies.buy.base import BaseBuyStrategy
-from strategies.indicators import macd, rsi_wilder
+from strategies.indicators import IndicatorCache
+
+# MACD(12,26,9) 需要约 35 根，MA20 需 20 根，RSI(6) 需 7 根
+_MIN_BARS = 36
+_BUY_REASON = "超跌买入(价<MA5/10/20 RSI<20 MACD绿柱)"
 
 
 class OversoldFactorsBuyStrategy(BaseBuyStrategy):
@@ -29,42 +35,58 @@ class OversoldFactorsBuyStrategy(BaseBuyStrategy):
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
-        # MACD(12,26,9) 需要约 35 根，MA20 需 20 根，RSI(6) 需 7 根
-        min_bars = 36
-        if history_df is None or len(history_df) < min_bars:
+    ) -> FastSignal:
+        ctx = self._context(current_bar, history_df, kwargs)
+        if ctx is None:
+            return self._hold("数据不足")
+        # 按整段序列计数与取值：walk-forward 窗口开头由窗口之前的数据预热
+        ind, i = ctx.origin()
+        if i + 1 < _MIN_BARS:
             return self._hold("数据不足")
 
-        close = history_df["close"].astype(float)
-        price = float(close.iloc[-1])
+        price = ctx.close
 
-        ma5 = close.rolling(5, min_periods=5).mean()
-        ma10 = close.rolling(10, min_periods=10).mean()
-        ma20 = close.rolling(20, min_periods=20).mean()
-        ma5_val = ma5.iloc[-1]
-        ma10_val = ma10.iloc[-1]
-        ma20_val = ma20.iloc[-1]
+        ma5_val = ind.sma(5).iloc[i]
+        ma10_val = ind.sma(10).iloc[i]
+        ma20_val = ind.sma(20).iloc[i]
 
         if pd.isna(ma5_val) or pd.isna(ma10_val) or pd.isna(ma20_val):
             return self._hold("均线未就绪")
         if not (price < ma5_val and price < ma10_val and price < ma20_val):
             return self._hold("收盘价未同时小于MA5/MA10/MA20")
 
-        rsi_series = rsi_wilder(close, self.rsi_period)
-        rsi_val = rsi_series.iloc[-1]
+        rsi_val = ind.rsi(self.rsi_period).iloc[i]
         if pd.isna(rsi_val) or float(rsi_val) >= 20:
             return self._hold("RSI不小于20")
 
-        _, _, hist_series = macd(close, 12, 26, 9)
+        _, _, hist_series = ind.macd(12, 26, 9)
         if len(hist_series) < 1:
             return self._hold("MACD未就绪")
-        hist = float(hist_series.iloc[-1])
+        hist = float(hist_series.iloc[i])
         if pd.isna(hist):
             return self._hold("MACD未就绪")
         if hist >= 0:
             return self._hold("MACD非绿柱不买")
 
-        reason = (
-            f"超跌买入(价<MA5/10/20 RSI<20 MACD绿柱)"
-        )
-        return Signal(action=SignalAction.BUY, strength=1.0, reason=reason)
+        return FastSignal(action=SignalAction.BUY, strength=1.0, reason=_BUY_REASON)
+
+    def compute_signals(
+        self,
+        df: pd.DataFrame,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ) -> SignalBatch:
+        """整段批量版 next()：各条件按列比较，NaN 比较为 False 即等价于“未就绪”。"""
+        ind = indicator_cache if indicator_cache is not None else IndicatorCache(df)
+        price = ind.column("close")
+        _, _, hist = ind.macd(12, 26, 9)
+        fire = (
+            (price < ind.sma(5))
+            & (price < ind.sma(10))
+            & (price < ind.sma(20))
+            & (ind.rsi(self.rsi_period) < 20)
+            & (hist < 0)
+        ).to_numpy()
+        # 第 i 根 bar 的 history 长度为 i + 1，按整段序列计（窗口视图加上窗口起点）
+        _, offset, _ = ind.origin()
+        fire = fire & (np.arange(offset + 1, offset + len(fire) + 1) >= _MIN_BARS)
+        return SignalBatch.from_mask(fire, _BUY_REASON)
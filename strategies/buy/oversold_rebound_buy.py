@@ -1,13 +1,17 @@
 """
 超卖反弹买入策略：RSI 超卖拐头 + MACD 绿柱缩短 + DIF 转折向上。
 """
-from typing import Any
+from typing import Any, Optional
 
+import numpy as np
 import pandas as pd
 
-from core.types import Signal, SignalAction
+from core.types import FastSignal, SignalAction
+from strategies.base import SignalBatch
 from strategies.buy.base import BaseBuyStrategy
-from strategies.indicators import macd, rsi_wilder
+from strategies.indicators import IndicatorCache
+
+_BUY_REASON = "超卖反弹买入(RSI超卖拐头+MACD绿柱缩短+DIF向上转折)"
 
 
 class OversoldReboundBuyStrategy(BaseBuyStrategy):
@@ -34,55 +38,81 @@ class OversoldReboundBuyStrategy(BaseBuyStrategy):
         self.macd_slow = macd_slow
         self.macd_signal = macd_signal
 
+    def _min_bars(self) -> int:
+        return max(self.rsi_period + 2, self.macd_slow + self.macd_signal + 5)
+
     def next(
         self,
         current_bar: pd.Series,
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
-        _ = current_bar, current_position, kwargs
-        min_bars = max(self.rsi_period + 2, self.macd_slow + self.macd_signal + 5)
-        if history_df is None or len(history_df) < min_bars:
+    ) -> FastSignal:
+        _ = current_position
+        ctx = self._context(current_bar, history_df, kwargs)
+        if ctx is None:
+            return self._hold("数据不足")
+        # 按整段序列计数与回看：walk-forward 窗口开头的 t-1、t-2 取窗口之前的数据
+        ind, i = ctx.origin()
+        if i + 1 < self._min_bars():
             return self._hold("数据不足")
-
-        close = history_df["close"].astype(float)
 
         # 1) RSI 超卖 + 拐头
-        rsi_series = rsi_wilder(close, self.rsi_period)
-        if len(rsi_series) < 2:
+        rsi_series = ind.rsi(self.rsi_period)
+        if i < 1:
             return self._hold("RSI未就绪")
 
-        rsi_t = rsi_series.iloc[-1]
-        rsi_prev = rsi_series.iloc[-2]
+        rsi_t = rsi_series.iloc[i]
+        rsi_prev = rsi_series.iloc[i - 1]
         if pd.isna(rsi_t) or pd.isna(rsi_prev):
             return self._hold("RSI未就绪")
         if not (float(rsi_t) < self.rsi_oversold_threshold and float(rsi_t) > float(rsi_prev)):
             return self._hold("RSI未满足超卖拐头")
 
         # 2) MACD 绿柱缩短
-        dif_series, _, hist_series = macd(close, self.macd_fast, self.macd_slow, self.macd_signal)
-        if len(hist_series) < 2 or len(dif_series) < 3:
+        dif_series, _, hist_series = ind.macd(self.macd_fast, self.macd_slow, self.macd_signal)
+        if i < 2:
             return self._hold("MACD未就绪")
 
-        hist_t = hist_series.iloc[-1]
-        hist_prev = hist_series.iloc[-2]
+        hist_t = hist_series.iloc[i]
+        hist_prev = hist_series.iloc[i - 1]
         if pd.isna(hist_t) or pd.isna(hist_prev):
             return self._hold("MACD未就绪")
         if not (float(hist_t) < 0 and float(hist_t) > float(hist_prev)):
             return self._hold("MACD绿柱未缩短")
 
         # 3) DIF 向上转折（Hook）
-        dif_t = dif_series.iloc[-1]
-        dif_prev = dif_series.iloc[-2]
-        dif_prev2 = dif_series.iloc[-3]
+        dif_t = dif_series.iloc[i]
+        dif_prev = dif_series.iloc[i - 1]
+        dif_prev2 = dif_series.iloc[i - 2]
         if pd.isna(dif_t) or pd.isna(dif_prev) or pd.isna(dif_prev2):
             return self._hold("DIF未就绪")
         if not (float(dif_t) > float(dif_prev) and float(dif_prev) <= float(dif_prev2)):
             return self._hold("DIF未形成向上转折")
 
-        return Signal(
-            action=SignalAction.BUY,
-            strength=1.0,
-            reason="超卖反弹买入(RSI超卖拐头+MACD绿柱缩短+DIF向上转折)",
-        )
+        return FastSignal(action=SignalAction.BUY, strength=1.0, reason=_BUY_REASON)
+
+    def compute_signals(
+        self,
+        df: pd.DataFrame,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ) -> SignalBatch:
+        """
+        整段批量版 next()：t-1、t-2 用 shift 对齐，NaN 比较为 False 即等价于“未就绪”。
+        窗口视图在根序列上计算后取窗口区间，窗口开头的 shift 与预热计数沿用窗口之前的数据。
+        """
+        ind = indicator_cache if indicator_cache is not None else IndicatorCache(df)
+        ind, start, stop = ind.origin()
+        rsi = ind.rsi(self.rsi_period)
+        dif, _, hist = ind.macd(self.macd_fast, self.macd_slow, self.macd_signal)
+        dif_prev = dif.shift(1)
+        fire = (
+            (rsi < self.rsi_oversold_threshold)
+            & (rsi > rsi.shift(1))
+            & (hist < 0)
+            & (hist > hist.shift(1))
+            & (dif > dif_prev)
+            & (dif_prev <= dif.shift(2))
+        ).to_numpy()[start:stop]
+        fire = fire & (np.arange(start + 1, stop + 1) >= self._min_bars())
+        return SignalBatch.from_mask(fire, _BUY_REASON)
@@ -0,0 +1,112 @@
+"""
+K 线上下文：回测引擎逐 bar 传给策略的只读视图，底层为整段连续 float64 数组。
+当前 bar 字段为标量，历史窗口为数组切片视图（不复制）；引擎每根 bar 只移动游标，
+不再新建 df.iloc[i] 的 Series 与 df.iloc[: i + 1] 的 DataFrame。
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.dates import to_days
+from strategies.indicators import IndicatorCache
+
+
+class BarContext:
+    """
+    只读 K 线视图：len(ctx) 为截至当前 bar（含）的根数，ctx.index 为当前下标。
+    - ctx.close / ctx.get("low", default) / ctx["high"]：当前 bar 字段（同 Series 用法）
+    - ctx.history("close", n)：最近 n 根（含当前）的数组视图，n 省略为全部历史
+    - ctx.indicators：与数组下标对齐的整段 IndicatorCache
+    - ctx.origin()：(根 IndicatorCache, 当前 bar 在根序列上的下标)，窗口视图上回看与预热按整段序列计
+    """
+
+    __slots__ = ("indicators", "_dates", "_arrays", "_index")
+
+    def __init__(self, indicators: IndicatorCache, dates: np.ndarray, index: int = -1) -> None:
+        self.indicators = indicators
+        self._dates = dates
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._index = index if index >= 0 else len(dates) - 1
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, indicators: Optional[IndicatorCache] = None) -> "BarContext":
+        """由整段 DataFrame 构建，游标指向末行（旧式调用中 history_df 的末行即当前 bar）。"""
+        if indicators is None:
+            indicators = IndicatorCache(df)
+        dates = to_days(df["date"]) if "date" in df.columns else np.full(len(df), np.datetime64("NaT"), dtype="datetime64[D]")
+        return cls(indicators, dates)
+
+    def seek(self, i: int) -> "BarContext":
+        """移动游标到第 i 根 bar（供引擎逐 bar 推进），返回自身。"""
+        self._index = i
+        return self
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def __len__(self) -> int:
+        return self._index + 1
+
+    def origin(self) -> Tuple[IndicatorCache, int]:
+        """
+        (整段根指标缓存, 当前 bar 在根序列上的下标)。indicators 为 IndicatorCache.window 视图（walk-forward 窗口）时，
+        窗口开头之前的数据仍可用于预热与回看；非窗口视图即 (indicators, index)。
+        """
+        root, offset, _ = self.indicators.origin()
+        return root, offset + self._index
+
+    def _array(self, name: str) -> np.ndarray:
+        arr = self._arrays.get(name)
+        if arr is None:
+            arr = self.indicators.column(name).to_numpy().view()
+            arr.flags.writeable = False
+            self._arrays[name] = arr
+        return arr
+
+    def has(self, name: str) -> bool:
+        return name in self._arrays or name in self.indicators.columns
+
+    def history(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """截至当前 bar（含）最近 n 根的数组视图；n 为 None 时返回全部历史。"""
+        end = self._index + 1
+        start = 0 if n is None else max(0, end - n)
+        return self._array(name)[start:end]
+
+    def get(self, name: str, default=None):
+        """当前 bar 字段，列不存在时返回 default（同 pd.Series.get）。"""
+        if name == "date":
+            return self._dates[self._index]
+        if not self.has(name):
+            return default
+        return float(self._array(name)[self._index])
+
+    def __getitem__(self, name: str):
+        if name != "date" and not self.has(name):
+            raise KeyError(name)
+        return self.get(name)
+
+    @property
+    def date(self) -> np.datetime64:
+        return self._dates[self._index]
+
+    @property
+    def open(self) -> float:
+        return self.get("open")
+
+    @property
+    def high(self) -> float:
+        return self.get("high")
+
+    @property
+    def low(self) -> float:
+        return self.get("low")
+
+    @property
+    def close(self) -> float:
+        return self.get("close")
+
+    @property
+    def volume(self) -> float:
+        return self.get("volume")
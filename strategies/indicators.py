@@ -1,28 +1,50 @@
 """
-技术指标：RSI、布林带、MACD 等，供策略使用。
+技术指标：RSI、布林带、MACD 等，供策略使用；IndicatorCache 供回测整段预计算，Streaming* 供逐 bar 增量更新。
 """
+import math
+from collections import deque
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
 
-def rsi_wilder(close: pd.Series, period: int = 14) -> pd.Series:
-    """Wilder 平滑 RSI(period)，与东财等主流软件一致。首期用 period 内涨跌的简单平均，之后用 Wilder 递推。"""
-    delta = close.diff()
-    gain = delta.where(delta > 0, 0.0)
-    loss = (-delta).where(delta < 0, 0.0)
-    out = pd.Series(index=close.index, dtype=float)
-    if len(close) < period + 1:
+def rsi_wilder_np(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    rsi_wilder 的 NumPy 内核：涨跌拆分为数组运算，Wilder 递推在 Python float 上做紧凑循环，
+    不经 pandas 逐元素索引；运算顺序与原实现相同，结果逐位一致。
+    """
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n < period + 1:
         return out
-    avg_g = gain.iloc[1 : period + 1].mean()
-    avg_l = loss.iloc[1 : period + 1].mean()
-    for i in range(period, len(close)):
+    delta = np.empty(n)
+    delta[0] = np.nan
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    avg_g = float(gain[1 : period + 1].mean())
+    avg_l = float(loss[1 : period + 1].mean())
+    gains = gain.tolist()
+    losses = loss.tolist()
+    values = []
+    append = values.append
+    for i in range(period, n):
         if i > period:
-            avg_g = (avg_g * (period - 1) + gain.iloc[i]) / period
-            avg_l = (avg_l * (period - 1) + loss.iloc[i]) / period
+            avg_g = (avg_g * (period - 1) + gains[i]) / period
+            avg_l = (avg_l * (period - 1) + losses[i]) / period
         rs = avg_g / (avg_l + 1e-10)
-        out.iloc[i] = 100 - (100 / (1 + rs))
+        append(100 - (100 / (1 + rs)))
+    out[period:] = values
     return out
 
 
+def rsi_wilder(close: pd.Series, period: int = 14) -> pd.Series:
+    """Wilder 平滑 RSI(period)，与东财等主流软件一致。首期用 period 内涨跌的简单平均，之后用 Wilder 递推。"""
+    return pd.Series(rsi_wilder_np(close.to_numpy(dtype=float), period), index=close.index)
+
+
 def bollinger_bands(close: pd.Series, period: int = 20, num_std: float = 2.0) -> tuple:
     """布林带：返回 (middle, upper, lower)，均为 Series。"""
     middle = close.rolling(period, min_periods=period).mean()
@@ -42,17 +64,28 @@ def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> t
     return dif, dea, hist
 
 
-def _wilder_smooth(series: pd.Series, period: int) -> pd.Series:
-    """Wilder 平滑：首值为 period 内和，之后递推 S = S_prev*(period-1)/period + value."""
-    out = pd.Series(index=series.index, dtype=float)
-    if len(series) < period:
+def wilder_smooth_np(values: np.ndarray, period: int) -> np.ndarray:
+    """_wilder_smooth 的 NumPy 内核：首值为前 period 个值之和（NaN 按 0 计，同 pandas sum），之后紧凑循环递推。"""
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < period:
         return out
-    out.iloc[period - 1] = series.iloc[:period].sum()
-    for i in range(period, len(series)):
-        out.iloc[i] = out.iloc[i - 1] * (period - 1) / period + series.iloc[i]
+    s = float(np.where(np.isnan(values[:period]), 0.0, values[:period]).sum())
+    smoothed = [s]
+    append = smoothed.append
+    for x in values[period:].tolist():
+        s = s * (period - 1) / period + x
+        append(s)
+    out[period - 1 :] = smoothed
     return out
 
 
+def _wilder_smooth(series: pd.Series, period: int) -> pd.Series:
+    """Wilder 平滑：首值为 period 内和，之后递推 S = S_prev*(period-1)/period + value."""
+    return pd.Series(wilder_smooth_np(series.to_numpy(dtype=float), period), index=series.index)
+
+
 def adx(
     high: pd.Series,
     low: pd.Series,
@@ -94,3 +127,282 @@ def adx(
     dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di + 1e-10)
     adx_series = _wilder_smooth(dx, period)
     return adx_series, plus_di, minus_di
+
+
+class IndicatorCache:
+    """
+    整段序列指标缓存：每个 (指标, 参数) 在整段 K 线上只计算一次，策略按 bar 下标取值。
+    所用指标均只依赖当前及之前的数据（滚动/递推），故整段计算后第 i 个值与
+    在 df.iloc[: i + 1] 上重算的末值完全一致。回测引擎每次 run 构建一个并传给策略。
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+        self._store: dict = {}
+        self._parent: Optional["IndicatorCache"] = None
+        self._bounds = (0, len(df))
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+    @property
+    def columns(self) -> pd.Index:
+        return self._df.columns
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self._df
+
+    def origin(self) -> tuple:
+        """(整段根缓存, 本视图在根序列上的起止下标)；非窗口视图即 (self, 0, len)。"""
+        if self._parent is None:
+            return self, 0, len(self._df)
+        root, offset, _ = self._parent.origin()
+        return root, offset + self._bounds[0], offset + self._bounds[1]
+
+    def window(self, start: int, stop: int) -> "IndicatorCache":
+        """
+        [start, stop) 区间视图，与 df.iloc[start:stop] 下标对齐。指标取整段结果的切片，
+        窗口开头沿用之前的数据预热，不在窗口内重算；多个窗口共享同一份整段计算。
+        """
+        view = IndicatorCache(self._df.iloc[start:stop])
+        view._parent = self
+        view._bounds = (start, stop)
+        return view
+
+    def memo(self, key: tuple, compute):
+        """按 key 缓存 compute() 的结果；策略也可用它缓存自己的派生序列。"""
+        if key not in self._store:
+            self._store[key] = compute()
+        return self._store[key]
+
+    def _indicator(self, key: tuple, compute):
+        """命名指标：compute(cache) 在整段序列上算一次，窗口视图取其切片。"""
+        if self._parent is None:
+            return self.memo(key, lambda: compute(self))
+        start, stop = self._bounds
+        return self.memo(key, lambda: _slice(self._parent._indicator(key, compute), start, stop))
+
+    def column(self, name: str) -> pd.Series:
+        """原始列（float）。"""
+        return self._indicator(("column", name), lambda c: c._df[name].astype(float))
+
+    def sma(self, period: int, column: str = "close") -> pd.Series:
+        """简单均线 MA(period)。"""
+        return self._indicator(
+            ("sma", column, period),
+            lambda c: c.column(column).rolling(period, min_periods=period).mean(),
+        )
+
+    def rsi(self, period: int = 14) -> pd.Series:
+        return self._indicator(("rsi", period), lambda c: rsi_wilder(c.column("close"), period))
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
+        """返回 (dif, dea, hist)。"""
+        return self._indicator(("macd", fast, slow, signal), lambda c: macd(c.column("close"), fast, slow, signal))
+
+    def bollinger(self, period: int = 20, num_std: float = 2.0) -> tuple:
+        """返回 (middle, upper, lower)。"""
+        return self._indicator(
+            ("bollinger", period, num_std),
+            lambda c: bollinger_bands(c.column("close"), period, num_std),
+        )
+
+    def adx(self, period: int = 14) -> tuple:
+        """返回 (adx_series, plus_di, minus_di)。"""
+        return self._indicator(
+            ("adx", period),
+            lambda c: adx(c.column("high"), c.column("low"), c.column("close"), period),
+        )
+
+
+def _slice(value, start: int, stop: int):
+    """Series 或 Series 元组按位置切片。"""
+    if isinstance(value, tuple):
+        return tuple(v.iloc[start:stop] for v in value)
+    return value.iloc[start:stop]
+
+
+# ----- 增量（流式）指标：每根 bar O(1) 更新，与上方批量函数在整段序列上逐点一致 -----
+
+
+class _StreamingIndicator:
+    """流式指标基类：状态均为普通属性，snapshot() 得到可 JSON 序列化的 dict，restore() 还原。"""
+
+    def snapshot(self) -> dict:
+        out = {}
+        for k, v in self.__dict__.items():
+            if isinstance(v, _StreamingIndicator):
+                v = v.snapshot()
+            elif isinstance(v, deque):
+                v = list(v)
+            out[k] = v
+        return out
+
+    def restore(self, state: dict) -> None:
+        for k, v in state.items():
+            cur = self.__dict__.get(k)
+            if isinstance(cur, _StreamingIndicator):
+                cur.restore(v)
+            elif isinstance(cur, deque):
+                self.__dict__[k] = deque(v, maxlen=cur.maxlen)
+            else:
+                self.__dict__[k] = v
+
+
+class StreamingEMA(_StreamingIndicator):
+    """EMA(span)，同 Series.ewm(span, adjust=False).mean()：首值为第一个输入。"""
+
+    def __init__(self, span: int) -> None:
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = float("nan")
+
+    def update(self, x: float) -> float:
+        if self.value != self.value:  # NaN：尚未初始化
+            self.value = float(x)
+        else:
+            self.value = (1.0 - self.alpha) * self.value + self.alpha * x
+        return self.value
+
+
+class StreamingWilder(_StreamingIndicator):
+    """同 _wilder_smooth：前 period 个值求和为首值（NaN 视为 0），之后 S = S_prev*(period-1)/period + value。"""
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.count = 0
+        self.value = 0.0
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count <= self.period:
+            if x == x:
+                self.value += x
+            return self.value if self.count == self.period else float("nan")
+        self.value = self.value * (self.period - 1) / self.period + x
+        return self.value
+
+
+class StreamingRSI(_StreamingIndicator):
+    """同 rsi_wilder：首期用 period 内涨跌的简单平均，之后 Wilder 递推；前 period 根返回 NaN。"""
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.count = 0
+        self.prev_close = float("nan")
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, close: float) -> float:
+        close = float(close)
+        delta = close - self.prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self.prev_close = close
+        i = self.count
+        self.count += 1
+        p = self.period
+        if i == 0:
+            return float("nan")
+        if i <= p:
+            # 预热：累加 period 内涨跌，第 period 根时取均值
+            self.avg_gain += gain
+            self.avg_loss += loss
+            if i < p:
+                return float("nan")
+            self.avg_gain /= p
+            self.avg_loss /= p
+        else:
+            self.avg_gain = (self.avg_gain * (p - 1) + gain) / p
+            self.avg_loss = (self.avg_loss * (p - 1) + loss) / p
+        rs = self.avg_gain / (self.avg_loss + 1e-10)
+        return 100 - (100 / (1 + rs))
+
+
+class StreamingMACD(_StreamingIndicator):
+    """同 macd：update(close) 返回 (dif, dea, hist)。"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        self.ema_fast = StreamingEMA(fast)
+        self.ema_slow = StreamingEMA(slow)
+        self.ema_signal = StreamingEMA(signal)
+
+    def update(self, close: float) -> tuple:
+        dif = self.ema_fast.update(close) - self.ema_slow.update(close)
+        dea = self.ema_signal.update(dif)
+        return dif, dea, dif - dea
+
+
+class StreamingBollinger(_StreamingIndicator):
+    """
+    同 bollinger_bands：滑动窗口内维护 sum 与 sum of squares，update(close) 返回 (middle, upper, lower)。
+    数值以首个输入为基准平移以减小抵消误差；每满一个窗口按窗口内原值重算一次和，避免长期累积漂移（均摊 O(1)）。
+    """
+
+    def __init__(self, period: int = 20, num_std: float = 2.0) -> None:
+        self.period = period
+        self.num_std = num_std
+        self.window: deque = deque(maxlen=period)
+        self.shift = float("nan")
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.since_resync = 0
+
+    def update(self, close: float) -> tuple:
+        close = float(close)
+        if self.shift != self.shift:
+            self.shift = close
+        x = close - self.shift
+        if len(self.window) == self.period:
+            old = self.window[0]
+            self.sum -= old
+            self.sum_sq -= old * old
+        self.window.append(x)
+        self.sum += x
+        self.sum_sq += x * x
+        self.since_resync += 1
+        if self.since_resync >= self.period:
+            self.sum = math.fsum(self.window)
+            self.sum_sq = math.fsum(v * v for v in self.window)
+            self.since_resync = 0
+        n = len(self.window)
+        if n < self.period or n < 2:
+            nan = float("nan")
+            return nan, nan, nan
+        mean = self.sum / n
+        var = max((self.sum_sq - self.sum * mean) / (n - 1), 0.0)
+        std = math.sqrt(var)
+        middle = mean + self.shift
+        return middle, middle + self.num_std * std, middle - self.num_std * std
+
+
+class StreamingADX(_StreamingIndicator):
+    """同 adx：update(high, low, close) 返回 (adx, plus_di, minus_di)，与整段批量计算逐点一致。"""
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.prev_high = float("nan")
+        self.prev_low = float("nan")
+        self.prev_close = float("nan")
+        self.tr = StreamingWilder(period)
+        self.plus_dm = StreamingWilder(period)
+        self.minus_dm = StreamingWilder(period)
+        self.adx = StreamingWilder(period)
+
+    def update(self, high: float, low: float, close: float) -> tuple:
+        high, low, close = float(high), float(low), float(close)
+        if self.prev_close == self.prev_close:
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        else:
+            tr = high - low
+        up_move = high - self.prev_high
+        down_move = self.prev_low - low
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        tr_s = self.tr.update(tr)
+        plus_di = 100 * self.plus_dm.update(plus_dm) / (tr_s + 1e-10)
+        minus_di = 100 * self.minus_dm.update(minus_dm) / (tr_s + 1e-10)
+        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10)
+        return self.adx.update(dx), plus_di, minus_di
@@ -2,12 +2,13 @@
 卖出策略基类：只输出 SELL 或 HOLD，不输出 BUY。
 """
 from abc import abstractmethod
-from typing import Any
+from typing import Any, Tuple
 
+import numpy as np
 import pandas as pd
 
-from core.types import Signal, SignalAction
-from strategies.base import BaseStrategy
+from core.types import FastSignal, SignalAction
+from strategies.base import BaseStrategy, SignalBatch
 
 
 class BaseSellStrategy(BaseStrategy):
@@ -20,9 +21,27 @@ class BaseSellStrategy(BaseStrategy):
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
+    ) -> FastSignal:
         """返回 SELL 或 HOLD，不应返回 BUY。"""
         ...
 
-    def _hold(self, reason: str = "hold") -> Signal:
-        return Signal(action=SignalAction.HOLD, strength=0.0, reason=reason)
+    def batch_signal(self, batch: SignalBatch, i: int, **kwargs: Any) -> Tuple[bool, float]:
+        """
+        批量信号在第 i 根 bar 的取值：(是否 SELL, 报价，NaN 为无)，原因取 batch.reason(i)。
+        kwargs 与 next() 相同（current_position、position_avg_cost 等），由引擎持仓循环传入；
+        路径相关的策略（依赖持仓成本等）覆盖此方法在这里求值。
+        """
+        if int(kwargs.get("current_position") or 0) <= 0:
+            return False, float("nan")
+        return bool(batch.action[i]), float(batch.price[i])
+
+    def cross_signal(self, batch: SignalBatch, t: int, **state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        横截面版 batch_signal，供组合回测按日期一次处理全部标的：batch 各数组为 (日期 × 标的) 二维，
+        state 各项为按标的的一维数组（键同 batch_signal 的 kwargs），另有 prev_bar_index：各标的在 t 之前最近一根 K 线所在行
+        （统一日期轴上某标的停牌、缺行时 t - 1 不一定是它的上一根 K 线）。返回 (是否 SELL, 报价) 两个一维数组。
+        """
+        return batch.action[t] & (state["current_position"] > 0), batch.price[t]
+
+    def _hold(self, reason: str = "hold") -> FastSignal:
+        return FastSignal.hold(reason)
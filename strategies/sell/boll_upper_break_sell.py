@@ -1,9 +1,11 @@
 """突破上布林带卖出：收盘价站上布林带上轨时卖出。"""
-from typing import Any
+from typing import Any, Optional
+import numpy as np
 import pandas as pd
-from core.types import Signal, SignalAction
+from core.types import FastSignal, SignalAction
+from strategies.base import SignalBatch
+from strategies.indicators import IndicatorCache
 from strategies.sell.base import BaseSellStrategy
-from strategies.indicators import bollinger_bands
 
 
 class BollUpperBreakSellStrategy(BaseSellStrategy):
@@ -19,20 +21,37 @@ class BollUpperBreakSellStrategy(BaseSellStrategy):
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
+    ) -> FastSignal:
         if current_position <= 0:
             return self._hold("空仓")
-        close_series = history_df["close"].astype(float)
-        # history_df 已含当日 K 线，直接用其算布林带，避免重复拼接导致上轨被抬高
-        if len(close_series) < self.period:
+        # 上下文已含当日 K 线，直接用其算布林带，避免重复拼接导致上轨被抬高
+        ctx = self._context(current_bar, history_df, kwargs)
+        if ctx is None:
             return self._hold("数据不足")
-        _, upper, _ = bollinger_bands(close_series, period=self.period, num_std=self.num_std)
-        current_close = float(current_bar.get("close", 0))
-        upper_last = float(upper.iloc[-1])
+        # 按整段序列计数：walk-forward 窗口开头由窗口之前的数据预热
+        ind, i = ctx.origin()
+        if i + 1 < self.period:
+            return self._hold("数据不足")
+        _, upper, _ = ind.bollinger(self.period, self.num_std)
+        current_close = float(ctx.get("close", 0))
+        upper_last = float(upper.iloc[i])
         if current_close >= upper_last:
-            return Signal(
+            return FastSignal(
                 action=SignalAction.SELL,
                 strength=1.0,
                 reason="突破上布林带",
             )
         return self._hold("未破上轨")
+
+    def compute_signals(
+        self,
+        df: pd.DataFrame,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ) -> SignalBatch:
+        """整段批量版 next()：收盘价 >= 当日上轨，与持仓无关。"""
+        ind = indicator_cache if indicator_cache is not None else IndicatorCache(df)
+        _, upper, _ = ind.bollinger(self.period, self.num_std)
+        fire = (ind.column("close") >= upper).to_numpy()
+        _, offset, _ = ind.origin()
+        fire = fire & (np.arange(offset + 1, offset + len(fire) + 1) >= self.period)
+        return SignalBatch.from_mask(fire, "突破上布林带", hold_reason="未破上轨")
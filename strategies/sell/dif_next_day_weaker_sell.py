@@ -1,10 +1,12 @@
 """买入次日 DIF 低于买入当日 DIF 则卖出。"""
-from typing import Any
+from typing import Any, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from core.types import Signal, SignalAction
-from strategies.indicators import macd
+from core.types import FastSignal, SignalAction
+from strategies.base import SignalBatch
+from strategies.indicators import IndicatorCache
 from strategies.sell.base import BaseSellStrategy
 
 
@@ -19,7 +21,7 @@ class DifNextDayWeakerSellStrategy(BaseSellStrategy):
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
+    ) -> FastSignal:
         if current_position <= 0:
             return self._hold("空仓")
 
@@ -28,22 +30,63 @@ class DifNextDayWeakerSellStrategy(BaseSellStrategy):
             return self._hold("无买入索引")
         entry_bar_index = int(entry_bar_index)
 
-        current_idx = len(history_df) - 1
+        ctx = self._context(current_bar, history_df, kwargs)
+        if ctx is None:
+            return self._hold("DIF 数据不足")
+        current_idx = ctx.index
         if current_idx != entry_bar_index + 1:
             return self._hold("非买入次日")
 
-        close_series = history_df["close"].astype(float)
-        dif, _, _ = macd(close_series)
+        dif, _, _ = ctx.indicators.macd()
         entry_dif = dif.iloc[entry_bar_index]
         current_dif = dif.iloc[current_idx]
         if pd.isna(entry_dif) or pd.isna(current_dif):
             return self._hold("DIF 数据不足")
 
         if float(current_dif) < float(entry_dif):
-            return Signal(
+            return FastSignal(
                 action=SignalAction.SELL,
                 strength=1.0,
                 reason="买入次日DIF走弱卖出",
-                price=float(current_bar.get("close", 0.0)),
+                price=float(ctx.get("close", 0.0)),
             )
         return self._hold("买入次日DIF未走弱")
+
+    def compute_signals(
+        self,
+        df: pd.DataFrame,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ) -> SignalBatch:
+        """触发取决于买入日，批量阶段备好逐 bar DIF 与收盘价，在 batch_signal 中与买入日 DIF 比较。"""
+        ind = indicator_cache if indicator_cache is not None else IndicatorCache(df)
+        dif, _, _ = ind.macd()
+        n = len(df)
+        return SignalBatch(
+            action=np.zeros(n, dtype=bool),
+            price=np.full(n, np.nan),
+            reason_code=np.ones(n, dtype=np.int16),
+            reasons=("买入次日DIF未走弱", "买入次日DIF走弱卖出"),
+            inputs={"dif": dif.to_numpy(), "close": ind.column("close").to_numpy()},
+        )
+
+    def batch_signal(self, batch: SignalBatch, i: int, **kwargs: Any) -> Tuple[bool, float]:
+        if int(kwargs.get("current_position") or 0) <= 0:
+            return False, float("nan")
+        entry = kwargs.get("entry_bar_index")
+        if entry is None or int(entry) < 0 or i != int(entry) + 1:
+            return False, float("nan")
+        dif = batch.inputs["dif"]
+        # NaN 比较为 False，即“DIF 数据不足”不触发
+        if dif[i] < dif[int(entry)]:
+            return True, float(batch.inputs["close"][i])
+        return False, float("nan")
+
+    def cross_signal(self, batch: SignalBatch, t: int, **state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        entry = state["entry_bar_index"]
+        dif = batch.inputs["dif"]
+        cols = np.arange(dif.shape[1])
+        entry_dif = dif[np.maximum(entry, 0), cols]
+        # 次日指该标的买入后的下一根 K 线：上一根 K 线即买入日（中间停牌的日期不算）
+        prev = state.get("prev_bar_index", t - 1)
+        fired = (state["current_position"] > 0) & (entry >= 0) & (prev == entry) & (dif[t] < entry_dif)
+        return fired, np.where(fired, batch.inputs["close"][t], np.nan)
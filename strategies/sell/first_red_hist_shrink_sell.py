@@ -1,10 +1,12 @@
 """买入后第一次红柱缩小卖出。"""
-from typing import Any
+from typing import Any, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from core.types import Signal, SignalAction
-from strategies.indicators import macd
+from core.types import FastSignal, SignalAction
+from strategies.base import SignalBatch
+from strategies.indicators import IndicatorCache
 from strategies.sell.base import BaseSellStrategy
 
 
@@ -19,7 +21,7 @@ class FirstRedHistShrinkSellStrategy(BaseSellStrategy):
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
+    ) -> FastSignal:
         if current_position <= 0:
             return self._hold("空仓")
 
@@ -28,13 +30,15 @@ class FirstRedHistShrinkSellStrategy(BaseSellStrategy):
             return self._hold("无买入索引")
         entry_bar_index = int(entry_bar_index)
 
-        current_idx = len(history_df) - 1
+        ctx = self._context(current_bar, history_df, kwargs)
+        if ctx is None:
+            return self._hold("MACD 数据不足")
+        current_idx = ctx.index
         if current_idx <= entry_bar_index:
             return self._hold("买入当日不判断")
 
-        close_series = history_df["close"].astype(float)
-        _, _, hist = macd(close_series)
-        if len(hist) < 2:
+        _, _, hist = ctx.indicators.macd()
+        if current_idx < 1:
             return self._hold("MACD 数据不足")
 
         current_hist = hist.iloc[current_idx]
@@ -52,11 +56,53 @@ class FirstRedHistShrinkSellStrategy(BaseSellStrategy):
                     continue
                 if float(h) > 0 and float(hp) > 0 and float(h) < float(hp):
                     return self._hold("红柱缩小非首次")
-            return Signal(
+            return FastSignal(
                 action=SignalAction.SELL,
                 strength=1.0,
                 reason="买入后首次红柱缩小卖出",
-                price=float(current_bar.get("close", 0.0)),
+                price=float(ctx.get("close", 0.0)),
             )
 
         return self._hold("红柱未缩小")
+
+    def compute_signals(
+        self,
+        df: pd.DataFrame,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ) -> SignalBatch:
+        """
+        逐 bar 的“红柱缩小”标记与其前缀计数：买入后首次缩小等价于当日缩小且
+        (买入日, 当日) 之间计数为 0，持仓循环中 O(1) 判断，无需回扫历史。
+        """
+        ind = indicator_cache if indicator_cache is not None else IndicatorCache(df)
+        _, _, hist = ind.macd()
+        h = hist.to_numpy()
+        shrink = np.zeros(len(h), dtype=bool)
+        shrink[1:] = (h[1:] > 0) & (h[:-1] > 0) & (h[1:] < h[:-1])
+        n = len(df)
+        return SignalBatch(
+            action=shrink,
+            price=np.full(n, np.nan),
+            reason_code=np.ones(n, dtype=np.int16),
+            reasons=("红柱未缩小", "买入后首次红柱缩小卖出"),
+            inputs={"shrink_count": np.cumsum(shrink), "close": ind.column("close").to_numpy()},
+        )
+
+    def batch_signal(self, batch: SignalBatch, i: int, **kwargs: Any) -> Tuple[bool, float]:
+        if int(kwargs.get("current_position") or 0) <= 0:
+            return False, float("nan")
+        entry = kwargs.get("entry_bar_index")
+        if entry is None or int(entry) < 0 or i <= int(entry) or not batch.action[i]:
+            return False, float("nan")
+        count = batch.inputs["shrink_count"]
+        if count[i - 1] - count[int(entry)] == 0:
+            return True, float(batch.inputs["close"][i])
+        return False, float("nan")
+
+    def cross_signal(self, batch: SignalBatch, t: int, **state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        entry = state["entry_bar_index"]
+        count = batch.inputs["shrink_count"]
+        cols = np.arange(count.shape[1])
+        first = count[max(t - 1, 0)] - count[np.maximum(entry, 0), cols] == 0
+        fired = (state["current_position"] > 0) & (entry >= 0) & (t > entry) & batch.action[t] & first
+        return fired, np.where(fired, batch.inputs["close"][t], np.nan)
@@ -1,7 +1,10 @@
 """固定比例止损卖出：盘中触及止损价则按止损价卖出，单笔亏损不超过配置比例。"""
-from typing import Any
+from typing import Any, Optional, Tuple
+import numpy as np
 import pandas as pd
-from core.types import Signal, SignalAction
+from core.types import FastSignal, SignalAction
+from strategies.base import SignalBatch
+from strategies.indicators import IndicatorCache
 from strategies.sell.base import BaseSellStrategy
 
 
@@ -11,7 +14,7 @@ class StopLossPctSellStrategy(BaseSellStrategy):
     def __init__(self, stop_loss_pct: float = 8.0) -> None:
         self.stop_loss_pct = stop_loss_pct
 
-    def next(self, current_bar: pd.Series, history_df: pd.DataFrame, current_position: int, **kwargs: Any) -> Signal:
+    def next(self, current_bar: pd.Series, history_df: pd.DataFrame, current_position: int, **kwargs: Any) -> FastSignal:
         if current_position <= 0:
             return self._hold("空仓")
         cost = kwargs.get("position_avg_cost") or 0.0
@@ -23,10 +26,43 @@ class StopLossPctSellStrategy(BaseSellStrategy):
         stop_price = cost * (1 - self.stop_loss_pct / 100.0)
         low = float(current_bar.get("low", current_price))
         if low <= stop_price:
-            return Signal(
+            return FastSignal(
                 action=SignalAction.SELL,
                 strength=1.0,
-                reason=f"止损{self.stop_loss_pct}%",
+                reason=lambda: f"止损{self.stop_loss_pct}%",
                 price=stop_price,
             )
         return self._hold("持仓")
+
+    def compute_signals(
+        self,
+        df: pd.DataFrame,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ) -> SignalBatch:
+        """止损价依赖持仓成本，批量阶段只备好逐 bar 最低价，触发在 batch_signal 中判断。"""
+        ind = indicator_cache if indicator_cache is not None else IndicatorCache(df)
+        n = len(df)
+        return SignalBatch(
+            action=np.zeros(n, dtype=bool),
+            price=np.full(n, np.nan),
+            reason_code=np.ones(n, dtype=np.int16),
+            reasons=("持仓", f"止损{self.stop_loss_pct}%"),
+            inputs={"low": ind.column("low").to_numpy()},
+        )
+
+    def batch_signal(self, batch: SignalBatch, i: int, **kwargs: Any) -> Tuple[bool, float]:
+        if int(kwargs.get("current_position") or 0) <= 0:
+            return False, float("nan")
+        cost = kwargs.get("position_avg_cost") or 0.0
+        if cost <= 0:
+            return False, float("nan")
+        stop_price = cost * (1 - self.stop_loss_pct / 100.0)
+        if batch.inputs["low"][i] <= stop_price:
+            return True, stop_price
+        return False, float("nan")
+
+    def cross_signal(self, batch: SignalBatch, t: int, **state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        cost = state["position_avg_cost"]
+        stop_price = cost * (1 - self.stop_loss_pct / 100.0)
+        fired = (state["current_position"] > 0) & (cost > 0) & (batch.inputs["low"][t] <= stop_price)
+        return fired, np.where(fired, stop_price, np.nan)
@@ -1,9 +1,12 @@
 """移动止盈：止盈价按「昨日及之前」最高价计算，仅在次日生效，当天不触发卖出。"""
-from typing import Any
+from typing import Any, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from core.types import Signal, SignalAction
+from core.types import FastSignal, SignalAction
+from strategies.base import SignalBatch
+from strategies.indicators import IndicatorCache
 from strategies.sell.base import BaseSellStrategy
 
 
@@ -23,7 +26,7 @@ class TrailingTakeProfitSellStrategy(BaseSellStrategy):
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
+    ) -> FastSignal:
         if current_position <= 0:
             return self._hold("空仓")
         # 用「昨日收盘前」的最高价算止盈价，今日才生效，避免当天买卖同一天触发
@@ -33,10 +36,43 @@ class TrailingTakeProfitSellStrategy(BaseSellStrategy):
         exit_price = high_prev * (1.0 - self.pullback_pct / 100.0)
         low = float(current_bar.get("low", 0))
         if low <= exit_price:
-            return Signal(
+            return FastSignal(
                 action=SignalAction.SELL,
                 strength=1.0,
                 reason="移动止盈(固定回落%.1f%%)" % self.pullback_pct,
                 price=exit_price,
             )
         return self._hold("未触及止盈价")
+
+    def compute_signals(
+        self,
+        df: pd.DataFrame,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ) -> SignalBatch:
+        """止盈价依赖买入后最高价，批量阶段只备好逐 bar 最低价，触发在 batch_signal 中判断。"""
+        ind = indicator_cache if indicator_cache is not None else IndicatorCache(df)
+        n = len(df)
+        return SignalBatch(
+            action=np.zeros(n, dtype=bool),
+            price=np.full(n, np.nan),
+            reason_code=np.ones(n, dtype=np.int16),
+            reasons=("未触及止盈价", "移动止盈(固定回落%.1f%%)" % self.pullback_pct),
+            inputs={"low": ind.column("low").to_numpy()},
+        )
+
+    def batch_signal(self, batch: SignalBatch, i: int, **kwargs: Any) -> Tuple[bool, float]:
+        if int(kwargs.get("current_position") or 0) <= 0:
+            return False, float("nan")
+        high_prev = kwargs.get("high_since_entry_prev")
+        if high_prev is None or high_prev <= 0:
+            return False, float("nan")
+        exit_price = high_prev * (1.0 - self.pullback_pct / 100.0)
+        if batch.inputs["low"][i] <= exit_price:
+            return True, exit_price
+        return False, float("nan")
+
+    def cross_signal(self, batch: SignalBatch, t: int, **state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        high_prev = state["high_since_entry_prev"]
+        exit_price = high_prev * (1.0 - self.pullback_pct / 100.0)
+        fired = (state["current_position"] > 0) & (high_prev > 0) & (batch.inputs["low"][t] <= exit_price)
+        return fired, np.where(fired, exit_price, np.nan)
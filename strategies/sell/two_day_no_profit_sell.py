@@ -1,9 +1,12 @@
 """买入后满两天仍不盈利则卖出：按当日收盘价平仓。"""
-from typing import Any
+from typing import Any, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from core.types import Signal, SignalAction
+from core.types import FastSignal, SignalAction
+from strategies.base import SignalBatch
+from strategies.indicators import IndicatorCache
 from strategies.sell.base import BaseSellStrategy
 
 
@@ -21,7 +24,7 @@ class TwoDayNoProfitSellStrategy(BaseSellStrategy):
         history_df: pd.DataFrame,
         current_position: int,
         **kwargs: Any,
-    ) -> Signal:
+    ) -> FastSignal:
         if current_position <= 0:
             return self._hold("空仓")
 
@@ -39,10 +42,46 @@ class TwoDayNoProfitSellStrategy(BaseSellStrategy):
         current_price = float(current_price)
 
         if current_price <= cost:
-            return Signal(
+            return FastSignal(
                 action=SignalAction.SELL,
                 strength=1.0,
-                reason=f"持仓满{self.min_hold_days}天未盈利卖出",
+                reason=lambda: f"持仓满{self.min_hold_days}天未盈利卖出",
                 price=current_price,
             )
         return self._hold("已盈利继续持有")
+
+    def compute_signals(
+        self,
+        df: pd.DataFrame,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ) -> SignalBatch:
+        """触发取决于持仓天数与成本，全部在 batch_signal 中判断；批量阶段无需逐 bar 输入。"""
+        n = len(df)
+        return SignalBatch(
+            action=np.zeros(n, dtype=bool),
+            price=np.full(n, np.nan),
+            reason_code=np.ones(n, dtype=np.int16),
+            reasons=("已盈利继续持有", f"持仓满{self.min_hold_days}天未盈利卖出"),
+        )
+
+    def batch_signal(self, batch: SignalBatch, i: int, **kwargs: Any) -> Tuple[bool, float]:
+        if int(kwargs.get("current_position") or 0) <= 0:
+            return False, float("nan")
+        if int(kwargs.get("holding_days_since_entry") or 0) < self.min_hold_days:
+            return False, float("nan")
+        cost = float(kwargs.get("position_avg_cost") or 0.0)
+        current_price = float(kwargs["current_price"])
+        if cost > 0 and current_price <= cost:
+            return True, current_price
+        return False, float("nan")
+
+    def cross_signal(self, batch: SignalBatch, t: int, **state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        cost = state["position_avg_cost"]
+        current_price = state["current_price"]
+        fired = (
+            (state["current_position"] > 0)
+            & (state["holding_days_since_entry"] >= self.min_hold_days)
+            & (cost > 0)
+            & (current_price <= cost)
+        )
+        return fired, np.where(fired, current_price, np.nan)
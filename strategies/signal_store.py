@@ -0,0 +1,201 @@
+"""
+信号缓存：按 (标的, 数据指纹, 策略名与参数) 缓存策略的整段批量信号（SignalBatch），
+同一进程内多次回测（参数扫描、买卖组合对比）直接复用，不再重复计算买入侧信号。
+
+内存层为有界 LRU；可选的磁盘层（.npz，按键哈希命名）供进程池中的多个 worker 及多次运行之间共享。
+数据指纹由 K 线内容计算，键中另含策略源码指纹（strategies 包与 core/types.py），数据或策略代码变化后旧条目自然失效。
+"""
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.dates import to_days
+from core.sources import source_fingerprint
+from strategies.base import BaseStrategy, SignalBatch
+from strategies.indicators import IndicatorCache
+
+_FINGERPRINT_COLUMNS = ("date", "open", "high", "low", "close", "volume")
+# 决定信号内容的源码：策略、指标、BarContext 与信号类型
+_STRATEGY_SOURCES = ("strategies", "core/types.py")
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """K 线内容指纹：日期与 OHLCV 列的哈希，内容相同（含切片区间相同）则指纹相同。"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(len(df)).encode())
+    for name in _FINGERPRINT_COLUMNS:
+        if name not in df.columns:
+            continue
+        h.update(name.encode())
+        col = df[name]
+        if name == "date":
+            h.update(np.ascontiguousarray(to_days(col)).view(np.int64).tobytes())
+        else:
+            h.update(np.ascontiguousarray(col.to_numpy(dtype=float)).tobytes())
+    return h.hexdigest()
+
+
+def cache_fingerprint(indicators: IndicatorCache) -> str:
+    """
+    IndicatorCache 对应数据的指纹。窗口视图的指标带有窗口之前的预热数据，与同区间单独加载的数据算出的信号
+    不一定相同，故指纹取整段根数据并附上区间。根数据指纹缓存在根 IndicatorCache 中，每段数据只算一次。
+    """
+    root, start, stop = indicators.origin()
+    fp = root.memo(("fingerprint",), lambda: data_fingerprint(root.frame))
+    return fp if (start, stop) == (0, len(root)) else f"{fp}[{start}:{stop}]"
+
+
+class SignalStore:
+    """
+    (symbol, 数据指纹, strategy.cache_key()) -> SignalBatch 的 LRU 缓存。
+    - max_entries：内存层条目上限，超出淘汰最久未用者；0 表示不缓存
+    - directory：磁盘层目录，None 为仅内存；max_disk_entries 为磁盘层文件数上限
+    返回的 SignalBatch 由多次运行共享，调用方不得原地修改。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        directory: Optional[Path] = None,
+        max_disk_entries: int = 4096,
+    ) -> None:
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[tuple, SignalBatch]" = OrderedDict()
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(symbol: str, fingerprint: str, strategy: BaseStrategy) -> tuple:
+        return (symbol.upper(), fingerprint, source_fingerprint(*_STRATEGY_SOURCES)) + strategy.cache_key()
+
+    def get(self, key: tuple) -> Optional[SignalBatch]:
+        batch = self._entries.get(key)
+        if batch is not None:
+            self._entries.move_to_end(key)
+            return batch
+        if self.directory is not None:
+            batch = self._load(key)
+            if batch is not None:
+                self._remember(key, batch)
+        return batch
+
+    def put(self, key: tuple, batch: SignalBatch) -> None:
+        self._remember(key, batch)
+        if self.directory is not None:
+            self._save(key, batch)
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], Optional[SignalBatch]]) -> Optional[SignalBatch]:
+        """命中直接返回；未命中调用 compute()，结果非 None 时写入缓存。"""
+        batch = self.get(key)
+        if batch is not None:
+            self.hits += 1
+            return batch
+        self.misses += 1
+        batch = compute()
+        if batch is not None:
+            self.put(key, batch)
+        return batch
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: tuple, batch: SignalBatch) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = batch
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # ----- 磁盘层 -----
+
+    def _path(self, key: tuple) -> Path:
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return self.directory / f"{digest}.npz"
+
+    def _load(self, key: tuple) -> Optional[SignalBatch]:
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                if str(z["key"]) != repr(key):
+                    return None
+                return SignalBatch(
+                    action=z["action"],
+                    price=z["price"],
+                    reason_code=z["reason_code"],
+                    reasons=tuple(str(r) for r in z["reasons"]),
+                    inputs={name[len("input_"):]: z[name] for name in z.files if name.startswith("input_")},
+                    strength=z["strength"] if "strength" in z.files else None,
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save(self, key: tuple, batch: SignalBatch) -> None:
+        """写临时文件后原子替换，并发的 worker 不会读到半个文件。"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "key": np.array(repr(key)),
+            "action": batch.action,
+            "price": batch.price,
+            "reason_code": batch.reason_code,
+            "reasons": np.array(batch.reasons, dtype=str),
+            **{f"input_{k}": v for k, v in batch.inputs.items()},
+        }
+        if batch.strength is not None:
+            arrays["strength"] = batch.strength
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return
+        self._puts += 1
+        if self._puts % 64 == 0:
+            self._prune()
+
+    def _prune(self) -> None:
+        """磁盘层超过上限时删除最久未写的文件。"""
+        files = []
+        for p in self.directory.glob("*.npz"):
+            try:
+                files.append((p.stat().st_mtime, p))
+            except OSError:  # 其他 worker 已删除
+                continue
+        files.sort()
+        for _, p in files[: max(0, len(files) - self.max_disk_entries)]:
+            p.unlink(missing_ok=True)
+
+
+_store = SignalStore()
+
+
+def get_signal_store() -> SignalStore:
+    """进程级默认信号缓存（回测引擎、参数扫描、组合回测共用）。"""
+    return _store
+
+
+def configure_signal_store(
+    max_entries: int = 512,
+    directory: Optional[Path] = None,
+    max_disk_entries: int = 4096,
+) -> SignalStore:
+    """替换进程级默认信号缓存；进程池 worker 的 initializer 用它开启共享的磁盘层。"""
+    global _store
+    _store = SignalStore(max_entries=max_entries, directory=directory, max_disk_entries=max_disk_entries)
+    return _store